@@ -0,0 +1,149 @@
+# audio_archive.py
+"""
+Per-session recordings of what the transcriber heard.
+
+Each session gets recordings/<session_id>.wav (16-bit PCM) and
+<session_id>.marks.jsonl with the frame offset where each question was asked
+and each answer ended, so answers can be cut out and re-transcribed later
+(see retranscribe.py). Writes go through a 1 MB file buffer and are flushed
+every FLUSH_SECONDS of audio; the ASR thread pays a conversion and a memcpy per block.
+"""
+import json
+import os
+import threading
+import wave
+
+DEFAULT_ROOT = "recordings"
+FLUSH_SECONDS = 5.0
+
+
+class SessionRecorder:
+    def __init__(self, base: str, samplerate: int = 16000, channels: int = 1):
+        self.wav_path = base + ".wav"
+        self.marks_path = base + ".marks.jsonl"
+        self.samplerate = samplerate
+        self.frames = 0
+        self._unflushed = 0
+        self._turn = []  # int16 blocks since the current question was asked
+        self._lock = threading.Lock()
+        self._f = open(self.wav_path, "wb", buffering=1 << 20)
+        self._wav = wave.open(self._f, "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(samplerate)
+
+    def write(self, block):
+        """block: float32 frames shaped (n, channels), as captured."""
+        import numpy as np
+        pcm = (np.clip(block, -1.0, 1.0) * 32767).astype("<i2")
+        with self._lock:
+            if self._wav is None:
+                return
+            self._wav.writeframesraw(pcm.tobytes())
+            self.frames += len(pcm)
+            self._unflushed += len(pcm)
+            self._turn.append(pcm)
+            if self._unflushed >= FLUSH_SECONDS * self.samplerate:
+                self._f.flush()
+                self._unflushed = 0
+
+    def mark(self, kind: str, **info):
+        with self._lock:
+            rec = {"kind": kind, "frame": self.frames, **info}
+            if kind == "question":
+                self._turn = []
+        with open(self.marks_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec) + "\n")
+
+    def take_turn(self):
+        """Mono float32 audio heard since the current question was asked (None if none); starts a new turn."""
+        import numpy as np
+        with self._lock:
+            blocks, self._turn = self._turn, []
+        if not blocks:
+            return None
+        audio = np.concatenate(blocks).astype(np.float32) / 32768.0
+        return audio.mean(axis=1) if audio.ndim > 1 else audio
+
+    def close(self):
+        with self._lock:
+            if self._wav is None:
+                return
+            self._wav.close()  # patches the header with the final length
+            self._f.close()
+            self._wav = None
+            self._turn = []
+
+
+class AudioArchive:
+    """Shared by the transcriber, which writes blocks, and the processor, which starts sessions and marks turns."""
+    def __init__(self, root: str = DEFAULT_ROOT, samplerate: int = 16000, channels: int = 1):
+        self.root = root
+        self.samplerate = samplerate
+        self.channels = channels
+        self.current = None
+
+    def paths(self, session_id: str) -> dict:
+        base = os.path.join(self.root, session_id)
+        return {"wav": base + ".wav", "marks": base + ".marks.jsonl"}
+
+    def begin(self, session_id: str) -> SessionRecorder:
+        self.end()
+        os.makedirs(self.root, exist_ok=True)
+        self.current = SessionRecorder(os.path.join(self.root, session_id), self.samplerate, self.channels)
+        return self.current
+
+    def end(self):
+        rec, self.current = self.current, None
+        if rec is not None:
+            rec.close()
+
+    def write(self, block):
+        rec = self.current
+        if rec is not None:
+            rec.write(block)
+
+    def mark(self, kind: str, **info):
+        rec = self.current
+        if rec is not None:
+            rec.mark(kind, **info)
+
+    def take_turn(self):
+        rec = self.current
+        return rec.take_turn() if rec is not None else None
+
+
+# ----------------- reading -----------------
+def read_recording(root: str, session_id: str):
+    """(mono float32 audio, samplerate, marks) for an archived session."""
+    import numpy as np
+    base = os.path.join(root, session_id)
+    with open(base + ".wav", "rb") as f:
+        w = wave.open(f, "rb")
+        rate, channels, frames = w.getframerate(), w.getnchannels(), w.getnframes()
+        # The header holds the length of the first write until close() patches it; after a
+        # crash it is too short, so read whatever was flushed past the 44-byte header instead.
+        if frames * 2 * channels < os.path.getsize(base + ".wav") - 44:
+            f.seek(44)
+            raw = f.read()
+        else:
+            raw = w.readframes(frames)
+    pcm = np.frombuffer(raw[:len(raw) - len(raw) % (2 * channels)], dtype="<i2").reshape(-1, channels)
+    audio = pcm.astype(np.float32).mean(axis=1) / 32768.0
+    marks = []
+    if os.path.exists(base + ".marks.jsonl"):
+        with open(base + ".marks.jsonl", "r", encoding="utf-8") as f:
+            marks = [json.loads(line) for line in f if line.strip()]
+    return audio, rate, marks
+
+
+def answer_segments(marks: list[dict]) -> list[tuple[int, int, int]]:
+    """(answer index, start frame, end frame): from the question being asked to the answer being recorded."""
+    out, start = [], None
+    for m in marks:
+        if m["kind"] == "question":
+            start = m["frame"]
+        elif m["kind"] == "answer" and start is not None:
+            out.append((m["index"], start, m["frame"]))
+            start = None
+    return out
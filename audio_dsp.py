@@ -0,0 +1,190 @@
+# audio_dsp.py
+"""
+Capture-side conversion to what Whisper wants: 16 kHz mono float32.
+
+With native capture the microphone is opened at the device's own rate and
+channel count (no driver resampling, no forced mono on headsets) and every
+block goes through CapturePipeline: downmix, DC removal and polyphase
+resampling, all vectorised over the block and stateful across blocks so the
+joins are seamless. normalize_gain() is applied to each chunk just before it
+is decoded.
+
+    python -m benchmarks.bench_audio_dsp
+"""
+import math
+
+import numpy as np
+
+KAISER_BETA = 8.0  # ~80 dB stopband
+ZERO_CROSSINGS = 16  # filter half-width, in output-rate samples
+ROLLOFF = 0.9  # cutoff as a fraction of the lower Nyquist; Whisper gains nothing above ~7 kHz at 16 kHz
+
+
+def downmix(block) -> np.ndarray:
+    """(n, channels) or (n,) frames -> mono float32."""
+    block = np.asarray(block, dtype=np.float32)
+    return block.mean(axis=1, dtype=np.float32) if block.ndim > 1 else block
+
+
+def design_lowpass(up: int, down: int) -> np.ndarray:
+    """Kaiser-windowed sinc for resampling by up/down, at the upsampled rate (gain `up`)."""
+    factor = max(up, down)
+    cutoff = ROLLOFF * 0.5 / factor  # cycles per upsampled sample
+    half = ZERO_CROSSINGS * factor
+    n = np.arange(-half, half + 1, dtype=np.float64)
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(len(n), KAISER_BETA)
+    return h * (up / h.sum())
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler: feed blocks at in_rate, get blocks at out_rate."""
+    def __init__(self, in_rate: int, out_rate: int):
+        g = math.gcd(int(in_rate), int(out_rate))
+        self.up, self.down = int(out_rate) // g, int(in_rate) // g
+        h = design_lowpass(self.up, self.down)
+        self.taps = -(-len(h) // self.up)  # per phase
+        h = np.concatenate([h, np.zeros(self.taps * self.up - len(h))])
+        # phases[p] = h[p::up] reversed, so it lines up with the input window ending at the newest sample
+        self.phases = np.ascontiguousarray(h.reshape(self.taps, self.up).T[:, ::-1], dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Forget the previous blocks, for input that does not continue from them."""
+        self._hist = np.zeros(self.taps - 1, dtype=np.float32)
+        self._consumed = 0  # input samples seen
+        self._next = 0  # next output sample index
+
+    def process(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        if self.up == self.down:
+            return x
+        start = self._consumed - len(self._hist)  # input index of buf[0]
+        buf = np.concatenate([self._hist, x])
+        self._consumed += len(x)
+        # every output whose newest input sample has arrived
+        first, stop = self._next, (self._consumed * self.up - 1) // self.down + 1
+        self._next = stop
+        self._hist = buf[len(buf) - len(self._hist):]
+        out = np.empty(max(0, stop - first), dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(buf, self.taps)
+        # Outputs `up` apart share a filter phase and their input windows are `down` apart,
+        # so each phase is one strided matrix-vector product.
+        for r in range(min(self.up, len(out))):
+            u = (first + r) * self.down
+            oldest = u // self.up - start - (self.taps - 1)
+            n = len(range(r, len(out), self.up))
+            out[r::self.up] = windows[oldest:oldest + (n - 1) * self.down + 1:self.down] @ self.phases[u % self.up]
+        return out
+
+
+class CapturePipeline:
+    """Device frames (any rate, any channel count) -> 16 kHz mono float32 shaped (n, 1)."""
+    DC_SECONDS = 1.0  # time constant of the DC tracker
+
+    def __init__(self, in_rate: int, out_rate: int = 16000):
+        self.in_rate, self.out_rate = int(in_rate), int(out_rate)
+        self.resampler = PolyphaseResampler(self.in_rate, self.out_rate)
+        self._dc = None
+
+    def reset(self):
+        """
+        Start a new stretch of audio after a gap (e.g. blocks dropped while paused).
+        The DC estimate is kept: it is the device's offset, which a gap does not change.
+        """
+        self.resampler.reset()
+
+    def process(self, block) -> np.ndarray:
+        x = downmix(block)
+        if len(x):
+            mean = float(x.mean())
+            if self._dc is None:
+                self._dc = mean
+            else:
+                self._dc += (mean - self._dc) * min(1.0, len(x) / self.in_rate / self.DC_SECONDS)
+            x = x - np.float32(self._dc)
+        return self.resampler.process(x).reshape(-1, 1)
+
+
+def normalize_gain(x: np.ndarray, target_rms: float = 0.05, max_gain: float = 8.0,
+                   floor_rms: float = 0.003) -> np.ndarray:
+    """Bring a chunk to target_rms, never past max_gain or clipping; near-silence is left alone."""
+    rms = float(np.sqrt(np.mean(np.square(x, dtype=np.float32)))) if len(x) else 0.0
+    if rms < floor_rms:
+        return x
+    peak = float(np.abs(x).max())
+    gain = min(target_rms / rms, max_gain, 0.99 / peak)
+    return x * np.float32(gain) if abs(gain - 1.0) > 0.05 else x
+
+
+MAX_CAPTURE_CHANNELS = 2  # interfaces may expose 32+ inputs; a headset or desk mic uses one or two
+
+
+def native_input_format(device=None) -> tuple[int, int]:
+    """(samplerate, channels) to open the input device with: its own rate, at most MAX_CAPTURE_CHANNELS."""
+    import sounddevice as sd
+    info = sd.query_devices(device, kind="input")
+    return int(info["default_samplerate"]), max(1, min(MAX_CAPTURE_CHANNELS, int(info["max_input_channels"])))
+
+
+# ----------------- health metrics -----------------
+CLIP_LEVEL = 0.99  # |sample| at or above this counts as clipped
+
+
+def _db(x: float) -> float:
+    return 20.0 * math.log10(max(x, 1e-6))
+
+
+class AudioHealth:
+    """
+    Per-block level, peak, clipping and a running noise floor / speech level,
+    hence an SNR estimate. The floor follows quiet blocks quickly and loud ones
+    slowly, so speech does not drag it up. update() costs one pass over the
+    block plus a few scalar operations.
+    """
+    FLOOR_DOWN = 0.5  # per block, towards a quieter level
+    FLOOR_UP = 0.02  # per block, towards a louder one
+    SPEECH_ALPHA = 0.2
+    SPEECH_OVER_FLOOR = 2.0  # a block this far above the floor counts as speech
+
+    def __init__(self):
+        self.noise_floor = None
+        self.speech_level = None
+        self.last = {}  # latest metrics, for pollers such as the GUI meter
+
+    def update(self, block) -> dict:
+        a = np.abs(np.asarray(block, dtype=np.float32).reshape(-1))
+        n = len(a)
+        if not n:
+            return self.last
+        rms = float(np.sqrt(np.dot(a, a) / n))
+        peak = float(a.max())
+        clipped = int(np.count_nonzero(a >= CLIP_LEVEL)) if peak >= CLIP_LEVEL else 0
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        else:
+            rate = self.FLOOR_DOWN if rms < self.noise_floor else self.FLOOR_UP
+            self.noise_floor += (rms - self.noise_floor) * rate
+        if rms > self.SPEECH_OVER_FLOOR * max(self.noise_floor, 1e-4):
+            self.speech_level = rms if self.speech_level is None else \
+                self.speech_level + (rms - self.speech_level) * self.SPEECH_ALPHA
+        self.last = {
+            "rms": rms, "rms_db": round(_db(rms), 1), "peak": round(peak, 4), "clip_ratio": clipped / n,
+            "noise_db": round(_db(self.noise_floor), 1),
+            "snr_db": round(_db(self.speech_level) - _db(self.noise_floor), 1) if self.speech_level else None,
+        }
+        return self.last
+
+
+def hopeless(blocks: list[dict], quiet_rms: float = 0.002, max_clip: float = 0.1, min_snr_db: float = 3.0) -> str:
+    """Why a chunk (its blocks' metrics) is not worth decoding, or "" if it is."""
+    if not blocks:
+        return ""
+    if max(b["rms"] for b in blocks) < quiet_rms:
+        return "too quiet"
+    clip = sum(b["clip_ratio"] for b in blocks) / len(blocks)
+    if clip > max_clip:
+        return f"clipping {clip * 100:.0f}%"
+    snr = blocks[-1]["snr_db"]
+    if snr is not None and snr < min_snr_db:
+        return f"SNR {snr:.0f} dB"
+    return ""
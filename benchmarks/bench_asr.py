@@ -0,0 +1,75 @@
+# benchmarks/bench_asr.py
+"""
+Whisper decode latency and real-time factor per model and compute type.
+
+The clip is cut into chunks of WhisperTranscriber.chunk_duration and each is
+decoded as the live transcriber would; RTF is decode time / audio time over
+the whole clip. Models must already be in the local Hugging Face cache to run offline.
+
+    python -m benchmarks.bench_asr --models tiny base small --compute-types int8 float32
+    python -m benchmarks.bench_asr --wav my_clip.wav
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import read_wav, wav_fixture
+from benchmarks.report import metric, percentile
+
+CHUNK_SECONDS = 3.0
+
+
+def run(models, compute_types, wav: str = "", seconds: int = 15, beam_size: int = 1) -> list[dict]:
+    from whisper_transcriber import WhisperDecoder
+    audio, rate = read_wav(wav or wav_fixture(seconds))
+    if rate != 16000:
+        raise ValueError(f"{wav}: Whisper expects 16 kHz audio, got {rate}")
+    step = int(CHUNK_SECONDS * rate)
+    chunks = [audio[i:i + step] for i in range(0, len(audio), step) if len(audio[i:i + step]) >= rate // 2]
+    rows = []
+    for model in models:
+        for ct in compute_types:
+            t0 = time.perf_counter()
+            decoder = WhisperDecoder(model, compute_type=ct, beam_size=beam_size)
+            load = time.perf_counter() - t0
+            decoder.transcribe(chunks[0])  # warm-up
+            lat = []
+            for chunk in chunks:
+                t0 = time.perf_counter()
+                decoder.transcribe(chunk)
+                lat.append(time.perf_counter() - t0)
+            rows.append({
+                "model": model, "compute_type": ct, "load_s": load,
+                "chunk_p50_ms": percentile(lat, 50) * 1000, "chunk_p95_ms": percentile(lat, 95) * 1000,
+                "rtf": sum(lat) / (len(audio) / rate),
+            })
+    return rows
+
+
+def suite(quick: bool = False) -> dict:
+    metrics = {}
+    models = ["tiny"] if quick else ["tiny", "base"]
+    for r in run(models, ["int8"], seconds=9 if quick else 15):
+        key = f"asr.{r['model']}.{r['compute_type']}"
+        metrics[key + ".load_s"] = metric(r["load_s"], "s")
+        metrics[key + ".chunk_p50_ms"] = metric(r["chunk_p50_ms"], "ms")
+        metrics[key + ".chunk_p95_ms"] = metric(r["chunk_p95_ms"], "ms")
+        metrics[key + ".rtf"] = metric(r["rtf"], "x")
+    return metrics
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--models", nargs="+", default=["tiny", "base"])
+    ap.add_argument("--compute-types", nargs="+", default=["int8"])
+    ap.add_argument("--wav", default="", help="16 kHz WAV clip (default: generated fixture)")
+    ap.add_argument("--seconds", type=int, default=15)
+    ap.add_argument("--beam", type=int, default=1)
+    args = ap.parse_args()
+    print(f"{'model':<10}{'compute':<10}{'load s':>8}{'p50 ms':>9}{'p95 ms':>9}{'RTF':>7}")
+    for r in run(args.models, args.compute_types, args.wav, args.seconds, args.beam):
+        print(f"{r['model']:<10}{r['compute_type']:<10}{r['load_s']:>8.2f}{r['chunk_p50_ms']:>9.0f}"
+              f"{r['chunk_p95_ms']:>9.0f}{r['rtf']:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_audio_dsp.py
+"""
+CPU cost per second of captured audio in the ASR thread, before decoding:
+the current 16 kHz mono path vs. native capture (44.1/48 kHz stereo) through
+audio_dsp.CapturePipeline, plus resampling accuracy on a 1 kHz tone, and the
+per-block cost of AudioHealth metrics against the plain RMS they replace.
+
+    python -m benchmarks.bench_audio_dsp --seconds 120
+"""
+import argparse
+import time
+
+import numpy as np
+
+from audio_dsp import AudioHealth, CapturePipeline, normalize_gain
+from benchmarks.fixtures import voiced_signal
+from benchmarks.report import metric, timed
+
+BLOCK_SECONDS = 0.5  # WhisperTranscriber.block_duration
+CHUNK_SECONDS = 3.0  # WhisperTranscriber.chunk_duration
+FORMATS = [(16000, 1), (44100, 2), (48000, 2)]
+
+
+def _device_audio(rate: int, channels: int, seconds: int) -> np.ndarray:
+    mono = voiced_signal(seconds, rate) + np.float32(0.01)  # a little DC, as cheap mics have
+    return np.repeat(mono[:, None], channels, axis=1)
+
+
+def _asr_thread_cpu(audio: np.ndarray, rate: int, native: bool) -> float:
+    """CPU seconds for what _transcriber does to each block and chunk, minus the decode itself."""
+    pipeline = CapturePipeline(rate) if native else None
+    step = int(rate * BLOCK_SECONDS)
+    chunk_frames = int(16000 * CHUNK_SECONDS)
+    buf, frames = [], 0
+    t0 = time.process_time()
+    for i in range(0, len(audio), step):
+        block = audio[i:i + step].copy()  # _audio_callback copies
+        if pipeline is not None:
+            block = pipeline.process(block)
+        float(np.sqrt(np.mean(np.square(block, dtype=np.float32))))
+        buf.append(block)
+        frames += len(block)
+        if frames >= chunk_frames:
+            chunk = np.concatenate(buf)[:chunk_frames].flatten().astype(np.float32)
+            if pipeline is not None:
+                normalize_gain(chunk)
+            buf, frames = [], 0
+    return time.process_time() - t0
+
+
+def tone_snr_db(rate: int, seconds: int = 2) -> float:
+    t = np.arange(rate * seconds) / rate
+    x = (0.3 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+    p = CapturePipeline(rate)
+    step = int(rate * BLOCK_SECONDS)
+    y = np.concatenate([p.process(x[i:i + step]) for i in range(0, len(x), step)])[:, 0]
+    tt = np.arange(len(y)) / 16000
+    seg = slice(4000, len(y) - 1000)
+    best = np.inf
+    for lag in np.arange(0, 64) / 2:  # the filter delay, in half-samples
+        err = y[seg] - 0.3 * np.sin(2 * np.pi * 1000 * (tt[seg] - lag / 16000))
+        best = min(best, float(np.mean(err ** 2)))
+    return 10 * np.log10(0.045 / max(best, 1e-20))
+
+
+def health_overhead(blocks: int = 2000) -> dict:
+    """Microseconds per 0.5 s 16 kHz block: plain RMS (the old silence check) vs. AudioHealth.update."""
+    audio = voiced_signal(blocks * BLOCK_SECONDS, 16000)[:, None]
+    step = int(16000 * BLOCK_SECONDS)
+    chunks = [audio[i:i + step] for i in range(0, len(audio) - step + 1, step)]
+    health = AudioHealth()
+
+    def rms_only():
+        for b in chunks:
+            float(np.sqrt(np.mean(np.square(b, dtype=np.float32))))
+
+    def metrics():
+        for b in chunks:
+            health.update(b)
+
+    out = {}
+    for name, fn in (("rms_us_per_block", rms_only), ("health_us_per_block", metrics)):
+        out[name] = timed(fn) / len(chunks) * 1e6
+    return out
+
+
+def run(seconds: int = 60, repeat: int = 3) -> list[dict]:
+    rows = []
+    for rate, channels in FORMATS:
+        audio = _device_audio(rate, channels, seconds)
+        native = rate != 16000 or channels != 1
+        cpu = min(_asr_thread_cpu(audio, rate, native) for _ in range(repeat))
+        rows.append({"format": f"{rate // 1000 if rate % 1000 == 0 else rate / 1000}k_{channels}ch",
+                     "path": "native" if native else "current",
+                     "cpu_ms_per_audio_s": cpu / seconds * 1000,
+                     "tone_snr_db": tone_snr_db(rate) if native else None})
+    return rows
+
+
+def suite(quick: bool = False) -> dict:
+    metrics = {}
+    for r in run(20 if quick else 60, 2 if quick else 3):
+        metrics[f"audio_dsp.{r['format']}.cpu_ms_per_audio_s"] = metric(r["cpu_ms_per_audio_s"], "ms")
+        if r["tone_snr_db"] is not None:
+            metrics[f"audio_dsp.{r['format']}.tone_snr_db"] = metric(r["tone_snr_db"], "dB", lower_is_better=False)
+    for name, us in health_overhead(500 if quick else 2000).items():
+        metrics[f"audio_dsp.{name}"] = metric(us, "us")
+    return metrics
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=int, default=60)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    print(f"{'format':<12}{'path':<9}{'CPU ms / audio s':>18}{'1 kHz SNR dB':>14}")
+    for r in run(args.seconds, args.repeat):
+        snr = f"{r['tone_snr_db']:.1f}" if r["tone_snr_db"] is not None else "-"
+        print(f"{r['format']:<12}{r['path']:<9}{r['cpu_ms_per_audio_s']:>18.3f}{snr:>14}")
+    h = health_overhead()
+    print(f"per 0.5 s block: plain RMS {h['rms_us_per_block']:.1f} us, "
+          f"health metrics {h['health_us_per_block']:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_file_loaders.py
+"""
+PDF extraction: full serial parse vs. early exit vs. page-parallel, and
+load_text throughput per format (txt/pdf/docx).
+
+    python -m benchmarks.bench_file_loaders --pages 50 200 --workers 4
+    python -m benchmarks.bench_file_loaders --formats
+"""
+import argparse
+import os
+import time
+
+from benchmarks.fixtures import docx_fixture, pdf_fixture, txt_fixture
+from benchmarks.report import metric, timed as _time
+from file_loaders import load_text
+
+
+def run(pages_list, workers: int, budget: int, repeat: int) -> list[dict]:
+    rows = []
+    for pages in pages_list:
+        path = pdf_fixture(pages)
+        cases = {
+            "full": lambda: load_text(path),
+            f"budget_{budget}": lambda: load_text(path, max_chars=budget),
+            f"parallel_x{workers}": lambda: load_text(path, workers=workers),
+            # load_text keeps a budgeted read serial; timed to show that early exit still wins
+            f"parallel_x{workers}_budget": lambda: load_text(path, max_chars=budget, workers=workers),
+        }
+        for name, fn in cases.items():
+            rows.append({"pages": pages, "case": name, "seconds": _time(fn, repeat)})
+    return rows
+
+
+def run_formats(repeat: int = 3) -> list[dict]:
+    """Roughly a 20-page document in each format; formats whose reader is missing are left out."""
+    makers = {"txt": lambda: txt_fixture(900), "pdf": lambda: pdf_fixture(20), "docx": lambda: docx_fixture(900)}
+    rows = []
+    for fmt, make in makers.items():
+        try:
+            path = make()
+        except ImportError:
+            continue
+        chars = len(load_text(path))
+        if not chars:
+            continue
+        seconds = _time(lambda: load_text(path), repeat)
+        rows.append({"format": fmt, "chars": chars, "seconds": seconds, "mchars_per_s": chars / seconds / 1e6})
+    return rows
+
+
+def suite(quick: bool = False) -> dict:
+    metrics = {}
+    for r in run_formats(2 if quick else 3):
+        metrics[f"load_text.{r['format']}.mchars_per_s"] = metric(r["mchars_per_s"], "Mchar/s", lower_is_better=False)
+    for r in run([20] if quick else [20, 100], workers=4, budget=8000, repeat=2 if quick else 3):
+        metrics[f"load_text.pdf_{r['pages']}p.{r['case']}_s"] = metric(r["seconds"], "s")
+    return metrics
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[20, 100, 400])
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    ap.add_argument("--budget", type=int, default=8000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--formats", action="store_true", help="Throughput per file format instead")
+    args = ap.parse_args()
+
+    if args.formats:
+        print(f"{'format':<8}{'chars':>10}{'seconds':>10}{'Mchar/s':>9}")
+        for r in run_formats(args.repeat):
+            print(f"{r['format']:<8}{r['chars']:>10}{r['seconds']:>10.4f}{r['mchars_per_s']:>9.2f}")
+        return
+
+    rows = run(args.pages, args.workers, args.budget, args.repeat)
+    base = {r["pages"]: r["seconds"] for r in rows if r["case"] == "full"}
+    print(f"{os.cpu_count()} CPUs (the pool is capped at this)")
+    print(f"{'pages':>6}  {'case':<24}{'seconds':>10}{'speedup':>9}")
+    for r in rows:
+        print(f"{r['pages']:>6}  {r['case']:<24}{r['seconds']:>10.3f}{base[r['pages']] / r['seconds']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
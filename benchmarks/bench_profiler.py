@@ -0,0 +1,80 @@
+# benchmarks/bench_profiler.py
+"""
+Cost of `--profile`: a CPU-bound job timed with and without the sampling
+profiler running, alongside idle threads parked at realistic stack depths (as
+the ASR, TTS, scheduler and LLM pool threads are during an interview).
+
+    python -m benchmarks.bench_profiler --threads 12 --interval 0.01
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.report import metric
+from profiler import SamplingProfiler
+
+
+def _park(depth: int, stop: threading.Event):
+    if depth:
+        return _park(depth - 1, stop)
+    stop.wait()
+
+
+def _work(n: int = 400_000) -> int:
+    x = 0
+    for i in range(n):
+        x += i * i
+    return x
+
+
+def _job_seconds(repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.process_time()
+        _work()
+        best = min(best, time.process_time() - t0)
+    return best
+
+
+def run(threads: int = 12, depth: int = 30, interval: float = 0.01, repeat: int = 15) -> dict:
+    stop = threading.Event()
+    parked = [threading.Thread(target=_park, args=(depth, stop), name=f"idle_{i}", daemon=True)
+              for i in range(threads)]
+    for t in parked:
+        t.start()
+    try:
+        plain = _job_seconds(repeat)
+        prof = SamplingProfiler(interval=interval).start()
+        t0 = time.perf_counter()
+        profiled = _job_seconds(repeat)
+        wall = time.perf_counter() - t0
+        prof.stop(write=False)
+    finally:
+        stop.set()
+    return {
+        "slowdown_pct": max(0.0, profiled / plain - 1.0) * 100,
+        "sample_us": prof.overhead / max(prof.samples, 1) * 1e6,
+        "overhead_pct": prof.overhead / wall * 100,
+        "samples": prof.samples,
+    }
+
+
+def suite(quick: bool = False) -> dict:
+    r = run(repeat=5 if quick else 15)
+    return {"profiler.sample_us": metric(r["sample_us"], "us"),
+            "profiler.overhead_pct": metric(r["overhead_pct"], "%")}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=12, help="Idle threads to sample besides the job")
+    ap.add_argument("--depth", type=int, default=30, help="Stack depth of each idle thread")
+    ap.add_argument("--interval", type=float, default=0.01)
+    args = ap.parse_args()
+    r = run(args.threads, args.depth, args.interval)
+    print(f"{r['samples']} samples: {r['sample_us']:.0f} us each, profiler thread "
+          f"{r['overhead_pct']:.2f}% of one core, CPU-bound job {r['slowdown_pct']:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
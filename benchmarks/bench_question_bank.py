@@ -0,0 +1,81 @@
+# benchmarks/bench_question_bank.py
+"""
+BM25 question-bank build time and retrieval latency as the bank grows.
+
+    python -m benchmarks.bench_question_bank --sizes 1000 10000 50000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.report import metric
+from question_bank import QuestionBank
+
+
+def _vocab(size: int, rnd: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rnd.choice(letters) for _ in range(rnd.randint(4, 9))) for _ in range(size)]
+
+
+def synthetic_bank(n: int, seed: int = 0, vocab_size: int = 20000) -> list[dict]:
+    """Questions drawn from a Zipf-like vocabulary, roughly like real question text."""
+    rnd = random.Random(seed)
+    vocab = _vocab(vocab_size, rnd)
+    weights = [1.0 / (r + 1) for r in range(vocab_size)]
+    levels = ("junior", "mid", "senior")
+    out = []
+    for i in range(n):
+        words = rnd.choices(vocab, weights=weights, k=10)
+        out.append({"id": f"s-{i}", "question": "How would you " + " ".join(words) + "?",
+                    "skills": words[:3], "seniority": rnd.choice(levels)})
+    return out
+
+
+def run(sizes, queries: int) -> list[dict]:
+    rows = []
+    for n in sizes:
+        entries = synthetic_bank(n)
+        rnd = random.Random(99)
+        # Queries reuse bank vocabulary, like an answer plus uncovered JD skills would.
+        probes = [" ".join(rnd.choice(entries)["question"] for _ in range(4)) for _ in range(queries)]
+        t0 = time.perf_counter()
+        bank = QuestionBank(entries)
+        build = time.perf_counter() - t0
+        asked = [entries[i]["question"] for i in range(0, min(n, 50), 5)]
+        lat = []
+        for q in probes:
+            t0 = time.perf_counter()
+            bank.best_question(q, exclude=asked)
+            lat.append((time.perf_counter() - t0) * 1000)
+        lat.sort()
+        rows.append({
+            "entries": n,
+            "build_s": build,
+            "p50_ms": statistics.median(lat),
+            "p95_ms": lat[int(0.95 * (len(lat) - 1))],
+        })
+    return rows
+
+
+def suite(quick: bool = False) -> dict:
+    metrics = {}
+    for r in run([1000] if quick else [1000, 10000], 100 if quick else 200):
+        key = f"question_bank.{r['entries']}"
+        metrics[key + ".build_s"] = metric(r["build_s"], "s")
+        metrics[key + ".p95_ms"] = metric(r["p95_ms"], "ms")
+    return metrics
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+    print(f"{'entries':>8}{'build s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for r in run(args.sizes, args.queries):
+        print(f"{r['entries']:>8}{r['build_s']:>10.2f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/bench_scoring.py
+"""
+Parsing of canned LLM scoring replies (no network): the end-of-interview
+feedback (generate_score_and_feedback) and the per-answer score.
+
+    python -m benchmarks.bench_scoring --iterations 20000
+"""
+import argparse
+import time
+
+from benchmarks.fixtures import CANNED_ANSWER_SCORES, CANNED_FEEDBACK
+from benchmarks.report import metric
+
+
+def run(iterations: int = 5000) -> list[dict]:
+    from gemini_question_generator import parse_answer_score, parse_score_and_feedback
+    cases = {"feedback": (parse_score_and_feedback, CANNED_FEEDBACK),
+             "answer_score": (parse_answer_score, CANNED_ANSWER_SCORES)}
+    rows = []
+    for name, (parse, replies) in cases.items():
+        for reply in replies:
+            parse(reply)  # warm the regex cache
+        t0 = time.perf_counter()
+        for _ in range(iterations):
+            for reply in replies:
+                parse(reply)
+        elapsed = time.perf_counter() - t0
+        rows.append({"case": name, "us_per_reply": elapsed / (iterations * len(replies)) * 1e6})
+    return rows
+
+
+def suite(quick: bool = False) -> dict:
+    return {f"scoring.{r['case']}.parse_us": metric(r["us_per_reply"], "us")
+            for r in run(1000 if quick else 5000)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=5000)
+    args = ap.parse_args()
+    for r in run(args.iterations):
+        print(f"{r['case']:<14}{r['us_per_reply']:>9.1f} us/reply")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_tts.py
+"""
+TextToSpeech time-to-audio (speak() -> first audio, from the tts.* trace spans)
+and SpeechRenderer render time, on short and long prompts. Plays audio.
+
+    python -m benchmarks.bench_tts --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.report import metric, percentile
+
+PROMPTS = {
+    "short": "Tell me about yourself.",
+    "long": "Thanks. You mentioned forecasting with gradient boosting; how did you validate those "
+            "models over time, and what would you change about that setup if you built it again?",
+}
+
+
+def _time_to_audio(tts, tracer, text: str, turn: int) -> float:
+    tracer.set_turn(turn)
+    tts.speak(text, block=True)
+    spans = [s for s in tracer.spans if s["turn"] == turn and s["name"] in ("tts.queue_wait", "tts.start")]
+    if len(spans) < 2:
+        raise RuntimeError("the TTS engine reported no started-utterance event")
+    return sum(s["end"] - s["start"] for s in spans)
+
+
+def run(repeat: int = 3) -> list[dict]:
+    import pyttsx3  # noqa: F401  (skip cleanly when the engine is not installed)
+    from text_to_speech import SpeechRenderer, TextToSpeech
+    from tracing import Tracer
+
+    tracer = Tracer()
+    tracer.begin_session("bench")
+    tts = TextToSpeech(tracer=tracer)
+    renderer = SpeechRenderer()
+    rows, turn = [], 0
+    for name, text in PROMPTS.items():
+        first, render = [], []
+        for _ in range(repeat):
+            first.append(_time_to_audio(tts, tracer, text, turn))
+            turn += 1
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            t0 = time.perf_counter()
+            renderer.render_to_file(text, path)
+            render.append(time.perf_counter() - t0)
+            os.remove(path)
+        rows.append({"prompt": name, "first_audio_p50_ms": percentile(first, 50) * 1000,
+                     "first_audio_max_ms": max(first) * 1000, "render_p50_ms": percentile(render, 50) * 1000})
+    return rows
+
+
+def suite(quick: bool = False) -> dict:
+    metrics = {}
+    for r in run(2 if quick else 3):
+        metrics[f"tts.{r['prompt']}.first_audio_p50_ms"] = metric(r["first_audio_p50_ms"], "ms")
+        metrics[f"tts.{r['prompt']}.render_p50_ms"] = metric(r["render_p50_ms"], "ms")
+    return metrics
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    print(f"{'prompt':<8}{'first audio p50 ms':>20}{'max ms':>9}{'render p50 ms':>15}")
+    for r in run(args.repeat):
+        print(f"{r['prompt']:<8}{r['first_audio_p50_ms']:>20.0f}{r['first_audio_max_ms']:>9.0f}"
+              f"{r['render_p50_ms']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
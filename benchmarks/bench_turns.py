@@ -0,0 +1,62 @@
+# benchmarks/bench_turns.py
+"""
+InterviewProcessor turn latency with stub LLM, TTS and ASR, using the
+virtual-clock harness in simulate.py with constant latencies so results are
+deterministic. Turn/question latencies are virtual (what a candidate would
+wait); CPU per session is real and catches processor overhead regressions.
+
+    python -m benchmarks.bench_turns --sessions 200
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import tempfile
+
+from benchmarks.report import metric
+
+LATENCIES = {
+    "llm": "const:0.9", "seed": "const:1.5", "score": "const:1.2", "tts": "const:0.25",
+    "asr": "const:0.35", "think": "const:1.0", "pause": "const:0.4",
+}
+
+
+def run(sessions: int = 100, workers: int = 1, end_of_turn: str = "adaptive") -> dict:
+    from simulate import DEFAULT_SCRIPTS, Simulation
+    from transcript_store import TranscriptStore
+    root = tempfile.mkdtemp(prefix="bench_turns_")
+    try:
+        sim = Simulation(DEFAULT_SCRIPTS, latencies=LATENCIES, store=TranscriptStore(root),
+                         end_of_turn=end_of_turn)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return sim.run(sessions, workers)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def suite(quick: bool = False) -> dict:
+    r = run(30 if quick else 100)
+    return {
+        "turns.turn_latency_p50_ms": metric(r["turn_latency_ms"]["p50"], "ms"),
+        "turns.turn_latency_p95_ms": metric(r["turn_latency_ms"]["p95"], "ms"),
+        "turns.question_latency_p95_ms": metric(r["question_latency_ms"]["p95"], "ms"),
+        "turns.cpu_ms_per_session": metric(r["cpu_ms_per_session"], "ms"),
+        "turns.stalled_sessions": metric(r["stalled"], "sessions"),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=100)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--end-of-turn", default="adaptive", choices=("adaptive", "fixed"))
+    args = ap.parse_args()
+    r = run(args.sessions, args.workers, args.end_of_turn)
+    print(f"turn latency ms      {r['turn_latency_ms']}")
+    print(f"question latency ms  {r['question_latency_ms']}")
+    print(f"cpu ms / session     {r['cpu_ms_per_session']}")
+    print(f"stalled              {r['stalled']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# benchmarks/fixtures.py
+"""Deterministic benchmark inputs generated on demand, so nothing binary is checked in."""
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_fixtures")
+
+_WORDS = (
+    "python forecasting arima prophet lstm xgboost pandas numpy sql aws spark "
+    "regression pipeline stakeholder analysis model feature seasonality anomaly "
+    "deployment latency dataset training validation accuracy team project"
+).split()
+
+
+def lorem_lines(n_lines: int, seed: int = 0, words_per_line: int = 12) -> list[str]:
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choice(_WORDS) for _ in range(words_per_line)) for _ in range(n_lines)]
+
+
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: int, lines_per_page: int = 45, seed: int = 0) -> str:
+    """Write a minimal multi-page text PDF (Helvetica, one content stream per page)."""
+    rnd_lines = lorem_lines(pages * lines_per_page, seed=seed)
+    objs = []  # index 0 -> object 1
+
+    def add(body: bytes) -> int:
+        objs.append(body)
+        return len(objs)
+
+    catalog = add(b"")  # patched below
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for p in range(pages):
+        chunk = rnd_lines[p * lines_per_page:(p + 1) * lines_per_page]
+        ops = ["BT", "/F1 10 Tf", "14 TL", "40 800 Td"]
+        for line in chunk:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+        ))
+    objs[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objs[pages_obj - 1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) + b"] /Count %d >>" % len(kids)
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for i, body in enumerate(objs, 1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % i + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1))
+        for off in offsets:
+            f.write(b"%010d 00000 n \n" % off)
+        f.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, catalog, xref))
+    return path
+
+
+def pdf_fixture(pages: int) -> str:
+    path = os.path.join(FIXTURE_DIR, f"doc_{pages}p.pdf")
+    if not os.path.exists(path):
+        write_pdf(path, pages)
+    return path
+
+
+def txt_fixture(lines: int) -> str:
+    path = os.path.join(FIXTURE_DIR, f"doc_{lines}l.txt")
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lorem_lines(lines)) + "\n")
+    return path
+
+
+def docx_fixture(paragraphs: int) -> str:
+    """Needs python-docx, like file_loaders does for reading."""
+    path = os.path.join(FIXTURE_DIR, f"doc_{paragraphs}para.docx")
+    if not os.path.exists(path):
+        import docx
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        doc = docx.Document()
+        for line in lorem_lines(paragraphs):
+            doc.add_paragraph(line)
+        doc.save(path)
+    return path
+
+
+# ----------------- audio -----------------
+SPOKEN_TEXT = (
+    "I have three years of experience building forecasting models in Python. "
+    "Most of my work uses pandas and gradient boosting, and I validate every model "
+    "with a rolling backtest before it goes to the business team."
+)
+
+
+def write_wav(path: str, samples, samplerate: int = 16000) -> str:
+    import wave
+    import numpy as np
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(samplerate)
+        w.writeframes(pcm.tobytes())
+    return path
+
+
+def read_wav(path: str):
+    """(mono float32 samples, samplerate)."""
+    import wave
+    import numpy as np
+    with wave.open(path, "rb") as w:
+        rate, channels, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    if width != 2:
+        raise ValueError(f"{path}: expected 16-bit PCM")
+    pcm = np.frombuffer(raw, dtype="<i2").reshape(-1, channels)
+    return pcm.astype(np.float32).mean(axis=1) / 32768.0, rate
+
+
+def voiced_signal(seconds: float, samplerate: int = 16000, seed: int = 0):
+    """Speech-shaped audio without a TTS engine: a gliding harmonic buzz cut into syllables."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    pitch = 120 + 20 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / samplerate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t), 0, None) ** 0.5
+    words = (rng.random(int(seconds * 2) + 1) > 0.15).repeat(samplerate // 2)[:len(t)]
+    return (0.2 * voice * syllables * words + 0.002 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def wav_fixture(seconds: int = 10, samplerate: int = 16000) -> str:
+    """
+    A speech clip about `seconds` long. Rendered once with pyttsx3 when it is
+    installed (offline engine), otherwise synthesised; either way cached under _fixtures/.
+    """
+    path = os.path.join(FIXTURE_DIR, f"speech_{seconds}s.wav")
+    if os.path.exists(path):
+        return path
+    import numpy as np
+    samples = None
+    try:
+        from text_to_speech import SpeechRenderer
+        tmp = path + ".tts.wav"
+        SpeechRenderer(rate=160).render_to_file(SPOKEN_TEXT, tmp)
+        clip, rate = read_wav(tmp)
+        os.remove(tmp)
+        if rate != samplerate:
+            pos = np.arange(int(len(clip) * samplerate / rate)) * rate / samplerate
+            clip = np.interp(pos, np.arange(len(clip)), clip).astype(np.float32)
+        reps = int(np.ceil(seconds * samplerate / max(1, len(clip))))
+        samples = np.tile(clip, reps)[:seconds * samplerate]
+    except Exception:
+        samples = voiced_signal(seconds, samplerate)
+    return write_wav(path, samples, samplerate)
+
+
+# ----------------- LLM replies -----------------
+CANNED_FEEDBACK = [
+    "SCORE: 72\nREASONS:\n- Solid forecasting background\n- Clear on validation\n- Relevant tools\n"
+    "SUGGESTIONS:\n- Quantify impact\n- Discuss deployment\n- Cover monitoring\n",
+    "score: 45\n\nreasons:\n- Vague answers\n- Little SQL depth\n\nsuggestions:\n- Practice system design\n",
+    "**SCORE:** 88\nREASONS:\r\n- Strong ML depth\r\n- Good communication\r\n- Led a team\r\n"
+    "SUGGESTIONS:\r\n- Go deeper on cloud costs\r\n",
+    "I could not score this transcript.",
+    "SCORE: 130\nREASONS:\n" + "".join(f"- reason {i}\n" for i in range(12)) + "SUGGESTIONS:\n- none\n",
+]
+
+CANNED_ANSWER_SCORES = [
+    "SCORE: 80\nSTRENGTH: Explained differencing clearly.\nGAP: No mention of seasonality.",
+    "Score: 55\nStrength: Knows the tools.\nGap: Could not explain the metric.",
+    "SCORE: n/a\nSTRENGTH:\nGAP: Off topic.",
+    "",
+]
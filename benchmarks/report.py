@@ -0,0 +1,87 @@
+# benchmarks/report.py
+"""
+Benchmark results as flat, machine-readable metrics, and regression checks
+against a stored baseline.
+
+A metric is {"value": float, "unit": str, "lower_is_better": bool}, keyed by a
+dotted name such as "asr.base.int8.rtf". A results file is
+{"env": {...}, "metrics": {name: metric}, "skipped": {suite: reason}}.
+"""
+import json
+import os
+import platform
+import sys
+import time
+
+
+def metric(value: float, unit: str, lower_is_better: bool = True) -> dict:
+    return {"value": round(float(value), 6), "unit": unit, "lower_is_better": lower_is_better}
+
+
+def timed(fn, repeat: int = 3) -> float:
+    """Best wall time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def percentile(vals, pct: float) -> float:
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(pct / 100 * len(vals)))] if vals else 0.0
+
+
+def env_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "argv": sys.argv[1:],
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.25, min_delta: float = 0.0) -> list[dict]:
+    """
+    One row per metric present in both files. A metric regresses when it moved
+    in its bad direction by more than `tolerance` (relative) and `min_delta` (absolute).
+    """
+    rows = []
+    base, cur = baseline.get("metrics", {}), current.get("metrics", {})
+    for name in sorted(set(base) & set(cur)):
+        b, c = base[name]["value"], cur[name]["value"]
+        lower = cur[name].get("lower_is_better", True)
+        worse = (c - b) if lower else (b - c)
+        change = (c - b) / abs(b) if b else (0.0 if c == b else float("inf"))
+        regressed = worse > abs(b) * tolerance and worse > min_delta
+        improved = -worse > abs(b) * tolerance and -worse > min_delta
+        rows.append({"name": name, "baseline": b, "current": c, "unit": cur[name]["unit"],
+                     "change": change, "status": "REGRESSED" if regressed else "improved" if improved else "ok"})
+    return rows
+
+
+def print_comparison(rows: list[dict], baseline: dict, current: dict):
+    print(f"{'metric':<44}{'baseline':>12}{'current':>12}{'change':>9}  status")
+    for r in rows:
+        change = f"{r['change'] * 100:+.1f}%" if r["change"] != float("inf") else "new"
+        print(f"{r['name']:<44}{r['baseline']:>12.4g}{r['current']:>12.4g}{change:>9}  {r['status']}")
+    only_base = sorted(set(baseline.get("metrics", {})) - set(current.get("metrics", {})))
+    if only_base:
+        print(f"[BENCH] not measured this run: {', '.join(only_base)}")
+    regressed = [r["name"] for r in rows if r["status"] == "REGRESSED"]
+    print(f"[BENCH] {len(rows)} compared, {len(regressed)} regressed"
+          + (f": {', '.join(regressed)}" if regressed else ""))
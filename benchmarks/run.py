@@ -0,0 +1,86 @@
+# benchmarks/run.py
+"""
+Run the benchmark suites, write the results as JSON and optionally compare
+them with a stored baseline. Exits 1 when any metric regressed.
+
+    python -m benchmarks.run --out bench.json                       # every suite
+    python -m benchmarks.run --only scoring turns --quick --baseline benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json bench.json --tolerance 0.25
+    python -m benchmarks.run --out benchmarks/baseline.json         # refresh the baseline
+
+Suites whose optional dependency (faster-whisper, pyttsx3, pdfminer, python-docx)
+is missing are recorded under "skipped" rather than failing the run.
+"""
+import argparse
+import importlib
+import sys
+import time
+import traceback
+
+from benchmarks import report
+
+SUITES = {
+    "scoring": "benchmarks.bench_scoring",
+    "turns": "benchmarks.bench_turns",
+    "question_bank": "benchmarks.bench_question_bank",
+    "load_text": "benchmarks.bench_file_loaders",
+    "audio_dsp": "benchmarks.bench_audio_dsp",
+    "profiler": "benchmarks.bench_profiler",
+    "soak": "benchmarks.soak",
+    "asr": "benchmarks.bench_asr",
+    "tts": "benchmarks.bench_tts",
+}
+
+
+def run_suites(names, quick: bool = False) -> dict:
+    results = {"env": report.env_info(), "metrics": {}, "skipped": {}, "seconds": {}}
+    for name in names:
+        t0 = time.perf_counter()
+        try:
+            metrics = importlib.import_module(SUITES[name]).suite(quick)
+        except ImportError as e:
+            results["skipped"][name] = str(e)
+            print(f"[BENCH] {name}: skipped ({e})")
+            continue
+        except Exception as e:
+            traceback.print_exc()
+            results["skipped"][name] = f"failed: {e}"
+            print(f"[BENCH] {name}: failed ({e})")
+            continue
+        results["metrics"].update(metrics)
+        results["seconds"][name] = round(time.perf_counter() - t0, 2)
+        print(f"[BENCH] {name}: {len(metrics)} metrics in {results['seconds'][name]:.1f} s")
+    return results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--only", nargs="+", choices=sorted(SUITES), default=list(SUITES))
+    ap.add_argument("--quick", action="store_true", help="Smaller inputs, for CI")
+    ap.add_argument("--out", default="", help="Write results JSON here")
+    ap.add_argument("--baseline", default="", help="Compare this run with a stored results file")
+    ap.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                    help="Compare two results files without running anything")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Relative slowdown that counts as a regression")
+    args = ap.parse_args()
+
+    if args.compare:
+        baseline, current = report.load(args.compare[0]), report.load(args.compare[1])
+    else:
+        current = run_suites(args.only, args.quick)
+        if args.out:
+            report.save(current, args.out)
+            print(f"[BENCH] results -> {args.out}")
+        if not args.baseline:
+            for name, m in sorted(current["metrics"].items()):
+                print(f"{name:<44}{m['value']:>12.4g} {m['unit']}")
+            return 0
+        baseline = report.load(args.baseline)
+
+    rows = report.compare(baseline, current, args.tolerance)
+    report.print_comparison(rows, baseline, current)
+    return 1 if any(r["status"] == "REGRESSED" for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
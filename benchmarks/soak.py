@@ -0,0 +1,173 @@
+# benchmarks/soak.py
+"""
+Soak test for long-running processes: hundreds of simulated interviews through
+ONE InterviewProcessor, recycled between sessions the way `main.py --loop`
+does, with the real transcript store, tracer and cohort analytics writing to a
+temporary folder. Some candidates ramble far past MAX_ANSWER_WORDS, and the
+JDs outnumber CohortAnalytics.max_cached. RSS is sampled after every session;
+once warmed up it must stay flat. A WhisperTranscriber audio queue is also
+flooded past its cap.
+
+Exits 1 if RSS grew by more than --max-growth-mb after warm-up, the fitted
+slope exceeds --max-kb-per-session, a session stalled, or a cap did not hold.
+
+    python -m benchmarks.soak --sessions 500
+    python -m benchmarks.soak --sessions 300 --memwatch mem/   # tracemalloc diff warm-up -> end
+
+With --memwatch, tracemalloc's own bookkeeping grows RSS, so the RSS limits are not applied.
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.report import metric
+from memwatch import MemoryWatch, rss_bytes
+
+LATENCIES = {
+    "llm": "const:0.9", "seed": "const:1.5", "score": "const:1.2", "tts": "const:0.25",
+    "asr": "const:0.35", "think": "const:1.0", "pause": "const:0.4",
+}
+RAMBLING = {"answers": [" ".join(["and then we also looked at the data again"] * 200), "skip", "stop interview"]}
+JD_VARIANTS = 40
+
+
+def _slope(ys: list) -> float:
+    """Least-squares slope of ys against their index."""
+    n = len(ys)
+    if n < 2:
+        return 0.0
+    mx, my = (n - 1) / 2, sum(ys) / n
+    return sum((x - mx) * (y - my) for x, y in enumerate(ys)) / sum((x - mx) ** 2 for x in range(n))
+
+
+def flood_audio_queue(seconds: float = 600.0) -> dict:
+    """Feed a transcriber whose ASR thread is not keeping up; the queue must stay at its cap."""
+    import numpy as np
+    from whisper_transcriber import WhisperTranscriber
+    stt = WhisperTranscriber(on_text=lambda text: None, decoder=object())  # never started: nothing drains
+    block = np.zeros((stt.frames_per_block, 1), dtype=np.float32)
+    for _ in range(int(seconds / stt.block_duration)):
+        stt.feed(block)
+    return {"queued": stt.audio_queue.qsize(), "cap": stt.audio_queue.maxsize, "dropped": stt.dropped_blocks}
+
+
+def run(sessions: int = 300, warmup: int = 50, memwatch: str = "") -> dict:
+    from cohort_analytics import CohortAnalytics
+    from interview_processor import InterviewProcessor
+    from simulate import (DEFAULT_LATENCIES, DEFAULT_SCRIPTS, MAX_VIRTUAL_SECONDS, FakeLLM, ScriptedCandidate,
+                          VirtualRuntime, parse_latency)
+    from tracing import Tracer
+    from transcript_store import TranscriptStore
+
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(here, "resume.txt"), "r", encoding="utf-8") as f:
+        resume = f.read()[:InterviewProcessor.DOC_CHAR_BUDGET]
+    with open(os.path.join(here, "job_description.txt"), "r", encoding="utf-8") as f:
+        jd = f.read()[:InterviewProcessor.DOC_CHAR_BUDGET - 20]
+    scripts = DEFAULT_SCRIPTS + [RAMBLING]
+    latencies = {k: parse_latency(v) for k, v in {**DEFAULT_LATENCIES, **LATENCIES}.items()}
+
+    root = tempfile.mkdtemp(prefix="soak_")
+    watch = MemoryWatch(memwatch) if memwatch else None
+    rt = VirtualRuntime(0)
+    p = InterviewProcessor(None, scheduler=rt.scheduler, llm=FakeLLM(rt, latencies), executor=rt,
+                           transcript_store=TranscriptStore(os.path.join(root, "transcripts")),
+                           tracer=Tracer(os.path.join(root, "traces"), clock=rt.clock),
+                           analytics=CohortAnalytics(os.path.join(root, "analytics")))
+    rss, stalled, longest = [], 0, 0
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for n in range(sessions):
+                if n:
+                    p.recycle()
+                script = scripts[n % len(scripts)]
+                cand = ScriptedCandidate(rt, script["answers"], latencies)
+                cand.processor = p
+                p.tts = cand
+                p.resume_text, p.jd_text = resume, f"{jd}\nTeam {n % JD_VARIANTS}"
+                p.candidate = f"soak-{n % 50}"
+                p.max_questions = 4  # per session, like a bundle or hello: recycle() restores the default
+                p.start_interview()
+                rt.scheduler.run(until=rt.clock() + MAX_VIRTUAL_SECONDS, stop=p.done.is_set)
+                stalled += not p.done.is_set()
+                p.close()
+                rt.scheduler.run()  # leftover timers and silence reports, as a live process would see
+                longest = max([longest] + [len(a.split()) for _, a in p.transcript])
+                rss.append(rss_bytes())
+                if watch is not None and n + 1 == warmup:
+                    watch.start()
+                    watch.snapshot("warmup")
+            if watch is not None:
+                watch.snapshot("end")
+    finally:
+        p.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+
+    after = rss[min(warmup, len(rss) - 1):]
+    return {
+        "sessions": sessions,
+        "stalled": stalled,
+        "rss_start_mb": rss[0] / 2**20,
+        "rss_warm_mb": after[0] / 2**20,
+        "rss_end_mb": rss[-1] / 2**20,
+        "growth_mb": (max(after) - after[0]) / 2**20,
+        "kb_per_session": _slope(after) / 1024,
+        "longest_answer_words": longest,
+        "max_answer_words": InterviewProcessor.MAX_ANSWER_WORDS,
+        "cohorts_cached": len(p.analytics._cohorts),
+        "audio_queue": flood_audio_queue(),
+    }
+
+
+def check(r: dict, max_growth_mb: float = 4.0, max_kb_per_session: float = 4.0) -> list[str]:
+    """What broke, empty when the run was clean."""
+    problems = []
+    if r["growth_mb"] > max_growth_mb:
+        problems.append(f"RSS grew {r['growth_mb']:.1f} MB after warm-up (limit {max_growth_mb} MB)")
+    if r["kb_per_session"] > max_kb_per_session:
+        problems.append(f"RSS trend {r['kb_per_session']:.1f} KB/session (limit {max_kb_per_session})")
+    if r["stalled"]:
+        problems.append(f"{r['stalled']} sessions stalled")
+    if r["longest_answer_words"] > r["max_answer_words"] + 50:  # the fragment that crossed the cap
+        problems.append(f"an answer of {r['longest_answer_words']} words got past the cap")
+    q = r["audio_queue"]
+    if q["queued"] > q["cap"]:
+        problems.append(f"audio queue at {q['queued']} blocks, cap {q['cap']}")
+    return problems
+
+
+def suite(quick: bool = False) -> dict:
+    r = run(120 if quick else 300, warmup=40 if quick else 50)
+    return {"soak.rss_growth_mb": metric(r["growth_mb"], "MB"),
+            "soak.rss_kb_per_session": metric(max(0.0, r["kb_per_session"]), "KB")}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=300)
+    ap.add_argument("--warmup", type=int, default=50, help="Sessions before RSS should have levelled off")
+    ap.add_argument("--max-growth-mb", type=float, default=4.0)
+    ap.add_argument("--max-kb-per-session", type=float, default=4.0)
+    ap.add_argument("--memwatch", default="", help="Write tracemalloc snapshots (warm-up, end) here")
+    args = ap.parse_args()
+    r = run(args.sessions, args.warmup, args.memwatch)
+    q = r["audio_queue"]
+    print(f"{r['sessions']} sessions, rss {r['rss_start_mb']:.1f} -> {r['rss_warm_mb']:.1f} (warm) -> "
+          f"{r['rss_end_mb']:.1f} MB; growth after warm-up {r['growth_mb']:.2f} MB, "
+          f"trend {r['kb_per_session']:+.2f} KB/session")
+    print(f"longest answer {r['longest_answer_words']} words (cap {r['max_answer_words']}), "
+          f"{r['cohorts_cached']} cohorts cached, audio queue {q['queued']}/{q['cap']} blocks "
+          f"({q['dropped']} dropped)")
+    inf = float("inf")
+    problems = check(r, *((inf, inf) if args.memwatch else (args.max_growth_mb, args.max_kb_per_session)))
+    for msg in problems:
+        print(f"[SOAK] FAIL: {msg}")
+    print("[SOAK] " + ("FAILED" if problems else "RSS flat, caps held"))
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
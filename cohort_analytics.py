@@ -0,0 +1,437 @@
+# cohort_analytics.py
+"""
+Pass rates, score distributions and per-question weaknesses across every
+interview for a job description, without re-reading the transcripts.
+
+Each scorecard is folded into its JD's cohort as it is saved: running counts,
+a score histogram and per-question / per-skill sums are updated in place, and
+a compact columnar table (one row per interview and per answer, NumPy arrays)
+keeps date-filtered queries to a few vectorised passes. A cohort is one .npz
+file under transcripts/analytics/, replaced atomically on every update. Saves
+hold a lock file, and a cohort another process saved in the meantime is
+reloaded with this process's new sessions folded in, so the GUI, main.py,
+server.py and a rebuild can share one store.
+
+    python cohort_analytics.py list
+    python cohort_analytics.py report --jd job_description.txt --since 2025-01-01
+    python cohort_analytics.py rebuild --jd job_description.txt   # backfill from transcripts/*.json
+"""
+import argparse
+import contextlib
+import datetime
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from transcript_store import DEFAULT_ROOT as TRANSCRIPTS_ROOT, jd_key
+
+DEFAULT_DIR = os.path.join(TRANSCRIPTS_ROOT, "analytics")
+PASS_THRESHOLD = 60  # an answer below this counts as weak
+_EPOCH = datetime.date(1970, 1, 1)
+
+
+def _question_key(q: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (q or "").lower()).strip()
+
+
+def _day(ts) -> int:
+    """Days since 1970 for an ISO date/datetime string (today if missing)."""
+    if not ts:
+        return (datetime.date.today() - _EPOCH).days
+    return (datetime.date.fromisoformat(str(ts)[:10]) - _EPOCH).days
+
+
+@contextlib.contextmanager
+def _locked(path: str):
+    """Hold an exclusive lock on path + ".lock" across processes (fcntl, else msvcrt, else none)."""
+    with open(path + ".lock", "a+b") as f:
+        try:
+            import fcntl
+        except ImportError:
+            fcntl = None
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield  # closing the file releases the lock
+            return
+        try:
+            import msvcrt
+        except ImportError:
+            yield
+            return
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _stamp(path: str):
+    """What identifies one write of a file (os.replace gives every save a new inode); None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _sid_hash(session_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(session_id.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+class _Column:
+    """Append-only NumPy column with amortised O(1) growth."""
+    def __init__(self, dtype, data=None):
+        self.data = np.asarray(data if data is not None else [], dtype=dtype)
+        self.size = len(self.data)
+
+    def append(self, value):
+        if self.size == len(self.data):
+            grown = np.zeros(max(64, 2 * len(self.data)), dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class Cohort:
+    def __init__(self, key: str, label: str = ""):
+        self.key = key
+        self.label = label
+        # running aggregates
+        self.hist = np.zeros(101, dtype=np.int64)  # interviews per overall score
+        self.passes = 0
+        self.questions, self._q_index = [], {}
+        self.q_count = np.zeros(0, dtype=np.int64)
+        self.q_sum = np.zeros(0, dtype=np.float64)
+        self.q_sumsq = np.zeros(0, dtype=np.float64)
+        self.q_weak = np.zeros(0, dtype=np.int64)
+        self.skills, self._s_index = [], {}
+        self.skill_missing = np.zeros(0, dtype=np.int64)
+        # columnar rows, for filtered queries
+        self.i_sid = _Column(np.int64)
+        self.i_day = _Column(np.int32)
+        self.i_score = _Column(np.int16)
+        self.i_pass = _Column(np.bool_)
+        self.a_q = _Column(np.int32)
+        self.a_day = _Column(np.int32)
+        self.a_score = _Column(np.int16)
+        self._seen = set()
+
+    @property
+    def interviews(self) -> int:
+        return self.i_score.size
+
+    def _intern(self, names: list, index: dict, key: str, display: str, arrays: tuple) -> int:
+        """Row for `key`, growing the per-name aggregate arrays when it is new; names keep the first wording."""
+        idx = index.get(key)
+        if idx is None:
+            idx = index[key] = len(names)
+            names.append(display)
+            for name in arrays:
+                setattr(self, name, np.append(getattr(self, name), 0))
+        return idx
+
+    def add(self, scorecard: dict, session_id: str = "", ts=None, missing_skills=()) -> bool:
+        """Fold one scorecard in; False if this session was already counted."""
+        sid = _sid_hash(session_id) if session_id else None
+        if sid is not None and sid in self._seen:
+            return False
+        score = int(max(0, min(100, scorecard.get("score") or 0)))
+        passed = scorecard.get("verdict") == "Pass"
+        day = _day(ts)
+        self.hist[score] += 1
+        self.passes += passed
+        self.i_sid.append(sid or 0)
+        self.i_day.append(day)
+        self.i_score.append(score)
+        self.i_pass.append(passed)
+        if sid is not None:
+            self._seen.add(sid)
+        for p in scorecard.get("per_question") or []:
+            if p.get("score") is None:
+                continue
+            qi = self._intern(self.questions, self._q_index, _question_key(p.get("q", "")), p.get("q", ""),
+                              ("q_count", "q_sum", "q_sumsq", "q_weak"))
+            s = int(p["score"])
+            self.q_count[qi] += 1
+            self.q_sum[qi] += s
+            self.q_sumsq[qi] += s * s
+            self.q_weak[qi] += s < PASS_THRESHOLD
+            self.a_q.append(qi)
+            self.a_day.append(day)
+            self.a_score.append(s)
+        for skill in missing_skills or ():
+            si = self._intern(self.skills, self._s_index, skill, skill, ("skill_missing",))
+            self.skill_missing[si] += 1
+        return True
+
+    # ----------------- queries -----------------
+    def report(self, since: str = None, until: str = None, top: int = 5, min_answers: int = 3) -> dict:
+        """Cohort summary; since/until (ISO dates, until exclusive) filter through the columnar rows."""
+        filtered = bool(since or until)
+        if filtered:
+            lo = _day(since) if since else np.iinfo(np.int32).min
+            hi = _day(until) if until else np.iinfo(np.int32).max
+            days = self.i_day.view()
+            mask = (days >= lo) & (days < hi)
+            scores = self.i_score.view()[mask]
+            n, passes = int(mask.sum()), int(self.i_pass.view()[mask].sum())
+            hist = np.bincount(scores, minlength=101)
+            amask = (self.a_day.view() >= lo) & (self.a_day.view() < hi)
+            aq, ascore = self.a_q.view()[amask], self.a_score.view()[amask].astype(np.float64)
+            nq = len(self.questions)
+            q_count = np.bincount(aq, minlength=nq)
+            q_sum = np.bincount(aq, weights=ascore, minlength=nq)
+            q_sumsq = np.bincount(aq, weights=ascore * ascore, minlength=nq)
+            q_weak = np.bincount(aq, weights=ascore < PASS_THRESHOLD, minlength=nq)
+        else:
+            n, passes, hist = self.interviews, self.passes, self.hist
+            q_count, q_sum, q_sumsq, q_weak = self.q_count, self.q_sum, self.q_sumsq, self.q_weak
+
+        out = {"cohort": self.key, "label": self.label, "interviews": n, "since": since, "until": until,
+               "pass_rate": round(passes / n, 3) if n else 0.0}
+        if n:
+            cdf = np.cumsum(hist)
+            out["score_mean"] = round(float(np.dot(np.arange(101), hist) / n), 1)
+            out["score_pct"] = {f"p{p}": int(np.searchsorted(cdf, p / 100 * n)) for p in (10, 25, 50, 75, 90)}
+            buckets = np.add.reduceat(hist, np.arange(0, 100, 10))  # the last one is 90-100
+            out["score_buckets"] = {f"{b}-{b + 9 if b < 90 else 100}": int(v)
+                                    for b, v in zip(range(0, 100, 10), buckets)}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(q_count > 0, q_sum / np.maximum(q_count, 1), np.nan)
+            std = np.sqrt(np.maximum(0.0, q_sumsq / np.maximum(q_count, 1) - mean ** 2))
+        eligible = np.flatnonzero(q_count >= min_answers)
+        order = eligible[np.argsort(mean[eligible], kind="stable")][:top]
+        out["weakest_questions"] = [
+            {"question": self.questions[i], "answers": int(q_count[i]), "mean": round(float(mean[i]), 1),
+             "std": round(float(std[i]), 1), "weak_rate": round(float(q_weak[i] / q_count[i]), 3)}
+            for i in order
+        ]
+        if not filtered and len(self.skills):
+            order = np.argsort(-self.skill_missing, kind="stable")[:top]
+            out["most_missed_skills"] = [{"skill": self.skills[i], "interviews": int(self.skill_missing[i])}
+                                         for i in order if self.skill_missing[i]]
+        return out
+
+    # ----------------- persistence -----------------
+    def save(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f, meta=np.array(json.dumps({"key": self.key, "label": self.label, "passes": self.passes})),
+                questions=np.array(self.questions, dtype=str), skills=np.array(self.skills, dtype=str),
+                hist=self.hist, q_count=self.q_count, q_sum=self.q_sum, q_sumsq=self.q_sumsq, q_weak=self.q_weak,
+                skill_missing=self.skill_missing,
+                i_sid=self.i_sid.view(), i_day=self.i_day.view(), i_score=self.i_score.view(),
+                i_pass=self.i_pass.view(), a_q=self.a_q.view(), a_day=self.a_day.view(), a_score=self.a_score.view(),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Cohort":
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            c = cls(meta["key"], meta.get("label", ""))
+            c.passes = int(meta.get("passes", 0))
+            c.questions = [str(q) for q in z["questions"]]
+            c._q_index = {_question_key(q): i for i, q in enumerate(c.questions)}
+            c.skills = [str(s) for s in z["skills"]]
+            c._s_index = {s: i for i, s in enumerate(c.skills)}
+            for name in ("hist", "q_count", "q_sum", "q_sumsq", "q_weak", "skill_missing"):
+                setattr(c, name, z[name].copy())
+            for name in ("i_sid", "i_day", "i_score", "i_pass", "a_q", "a_day", "a_score"):
+                col = getattr(c, name)
+                setattr(c, name, _Column(col.data.dtype, z[name]))
+        c._seen = set(int(s) for s in c.i_sid.view() if s)
+        return c
+
+
+class CohortAnalytics:
+    """
+    One per process; cohorts are loaded on first use and the max_cached most
+    recently used stay in memory (evicted ones are saved first). Thread-safe.
+    """
+    def __init__(self, root: str = DEFAULT_DIR, max_cached: int = 32):
+        self.root = root
+        self.max_cached = max_cached
+        self._cohorts = OrderedDict()
+        self._unsaved = set()  # keys recorded with save=False
+        self._pending = {}  # key -> add() arguments recorded here and not yet in the file
+        self._stamps = {}  # key -> _stamp() of the file as last read or written by this process
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"cohort_{key}.npz")
+
+    def _get(self, key: str, label: str = "") -> Cohort:
+        c = self._cohorts.get(key)
+        if c is None:
+            path = self._path(key)
+            self._stamps[key] = _stamp(path)
+            c = Cohort.load(path) if self._stamps[key] is not None else Cohort(key, label)
+            self._cohorts[key] = c
+            while len(self._cohorts) > max(1, self.max_cached):
+                old_key, old = self._cohorts.popitem(last=False)
+                if old_key in self._unsaved:
+                    self._save(old_key, old)
+        else:
+            self._cohorts.move_to_end(key)
+        if label and not c.label:
+            c.label = label
+        return c
+
+    def record(self, jd_text: str, scorecard: dict, session_id: str = "", label: str = "",
+               missing_skills=(), ts=None, save: bool = True, key: str = "") -> str:
+        """Fold a saved scorecard into its JD cohort (or the cohort `key`); returns the cohort key."""
+        key = key or jd_key(jd_text)
+        with self._lock:
+            c = self._get(key, label)
+            if c.add(scorecard, session_id, ts, missing_skills):
+                self._pending.setdefault(key, []).append((scorecard, session_id, ts, missing_skills))
+                if save:
+                    self._save(key, c)
+                else:
+                    self._unsaved.add(key)
+        return key
+
+    def _save(self, key: str, c: Cohort):
+        path = self._path(key)
+        os.makedirs(self.root, exist_ok=True)
+        with _locked(path):
+            current = _stamp(path)
+            if current is not None and current != self._stamps.get(key):
+                # Another process saved this cohort since it was read here: start from its file
+                # and fold in this process's sessions again (add() skips any it already has).
+                merged = Cohort.load(path)
+                merged.label = merged.label or c.label
+                for args in self._pending.get(key, ()):
+                    merged.add(*args)
+                c = merged
+                if key in self._cohorts:
+                    self._cohorts[key] = c
+            c.save(path)
+            self._stamps[key] = _stamp(path)
+        self._pending.pop(key, None)
+        self._unsaved.discard(key)
+
+    def flush(self):
+        with self._lock:
+            for key, c in self._cohorts.items():
+                self._save(key, c)
+
+    def cohort(self, key: str) -> Cohort:
+        with self._lock:
+            return self._get(key)
+
+    def keys(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[len("cohort_"):-len(".npz")] for name in os.listdir(self.root)
+                      if name.startswith("cohort_") and name.endswith(".npz"))
+
+    def report(self, key: str, since: str = None, until: str = None, top: int = 5) -> dict:
+        with self._lock:
+            return self._get(key).report(since, until, top)
+
+
+# ----------------- backfill -----------------
+def _saved_on(session_id: str, path: str) -> str:
+    """Session ids start with the date (see transcript_store.new_session_id); else the file date."""
+    try:
+        return datetime.datetime.strptime(session_id[:8], "%Y%m%d").date().isoformat()
+    except ValueError:
+        return datetime.date.fromtimestamp(os.path.getmtime(path)).isoformat()
+
+
+def rebuild(analytics: CohortAnalytics, transcripts: str, jd_text: str = "", label: str = "") -> int:
+    """
+    Fold every saved transcripts/interview_*.json in. Scorecards saved with a
+    "jd" cohort key keep it; older ones go to the cohort of jd_text.
+    """
+    added = 0
+    for path in sorted(glob.glob(os.path.join(transcripts, "interview_*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                card = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ANALYTICS] skipped {path}: {e}")
+            continue
+        if not (card.get("scorecard") or {}).get("scored", True):
+            continue  # the scoring call failed; see InterviewProcessor._complete
+        key = card.get("jd") or jd_key(jd_text)
+        sid = card.get("session_id", "")
+        before = analytics.cohort(key).interviews
+        analytics.record(jd_text, card.get("scorecard") or {}, sid, label if key == jd_key(jd_text) else "",
+                         (card.get("coverage") or {}).get("missing", ()), _saved_on(sid, path), save=False, key=key)
+        added += analytics.cohort(key).interviews - before
+    analytics.flush()
+    return added
+
+
+def _print_report(r: dict):
+    title = r["label"] or r["cohort"]
+    span = f" ({r['since'] or '...'} to {r['until'] or '...'})" if r["since"] or r["until"] else ""
+    print(f"Cohort {title}{span}: {r['interviews']} interviews, pass rate {r['pass_rate'] * 100:.1f}%")
+    if not r["interviews"]:
+        return
+    print(f"Score mean {r['score_mean']}, " + ", ".join(f"{k} {v}" for k, v in r["score_pct"].items()))
+    peak = max(r["score_buckets"].values()) or 1
+    for bucket, count in r["score_buckets"].items():
+        print(f"  {bucket:>6} {count:>7} {'#' * round(40 * count / peak)}")
+    if r["weakest_questions"]:
+        print("Weakest questions (mean score, share of weak answers):")
+        for q in r["weakest_questions"]:
+            print(f"  {q['mean']:5.1f}  {q['weak_rate'] * 100:4.0f}%  n={q['answers']:<5} {q['question'][:70]}")
+    if r.get("most_missed_skills"):
+        print("Most often uncovered JD skills: "
+              + ", ".join(f"{s['skill']} ({s['interviews']})" for s in r["most_missed_skills"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", default=DEFAULT_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="Cohorts and their sizes")
+    p_rep = sub.add_parser("report", help="Pass rate, score distribution and weakest questions")
+    p_rep.add_argument("--jd", default="", help="Job description file (or use --cohort)")
+    p_rep.add_argument("--cohort", default="", help="Cohort key from `list`")
+    p_rep.add_argument("--since", default=None)
+    p_rep.add_argument("--until", default=None)
+    p_rep.add_argument("--top", type=int, default=5)
+    p_rep.add_argument("--json", action="store_true")
+    p_reb = sub.add_parser("rebuild", help="Backfill from saved scorecards")
+    p_reb.add_argument("--transcripts", default=TRANSCRIPTS_ROOT)
+    p_reb.add_argument("--jd", default="", help="Cohort for scorecards saved without a JD key")
+    args = parser.parse_args()
+
+    analytics = CohortAnalytics(args.dir)
+    if args.cmd == "list":
+        for key in analytics.keys():
+            c = analytics.cohort(key)
+            print(f"{key}  {c.interviews:>7} interviews  {c.label}")
+    elif args.cmd == "report":
+        from file_loaders import load_text
+        key = args.cohort or jd_key(load_text(args.jd, max_chars=8000) if args.jd else "")
+        if key not in analytics.keys():
+            raise SystemExit(f"No cohort {key}; see `python cohort_analytics.py list`.")
+        rep = analytics.report(key, args.since, args.until, args.top)
+        if args.json:
+            print(json.dumps(rep, indent=2))
+        else:
+            _print_report(rep)
+    elif args.cmd == "rebuild":
+        from file_loaders import load_text
+        jd = load_text(args.jd, max_chars=8000) if args.jd else ""
+        n = rebuild(analytics, args.transcripts, jd, os.path.basename(args.jd))
+        print(f"[ANALYTICS] {n} scorecards added")
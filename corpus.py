@@ -0,0 +1,251 @@
+# corpus.py
+"""
+Bulk ingestion of resumes into a preprocessed SQLite corpus.
+
+    python corpus.py --db corpus.sqlite ingest resumes/ --workers 4
+    python corpus.py --db corpus.sqlite show <candidate_id>
+
+A candidate ID is the file's path under the ingested folder, without its
+extension: resumes/2024/Jane Doe.pdf -> 2024-jane-doe. Files that would share
+an ID (jane.txt next to jane.pdf) are not ingested over each other; the first
+keeps it and the rest are reported as conflicts.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import unicodedata
+import zlib
+
+from file_loaders import load_text
+
+DEFAULT_DB = "corpus.sqlite"
+SUPPORTED_EXTS = (".txt", ".pdf", ".docx")
+
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "objective", "about me"),
+    "education": ("education", "academics", "qualifications"),
+    "experience": ("experience", "work experience", "employment", "work history", "internships"),
+    "skills": ("skills", "technical skills", "core competencies", "tools"),
+    "projects": ("projects", "personal projects", "academic projects"),
+    "certifications": ("certifications", "certificates", "courses"),
+    "achievements": ("achievements", "awards", "honors", "accomplishments"),
+    "publications": ("publications", "research"),
+}
+_HEADING_LOOKUP = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    sha256   TEXT PRIMARY KEY,
+    text_z   BLOB NOT NULL,
+    sections TEXT NOT NULL,
+    stats    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    candidate_id TEXT PRIMARY KEY,
+    path         TEXT NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    size         INTEGER NOT NULL,
+    sha256       TEXT NOT NULL REFERENCES contents(sha256)
+);
+CREATE INDEX IF NOT EXISTS documents_path ON documents(path);
+CREATE INDEX IF NOT EXISTS documents_sha ON documents(sha256);
+"""
+
+
+# ----------------- preprocessing -----------------
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "")
+    lines = []
+    for line in text.splitlines():
+        line = "".join(ch for ch in line if ch.isprintable() or ch == "\t")
+        line = re.sub(r"\s+", " ", line).strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def detect_sections(text: str) -> list[dict]:
+    """Return [{"name", "start", "end"}] character spans for recognised headings."""
+    found, pos = [], 0
+    for line in text.splitlines(keepends=True):
+        key = line.strip().rstrip(":").lower()
+        if key in _HEADING_LOOKUP and len(key) <= 40:
+            found.append({"name": _HEADING_LOOKUP[key], "start": pos})
+        pos += len(line)
+    for cur, nxt in zip(found, found[1:] + [None]):
+        cur["end"] = nxt["start"] if nxt else len(text)
+    return found
+
+
+def text_stats(text: str) -> dict:
+    words = text.split()
+    return {
+        "chars": len(text),
+        "words": len(words),
+        "lines": text.count("\n") + 1 if text else 0,
+        "unique_words": len({w.lower() for w in words}),
+    }
+
+
+def candidate_id_for(root: str, path: str) -> str:
+    rel = os.path.splitext(os.path.relpath(path, root))[0]
+    return re.sub(r"[^a-z0-9]+", "-", rel.lower()).strip("-")
+
+
+def preprocess_file(path: str) -> dict:
+    # Runs in a worker process.
+    text = normalize_text(load_text(path))
+    return {
+        "path": path,
+        "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "text": text,
+        "sections": detect_sections(text),
+        "stats": text_stats(text),
+    }
+
+
+# ----------------- store -----------------
+class Corpus:
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _unchanged(self, cid: str, path: str, st) -> bool:
+        row = self.conn.execute(
+            "SELECT path, mtime_ns, size FROM documents WHERE candidate_id = ?", (cid,)
+        ).fetchone()
+        return row == (path, st.st_mtime_ns, st.st_size)
+
+    def _owner(self, cid: str, path: str) -> str:
+        """Another file that still exists and already has this candidate ID, else ""."""
+        row = self.conn.execute("SELECT path FROM documents WHERE candidate_id = ?", (cid,)).fetchone()
+        return row[0] if row and row[0] != path and os.path.exists(row[0]) else ""
+
+    def _write(self, cid: str, st, rec: dict):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO contents (sha256, text_z, sections, stats) VALUES (?, ?, ?, ?)",
+            (rec["sha256"], zlib.compress(rec["text"].encode("utf-8")),
+             json.dumps(rec["sections"]), json.dumps(rec["stats"])),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO documents (candidate_id, path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?, ?)",
+            (cid, rec["path"], st.st_mtime_ns, st.st_size, rec["sha256"]),
+        )
+        self.conn.commit()
+
+    def ingest(self, folder: str, workers: int = None, recursive: bool = True) -> dict:
+        """Preprocess new/changed files under folder. Returns counts of what happened."""
+        todo = {}
+        counts = {"seen": 0, "skipped": 0, "ingested": 0, "duplicates": 0, "conflicts": 0, "failed": 0}
+        claimed = {}  # candidate ID -> path, this run
+        for dirpath, dirnames, filenames in os.walk(folder):
+            if not recursive:
+                dirnames.clear()
+            for name in sorted(filenames):
+                if os.path.splitext(name)[1].lower() not in SUPPORTED_EXTS:
+                    continue
+                path = os.path.abspath(os.path.join(dirpath, name))
+                cid = candidate_id_for(folder, path)
+                st = os.stat(path)
+                counts["seen"] += 1
+                owner = claimed.get(cid) or self._owner(cid, path)
+                if owner:
+                    print(f"[CORPUS] Skipped {path}: candidate ID '{cid}' already belongs to {owner}")
+                    counts["conflicts"] += 1
+                    continue
+                claimed[cid] = path
+                if self._unchanged(cid, path, st):
+                    counts["skipped"] += 1
+                else:
+                    todo[path] = (cid, st)
+
+        if not todo:
+            return counts
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(preprocess_file, p): p for p in todo}
+            for fut in as_completed(futures):
+                cid, st = todo[futures[fut]]
+                try:
+                    rec = fut.result()
+                except Exception as e:
+                    print(f"[CORPUS] Failed {futures[fut]}: {e}")
+                    counts["failed"] += 1
+                    continue
+                if not rec["text"]:
+                    counts["failed"] += 1
+                    continue
+                dup = self.conn.execute(
+                    "SELECT 1 FROM documents WHERE sha256 = ? AND candidate_id != ?", (rec["sha256"], cid)
+                ).fetchone()
+                counts["duplicates" if dup else "ingested"] += 1
+                self._write(cid, st, rec)
+        return counts
+
+    def get(self, candidate_id: str):
+        row = self.conn.execute(
+            "SELECT d.candidate_id, d.path, d.sha256, c.text_z, c.sections, c.stats "
+            "FROM documents d JOIN contents c ON c.sha256 = d.sha256 WHERE d.candidate_id = ?",
+            (candidate_id,),
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            "candidate_id": row[0],
+            "path": row[1],
+            "sha256": row[2],
+            "text": zlib.decompress(row[3]).decode("utf-8"),
+            "sections": json.loads(row[4]),
+            "stats": json.loads(row[5]),
+        }
+
+    def candidate_ids(self) -> list[str]:
+        return [r[0] for r in self.conn.execute("SELECT candidate_id FROM documents ORDER BY candidate_id")]
+
+
+def load_candidate_text(candidate_id: str, db_path: str = DEFAULT_DB) -> str:
+    if not os.path.exists(db_path):
+        return ""
+    with Corpus(db_path) as c:
+        rec = c.get(candidate_id)
+    return rec["text"] if rec else ""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=DEFAULT_DB, help="SQLite corpus path")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_ing = sub.add_parser("ingest", help="Ingest a folder of .txt/.pdf/.docx resumes")
+    p_ing.add_argument("folder")
+    p_ing.add_argument("--workers", type=int, default=None)
+    p_ing.add_argument("--no-recursive", action="store_true")
+    p_show = sub.add_parser("show", help="Print one preprocessed record")
+    p_show.add_argument("candidate_id")
+    sub.add_parser("list", help="List candidate IDs")
+    args = parser.parse_args()
+
+    with Corpus(args.db) as corpus:
+        if args.cmd == "ingest":
+            print(json.dumps(corpus.ingest(args.folder, args.workers, not args.no_recursive)))
+        elif args.cmd == "show":
+            rec = corpus.get(args.candidate_id)
+            if rec is None:
+                raise SystemExit(f"No candidate '{args.candidate_id}' in {args.db}")
+            rec["text"] = rec["text"][:500]
+            print(json.dumps(rec, indent=2, ensure_ascii=False))
+        else:
+            print("\n".join(corpus.candidate_ids()))
@@ -1,30 +1,47 @@
-# gemini_question_generator.py
 import os
-import re  # <-- ADD THIS
-import google.generativeai as genai
-from dotenv import load_dotenv
-load_dotenv()
+import re
+import threading
 
+MODEL_NAME = "models/gemini-2.0-flash"
 
+_model = None
+_model_lock = threading.Lock()
 
 
-api_key = os.environ.get("GOOGLE_API_KEY")
-if not api_key:
-    raise RuntimeError("GOOGLE_API_KEY is not set")
-genai.configure(api_key=api_key)
+def load_env() -> bool:
+    """Load .env (cheap) and report whether GOOGLE_API_KEY is available."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return bool(os.environ.get("GOOGLE_API_KEY"))
 
-model = genai.GenerativeModel("models/gemini-2.0-flash")
 
+def _get_model():
+    # google.generativeai is slow to import; pay for it on the first LLM call, not at import.
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+                if not load_env():
+                    raise RuntimeError("GOOGLE_API_KEY is not set")
+                genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+                _model = genai.GenerativeModel(MODEL_NAME)
+    return _model
 
-def generate_followup_question(answer: str) -> str:
+
+def generate_followup_question(answer: str, focus_skills: list[str] = None) -> str:
+    focus = ""
+    if focus_skills:
+        focus = f"If it fits naturally, probe one of these job skills not yet covered: {', '.join(focus_skills)}.\n\n"
     prompt = (
         "Given the candidate's answer in an interview, suggest the next logical follow-up interview question. "
         "Be concise and job-relevant.\n\n"
+        f"{focus}"
         f"Answer: {answer}\n\n"
         "Follow-up Question:"
     )
     try:
-        resp = model.generate_content(prompt)
+        resp = _get_model().generate_content(prompt)
         return (getattr(resp, "text", "") or "").strip()
     except Exception as e:
         print(f"[Gemini Error] {e}")
@@ -41,7 +58,7 @@ def generate_seed_questions(resume_text: str, jd_text: str, n: int = 3) -> list[
         f"Write {n} questions:"
     )
     try:
-        resp = model.generate_content(prompt)
+        resp = _get_model().generate_content(prompt)
         text = (getattr(resp, "text", "") or "").strip()
         lines = [l.strip("-• \t") for l in text.splitlines() if l.strip()]
         out, seen = [], set()
@@ -71,6 +88,7 @@ def generate_score_and_feedback(
         "verdict": "Pass"|"Reject",
         "reasons": [str, ...],
         "suggestions": [str, ...],
+        "scored": bool,  # False when the reply had no SCORE line (e.g. the call failed)
       }
     """
     # Build compact transcript
@@ -102,12 +120,17 @@ def generate_score_and_feedback(
     )
 
     try:
-        resp = model.generate_content(prompt)
+        resp = _get_model().generate_content(prompt)
         text = (getattr(resp, "text", "") or "").strip()
     except Exception as e:
         print(f"[Gemini Error] {e}")
         text = ""
+    return parse_score_and_feedback(text, pass_threshold)
+
 
+def parse_score_and_feedback(text: str, pass_threshold: int = 60) -> dict:
+    """The SCORE/REASONS/SUGGESTIONS reply of generate_score_and_feedback as a dict."""
+    text = text or ""
     score = 0
     m = re.search(r"SCORE:\s*(\d+)", text, flags=re.I)
     if m:
@@ -133,32 +156,63 @@ def generate_score_and_feedback(
         "verdict": verdict,
         "reasons": reasons[:5],
         "suggestions": suggestions[:5],
+        "scored": m is not None,  # False: the reply had no SCORE line, so score 0 means nothing
     }
 
 
+def score_answer(question: str, answer: str, resume_text: str = "", jd_text: str = "") -> dict:
+    """
+    Score a single Q/A pair as soon as it is answered.
 
+    Returns {"score": 0..100, "strength": str, "gap": str}; score is None if the call failed.
+    """
+    prompt = (
+        "You are a technical interviewer scoring ONE answer against the job description.\n"
+        "Be consistent, job-relevant, and conservative.\n"
+        "Output strictly in this format:\n"
+        "SCORE: <integer 0-100>\n"
+        "STRENGTH: <one short sentence>\n"
+        "GAP: <one short sentence>\n"
+        f"\nJOB DESCRIPTION:\n{(jd_text or '')[:4000]}"
+        f"\n\nRESUME:\n{(resume_text or '')[:2000]}"
+        f"\n\nQUESTION: {question}\nANSWER: {(answer or '')[:4000]}"
+    )
+    try:
+        resp = _get_model().generate_content(prompt)
+        text = (getattr(resp, "text", "") or "").strip()
+    except Exception as e:
+        print(f"[Gemini Error] {e}")
+        return {"score": None, "strength": "", "gap": ""}
+    return parse_answer_score(text)
 
 
+def parse_answer_score(text: str) -> dict:
+    m = re.search(r"SCORE:\s*(\d+)", text or "", flags=re.I)
+    score = max(0, min(100, int(m.group(1)))) if m else None
 
+    def line(name):
+        m2 = re.search(rf"{name}:\s*(.+)", text or "", flags=re.I)
+        return m2.group(1).strip() if m2 else ""
 
+    return {"score": score, "strength": line("STRENGTH"), "gap": line("GAP")}
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+def aggregate_scorecard(per_question: list[dict], pass_threshold: int = 60) -> dict:
+    """
+    Combine per-answer scores into the same shape generate_score_and_feedback returns,
+    plus "per_question". Purely local: no LLM call.
+    """
+    scored = [p for p in per_question if p.get("score") is not None]
+    score = round(sum(p["score"] for p in scored) / len(scored)) if scored else 0
+    best = sorted(scored, key=lambda p: -p["score"])
+    worst = sorted(scored, key=lambda p: p["score"])
+    reasons = list(dict.fromkeys(p["strength"] for p in best if p.get("strength")))[:3]
+    suggestions = list(dict.fromkeys(p["gap"] for p in worst if p.get("gap")))[:3]
+    return {
+        "score": score,
+        "verdict": "Pass" if score >= pass_threshold else "Reject",
+        "reasons": reasons,
+        "suggestions": suggestions,
+        "per_question": per_question,
+    }
 
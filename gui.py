@@ -1,53 +1,137 @@
-import threading
+import time
+_T0 = time.perf_counter()  # before any other import, for time-to-first-prompt
+
+import collections
+import math
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, messagebox
 import sys
-import os
-import time
 
+import startup
+from gemini_question_generator import load_env
 from text_to_speech import TextToSpeech
 from whisper_transcriber import WhisperTranscriber
 from interview_processor import InterviewProcessor
 
 
 class StdoutRedirector:
-    """Redirect prints to the Tkinter text area."""
-    def __init__(self, widget):
+    """
+    Redirect prints to the Tkinter text area.
+
+    write() may be called from any thread (ASR, TTS, scheduler); it only queues
+    the text. The Tk main loop drains the queue in one batch per frame and keeps
+    the widget to max_lines, so heavy logging stays cheap and memory stays flat.
+    """
+    FRAME_MS = 50
+
+    def __init__(self, widget, max_lines=2000, max_pending=10000):
         self.widget = widget
+        self.max_lines = max_lines
+        self._pending = collections.deque(maxlen=max_pending)  # oldest writes drop if the UI stalls
+        self._dropped = 0
+        self.widget.after(self.FRAME_MS, self._drain)
 
     def write(self, s):
         if not s:
             return
-        try:
-            self.widget.configure(state="normal")
-            self.widget.insert(tk.END, s)
-            self.widget.see(tk.END)
-            self.widget.configure(state="disabled")
-        except tk.TclError:
-            pass
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1
+        self._pending.append(s)
 
     def flush(self):
         pass
 
+    def _drain(self):
+        chunks = []
+        try:
+            while True:
+                chunks.append(self._pending.popleft())
+        except IndexError:
+            pass
+        try:
+            if chunks or self._dropped:
+                self._insert("".join(chunks))
+            self.widget.after(self.FRAME_MS, self._drain)
+        except tk.TclError:
+            pass  # widget destroyed
+
+    def _insert(self, text):
+        if self._dropped:
+            text = f"[log] {self._dropped} writes dropped\n" + text
+            self._dropped = 0
+        lines = text.split("\n")
+        if len(lines) > self.max_lines:
+            text = "\n".join(lines[-self.max_lines:])
+        w = self.widget
+        w.configure(state="normal")
+        w.insert(tk.END, text)
+        # Ring-style trim: drop the oldest lines once over the cap.
+        total = int(w.index("end-1c").split(".")[0])
+        if total > self.max_lines:
+            w.delete("1.0", f"{total - self.max_lines + 1}.0")
+        w.see(tk.END)
+        w.configure(state="disabled")
+
+
+class LevelMeter(tk.Canvas):
+    """Microphone level, peak, clipping and SNR, polled from the transcriber's latest block metrics."""
+    POLL_MS = 100
+    FLOOR_DB = -60.0
+
+    def __init__(self, master, source, width=240, height=18):
+        super().__init__(master, width=width, height=height, highlightthickness=0, bg="#222")
+        self.source = source  # () -> latest audio_dsp.AudioHealth metrics, {} before capture starts
+        self.w, self.h = width, height
+        self._bar = self.create_rectangle(0, 0, 0, height, fill="#3a3", width=0)
+        self._peak = self.create_line(0, 0, 0, height, fill="#fff")
+        self._label = self.create_text(width - 4, height // 2, anchor="e", fill="#ddd", text="mic idle")
+        self.after(self.POLL_MS, self._poll)
+
+    def _x(self, db: float) -> float:
+        return self.w * min(1.0, max(0.0, (db - self.FLOOR_DB) / -self.FLOOR_DB))
+
+    def _poll(self):
+        try:
+            m = self.source() or {}
+            if m:
+                clipping = m["clip_ratio"] > 0.001
+                color = "#c33" if clipping else "#cc3" if m["rms_db"] < -45 else "#3a3"
+                self.coords(self._bar, 0, 0, self._x(m["rms_db"]), self.h)
+                self.itemconfigure(self._bar, fill=color)
+                px = self._x(20 * math.log10(max(m["peak"], 1e-6)))
+                self.coords(self._peak, px, 0, px, self.h)
+                text = f"{m['rms_db']:.0f} dB"
+                if m["snr_db"] is not None:
+                    text += f"  SNR {m['snr_db']:.0f}"
+                self.itemconfigure(self._label, text=text + ("  CLIP" if clipping else ""))
+            self.after(self.POLL_MS, self._poll)
+        except tk.TclError:
+            pass  # window closed
+
 
 class AIInterviewAssistant:
     """Interview loop controllable from GUI."""
     def __init__(self, on_finished=None):
         self.tts = TextToSpeech()
         self.processor = InterviewProcessor(self.tts)
-        self.stt = WhisperTranscriber(on_text=self.process_user_input)
+        self.stt = WhisperTranscriber(on_text=self.process_user_input, on_silence=self.processor.note_silence,
+                                      on_error=self._asr_failed)
 
         # Pause mic during AI speech
         self.tts.on_start = getattr(self.stt, "pause", None)
         self.tts.on_end = getattr(self.stt, "resume", None)
+        startup.track_first_prompt(self.tts, _T0)
 
         self.running = False
-        self.thread = None
         self.on_finished = on_finished  # GUI callback when we finish
 
         # also wire processor callback (no-op if GUI not provided)
         self.processor.on_complete = self.stop
 
+    def _asr_failed(self, exc):
+        print(f"[ASR] speech recognition is unavailable ({exc}); ending the session")
+        self.stop()
+
     def process_user_input(self, text):
         print(f"User: {text}")
         result = self.processor.process_input(text)
@@ -55,37 +139,41 @@ class AIInterviewAssistant:
             self.stop()
 
     def start(self, resume_path: str = "", jd_path: str = ""):
+        if self.running:
+            return
+        # The window runs many interviews; start each from clean processor state
+        if self.processor.session_id:
+            self.processor.recycle()
+
         # Load files if provided
         if resume_path:
             self.processor.load_resume(resume_path)
         if jd_path:
             self.processor.load_job_description(jd_path)
 
-        if self.running:
-            return
+        # Both calls return immediately; processor.on_complete drives stop() when it ends.
+        try:
+            self.running = True
+            self.processor.start_interview()
+            self.stt.start()
+        except Exception as e:
+            print(f"[GUI] Error: {e}")
+            self.stop()
 
-        def _run():
-            try:
-                self.running = True
-                self.processor.start_interview()
-                self.stt.start()
-
-                # keep thread alive while running
-                while self.running:
-                    # Auto-stop when interview ends
-                    if not self.processor.active:
-                        self.stop()
-                        break
-                    time.sleep(0.1)
-            except Exception as e:
-                print(f"[GUI] Error: {e}")
-                self.stop()
-
-        self.thread = threading.Thread(target=_run, daemon=True)
-        self.thread.start()
-
-    def stop(self):
-        """Idempotent clean shutdown + finalize transcript once."""
+    CLOSE_WAIT_SECONDS = 5.0  # on window close, how long the transcript may take to save
+
+    def wait_closed(self, timeout: float) -> bool:
+        """Wait up to `timeout` s for the posted close (transcript save) to finish; True if it has."""
+        if not self.processor.session_id:
+            return True  # no interview was ever started
+        return self.processor.done.wait(timeout)
+
+    def stop(self, wait: float = 0.0):
+        """
+        Idempotent clean shutdown + finalize transcript once. The close is posted to the
+        processor's scheduler, which may be busy with a turn for a while; the Tk thread
+        waits at most `wait` seconds for it.
+        """
         if not self.running:
             # still invoke GUI callback so window can react (if needed)
             if callable(self.on_finished):
@@ -103,9 +191,7 @@ class AIInterviewAssistant:
             pass
 
         try:
-            self.processor._cancel_timer()
-            self.processor._finalize_answer_if_any()
-            self.processor._save_transcript()
+            self.processor.close(timeout=wait)
         except Exception:
             pass
 
@@ -149,6 +235,8 @@ class App(tk.Tk):
         self.start_btn.pack(side=tk.LEFT)
         self.stop_btn = tk.Button(btns, text="Stop", command=self.stop_interview)
         self.stop_btn.pack(side=tk.LEFT, padx=8)
+        self.meter = LevelMeter(btns, self._mic_metrics)
+        self.meter.pack(side=tk.RIGHT)
 
         # Log output
         self.log = scrolledtext.ScrolledText(self, height=22, state="disabled")
@@ -163,7 +251,7 @@ class App(tk.Tk):
         )
 
         # Gemini key check helper
-        if not os.environ.get("GOOGLE_API_KEY"):
+        if not load_env():
             messagebox.showinfo(
                 "Missing GOOGLE_API_KEY",
                 "GOOGLE_API_KEY is not set. Set it in your environment before starting."
@@ -203,6 +291,11 @@ class App(tk.Tk):
         # Auto-close window
         self.on_close()'''
 
+    def _mic_metrics(self) -> dict:
+        assistant = getattr(self, "assistant", None)
+        health = assistant.stt.health if assistant is not None else None
+        return health.last if health is not None else {}
+
     def pick_resume(self):
         path = filedialog.askopenfilename(
             title="Select Resume",
@@ -229,16 +322,34 @@ class App(tk.Tk):
         self.assistant.stop()
 
     def on_close(self):
-        # Try to stop gracefully; then destroy window
+        # Post the stop if still running. Either way give the transcript a moment to save: after
+        # the Stop button the close may still be queued behind a busy turn, and the scheduler
+        # thread dies with the window.
         try:
             self.assistant.stop()
+            if not self.assistant.wait_closed(self.assistant.CLOSE_WAIT_SECONDS):
+                print("[GUI] transcript still saving; closing anyway")
         except Exception:
             pass
+        sys.stdout = sys.__stdout__  # late prints from worker threads go to the console
         self.destroy()
 
 
 if __name__ == "__main__":
-    App().mainloop()
+    if "--import-profile" in sys.argv:
+        startup.print_import_profile(startup.import_profile_fresh())
+        raise SystemExit(0)
+    profiler = None
+    if "--profile" in sys.argv:  # --profile [DIR], see profiler.py
+        from profiler import SamplingProfiler
+        i = sys.argv.index("--profile") + 1
+        out_dir = sys.argv[i] if i < len(sys.argv) and not sys.argv[i].startswith("-") else "profiles"
+        profiler = SamplingProfiler(out_dir).start()
+    try:
+        App().mainloop()
+    finally:
+        if profiler is not None:
+            profiler.stop()
 
 
 
@@ -1,187 +1,654 @@
-import datetime
 import os
 import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 
+from corpus import DEFAULT_DB, load_candidate_text
 from file_loaders import load_text
-from gemini_question_generator import (
-    generate_seed_questions,
-    generate_followup_question,
-    generate_score_and_feedback,
-)
+from question_planner import QuestionPlanner
+from scheduler import Scheduler
+from skill_index import SkillCoverage, SkillIndex
+from tracing import NULL_TRACER
+import turn_detector
+from transcript_store import TranscriptStore, jd_key, new_session_id
+import gemini_question_generator
+from gemini_question_generator import aggregate_scorecard
 
 class InterviewProcessor:
-    SILENCE_SECONDS = 10.0
-
-    def __init__(self, tts):
+    SILENCE_SECONDS = 10.0  # fixed end-of-answer timeout; the adaptive detector's upper bound
+    DOC_CHAR_BUDGET = 8000  # prompts never read past this many characters
+    HEDGE_SECONDS = 2.5  # "race" mode: how long the LLM gets before the banked question wins
+    SEED_WAIT_SECONDS = 15.0  # longest the second question waits for background seed generation
+    RESUME_SECONDS = 3.0  # a fragment this soon after a silence cut means the answer was not over
+    MAX_ANSWER_WORDS = 1500  # a longer answer is finalized as it stands (~10 minutes of speech)
+    OPENER = "Tell me about yourself."
+    GREETING = ("Hi I am your AI Assistant. I’ll interview you. Say 'skip' to move on, 'repeat' to hear a question "
+                "again, or 'that's it' after completing your answer.")
+    CLOSING = "That’s all I had. Thanks for your time. Would you like quick feedback?"
+    QUESTION_SOURCES = ("llm", "bank", "race")
+    END_OF_TURN_MODES = ("adaptive", "fixed")
+
+    def __init__(self, tts, question_bank=None, question_source: str = "llm", scheduler=None,
+                 transcript_store=None, llm=None, executor=None, tracer=None, end_of_turn: str = "adaptive",
+                 audio_archive=None, refiner=None, analytics=None):
+        if question_source not in self.QUESTION_SOURCES:
+            raise ValueError(f"question_source must be one of {self.QUESTION_SOURCES}")
+        if end_of_turn not in self.END_OF_TURN_MODES:
+            raise ValueError(f"end_of_turn must be one of {self.END_OF_TURN_MODES}")
         self.tts = tts
+        self.question_bank = question_bank  # optional question_bank.QuestionBank
+        self.question_source = question_source if question_bank is not None else "llm"
+        # Question/score generation; anything with gemini_question_generator's functions (simulate.py fakes it).
+        self.llm = llm or gemini_question_generator
+        # Background LLM work: per-answer scoring and hedged follow-ups.
+        self._pool = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="interview-llm")
+        self._owns_pool = executor is None  # a shared executor (server.py) outlives the session
+        self.tracer = tracer or NULL_TRACER  # share with the transcriber and TTS for per-turn spans
+        self._last_input_t = None
+        # Optional audio_archive.AudioArchive (shared with the transcriber) and a second-pass decoder
+        # (e.g. a larger WhisperDecoder) that re-transcribes each archived answer before it is scored.
+        self.archive = audio_archive
+        self.refiner = refiner if audio_archive is not None else None
+        self.analytics = analytics  # cohort_analytics.CohortAnalytics, updated with every saved scorecard
+        # "adaptive": end phrases, reported trailing silence and a learned timer; "fixed": SILENCE_SECONDS only
+        self.end_of_turn = end_of_turn
+        self.turn_detector = turn_detector.for_speaker("", max_timeout=self.SILENCE_SECONDS)
+        self._last_fragment_at = None  # scheduler-clock time of the last answer fragment
+        self._silence_heard = 0.0  # trailing silence last reported by the audio path
+        self._cut_silence = 0.0  # the silence that is ending the current answer, if silence is ending it
+        self._cut_at = None  # scheduler-clock time the last answer was ended on silence
+        self._cut_pause = 0.0
+        self._score_futures = []  # one per recorded answer, scored while the interview continues
+        self._seed_future = None  # seed questions, generated in the background from the interview's start
+        self._seed_key = None
+        self._seeds_applied = False
+        self._followup_future = None  # next follow-up, generated one turn ahead
+        self._t_start = 0.0
         self.active = True
         self.resume_text = ""
         self.jd_text = ""
-        self.q = ["Tell me about yourself."]
+        self.jd_label = ""  # JD file name, shown in cohort reports
+        self.q = [self.OPENER]
         self.i = -1
         self.last_question = ""
         self.transcript = []
         self._answer_buf = []
+        self._answer_word_count = 0
         self._silence_timer = None
+        self._timer_gen = 0  # bumps on every (re)schedule so stale timer callbacks are ignored
+        self._finalize_pending = False
+        self._completed = False
         self._lock = threading.Lock()
+        # All state transitions run on this one thread; input threads only post to it.
+        self._sched = scheduler or Scheduler()
+        self._owns_scheduler = scheduler is None
+        self.done = threading.Event()  # set once the session is completed or closed
         self.max_questions = 3
+        self._default_max_questions = self.max_questions  # restored by recycle(); bundles and hellos change it
+        self.planner = QuestionPlanner(self.max_questions)
         self.on_complete = None  # optional callback (GUI/CLI can set)
         self.last_result = None  # holds scorecard
+        self.store = transcript_store or TranscriptStore()
+        self.session_id = ""
+        self._journal_open = False  # session_id's journal still takes appends; guarded by _lock
+        self.candidate = ""  # catalog key: corpus candidate ID or resume file name
+        self.last_paths = {}  # journal/txt/json paths of the last saved session
+        self.coverage = SkillCoverage(SkillIndex.build())  # rebuilt from JD/resume per session
 
     # ----------------- file loaders -----------------
-    def load_resume(self, path: str):
-        self.resume_text = (load_text(path) or "").strip()
+    def load_resume(self, path: str = "", candidate_id: str = "", corpus_path: str = DEFAULT_DB):
+        # A preprocessed corpus record (see corpus.py) avoids re-parsing the raw file.
+        if candidate_id:
+            text = load_candidate_text(candidate_id, corpus_path)
+            self.candidate = candidate_id
+        else:
+            text = load_text(path, max_chars=self.DOC_CHAR_BUDGET)
+            self.candidate = os.path.splitext(os.path.basename(path))[0] if path else ""
+        self.resume_text = (text or "").strip()[:self.DOC_CHAR_BUDGET]
 
     def load_job_description(self, path: str):
-        self.jd_text = (load_text(path) or "").strip()
+        self.jd_text = (load_text(path, max_chars=self.DOC_CHAR_BUDGET) or "").strip()
+        self.jd_label = os.path.basename(path) if path else ""
+
+    def load_bundle(self, bundle):
+        """
+        Use a session bundle made ahead of time by prep.py (a path, or an already-loaded
+        prep.Bundle): documents, seed questions and pre-rendered audio, with no parsing or LLM call.
+        """
+        import prep
+        b = bundle if isinstance(bundle, prep.Bundle) else prep.load_bundle(bundle)
+        self.resume_text = b.resume_text[:self.DOC_CHAR_BUDGET]
+        self.jd_text = b.jd_text[:self.DOC_CHAR_BUDGET]
+        self.jd_label = b.jd_label
+        self.candidate = b.candidate
+        if b.max_questions:
+            self.max_questions = b.max_questions
+        if b.seeds:
+            fut = Future()
+            fut.set_result(list(b.seeds))
+            self._seed_key = (self.resume_text, self.jd_text)
+            self._seed_future = fut
+            self._seeds_applied = False
+        else:
+            self._prefetch_seeds()  # prepared while the LLM was failing: generate them now, as a live session would
+        if b.audio and hasattr(self.tts, "preload"):
+            self.tts.preload(b.audio)
+        return b
+
+    # ----------------- seed questions -----------------
+    def _prefetch_seeds(self):
+        """Generate seed questions in the background; they only need to exist by question two."""
+        if not (self.jd_text or self.resume_text):
+            return
+        key = (self.resume_text, self.jd_text)
+        if key == self._seed_key:
+            return
+        if self._seed_future is not None:
+            self._seed_future.cancel()  # for other documents; _apply_seeds ignores it if already running
+        self._seed_key = key
+        self._seeds_applied = False
+        fut = self._pool.submit(self.tracer.wrap("llm.seed", self._seed_questions), min(2, self.max_questions))
+        self._seed_future = fut
+        fut.add_done_callback(lambda f, key=key: self._sched.call_soon(self._apply_seeds, key))
+
+    def _apply_seeds(self, key):
+        fut = self._seed_future
+        if self._seeds_applied or key != self._seed_key or fut is None or not fut.done():
+            return
+        self._seeds_applied = True
+        try:
+            seeds = [s for s in fut.result() if s]
+        except Exception as e:
+            print(f"[Seed Error] {e}")
+            return
+        with self._lock:
+            # Seeds go right after the current question, ahead of any follow-ups.
+            pos = max(self.i + 1, 1)
+            self.q[pos:pos] = [s for s in seeds if s not in self.q]
+            del self.q[self.max_questions:]
+
+    def _await_seeds(self):
+        fut = self._seed_future
+        if fut is None or self._seeds_applied:
+            return
+        if not fut.done():
+            try:
+                with self.tracer.span("llm.seed_wait"):
+                    fut.result(timeout=self.SEED_WAIT_SECONDS)
+            except Exception:
+                pass
+        self._apply_seeds(self._seed_key)
+        self._seeds_applied = True  # a late result is dropped rather than reshuffling questions
+
+    def _log_first_word(self):
+        print(f"[LATENCY] time-to-first-word: {(time.perf_counter() - self._t_start) * 1000:.0f} ms")
 
     # ----------------- lifecycle -----------------
-    def start_interview(self):
+    def start_interview(self, bundle=None):
+        """
+        Reset session state and start asking on the scheduler thread; returns immediately.
+        bundle: a prep.py session bundle (path or Bundle) to start from instead of live prep.
+        """
+        if bundle:
+            self.load_bundle(bundle)
         self.active = True
+        self._completed = False
+        self.done.clear()
+        self.session_id = new_session_id()
+        self._t_start = time.perf_counter()
+        self.tracer.begin_session(self.session_id)
+        if self.archive is not None:
+            try:
+                self.archive.begin(self.session_id)
+            except Exception as e:
+                print(f"[ARCHIVE ERROR] {e}")
+        self._sched.call_soon(self._start)
+
+    def recycle(self, timeout: float = None):
+        """
+        Forget the last interview so the next one in this process starts clean:
+        documents, seeds, questions, transcript, background futures and pre-rendered
+        audio. Configuration (sources, store, tracer, callbacks) is kept. Safe from
+        any thread: the reset runs on the scheduler, like close().
+        """
+        if self._sched.in_thread():
+            self._recycle()
+            return
+        done = threading.Event()
+
+        def run():
+            try:
+                self._recycle()
+            finally:
+                done.set()
+        self._sched.call_soon(run)
+        done.wait(timeout)
+
+    def _recycle(self):
+        self._close()  # no-op once completed
+        if self._followup_future is not None:
+            self._followup_future.cancel()
+        with self._lock:
+            self._cancel_timer()
+            self._clear_answer()
+            self.transcript = []
+            self.q = [self.OPENER]
+            self.i = -1
+            self.last_question = ""
+        self._score_futures = []
+        self._seed_future = self._seed_key = self._followup_future = None
+        self._seeds_applied = False
+        self._last_input_t = self._last_fragment_at = self._cut_at = None
+        self._silence_heard = self._cut_silence = 0.0
+        self.resume_text = self.jd_text = self.jd_label = self.candidate = ""
+        self.last_result = None
+        self.last_paths = {}
+        self._finalize_pending = False
+        self.max_questions = self._default_max_questions
+        self.planner = QuestionPlanner(self.max_questions)
+        self.coverage = SkillCoverage(SkillIndex.build())
+        self.turn_detector = turn_detector.for_speaker("", max_timeout=self.SILENCE_SECONDS)
+        prerendered = getattr(self.tts, "prerendered", None)
+        if prerendered:
+            prerendered.clear()
+
+    def _start(self):
+        # Speak first; seeds arrive in the background and are only needed for question two.
+        self.tts.speak(self.GREETING, on_start=self._log_first_word)
         self.i = -1
         self.transcript.clear()
-        self._answer_buf.clear()
-        self._cancel_timer()
-
-        # Seed tailored questions after opener
-        if self.jd_text or self.resume_text:
-            seeds = generate_seed_questions(
-                self.resume_text, self.jd_text, n=min(2, self.max_questions)
-            )
-            self.q = ["Tell me about yourself."] + [s for s in seeds if s]
-            self.q = self.q[:self.max_questions]
-
-        self.tts.speak(
-            "Hi I am your AI Assistant. I’ll interview you. Say 'skip' to move on, 'repeat' to hear a question again, or 'that's it' after completing your answer."
-        )
+        self._score_futures = []
+        self._followup_future = None
+        self.planner = QuestionPlanner(self.max_questions)
+        try:
+            self.store.open_session(self.session_id, self.candidate)
+        except Exception as e:
+            print(f"[TRANSCRIPT ERROR] {e}")
+        with self._lock:
+            self._journal_open = True
+            self._clear_answer()
+            self._cancel_timer()
+        self.q = [self.OPENER]
+        self._seeds_applied = False
+        # Once both documents are in: starting from each loader paid for a resume-only call nobody used.
+        self._prefetch_seeds()  # no-op when a bundle without seeds already started it
+        self._apply_seeds(self._seed_key)
+        # Built before the first question: its answer is acknowledged and timed with them.
+        self.coverage = SkillCoverage(SkillIndex.build(self.jd_text, self.resume_text))
+        self.turn_detector = turn_detector.for_speaker(self.candidate, max_timeout=self.SILENCE_SECONDS)
         self._ask_next()
 
     def _ask_next(self):
+        if self.i >= 0:
+            self._await_seeds()
+            self._take_followup()
         with self._lock:
-            self._answer_buf.clear()
+            self._clear_answer()
             self._cancel_timer()
+            self._last_input_t = None
+            self._last_fragment_at = None
+            self._silence_heard = self._cut_silence = 0.0
             self.i += 1
-            if self.i >= self.max_questions or self.i >= len(self.q):
-                self.tts.speak("That’s all I had. Thanks for your time. Would you like quick feedback?")
-                self._complete()
-                return "done"
-            self.last_question = self.q[self.i]
+            finished = self.i >= self.max_questions or self.i >= len(self.q)
+            if not finished:
+                self.last_question = self.q[self.i]
+                self.tracer.set_turn(self.i)
+                if self.archive is not None:
+                    self.archive.mark("question", turn=self.i)
+        if finished:
+            self.tts.speak(self.CLOSING)
+            self._complete()
+            return "done"
 
         self.tts.speak(self.last_question)
         if self.active:
             self._schedule_finalize()
         return "ask"
 
+    # ----------------- question sources -----------------
+    def _seed_questions(self, n: int) -> list:
+        if self.question_source == "bank":
+            hits = self.question_bank.search(self.jd_text + "\n" + self.resume_text, k=n, exclude=self.q)
+            if hits:
+                return [e["question"] for _, e in hits]
+        seeds = self.llm.generate_seed_questions(self.resume_text, self.jd_text, n=n)
+        if not seeds and self.question_source == "race":
+            hits = self.question_bank.search(self.jd_text + "\n" + self.resume_text, k=n, exclude=self.q)
+            seeds = [e["question"] for _, e in hits]
+        return seeds
+
+    def _next_question(self, answer: str, focus: list, asked: list) -> str:
+        """Follow-up from the LLM, the local bank, or whichever is ready first within HEDGE_SECONDS."""
+        if self.question_source == "llm":
+            return self.llm.generate_followup_question(answer, focus_skills=focus)
+
+        banked = self.question_bank.best_question(" ".join([answer] + focus), exclude=asked)
+        if self.question_source == "bank":
+            return banked or self.llm.generate_followup_question(answer, focus_skills=focus)
+
+        fut = self._pool.submit(self.llm.generate_followup_question, answer, focus)
+        try:
+            return fut.result(timeout=self.HEDGE_SECONDS) or banked
+        except FutureTimeout:
+            if banked:
+                print("[QUESTION BANK] LLM slower than hedge; using banked question")
+                return banked
+        except Exception as e:
+            print(f"[Follow-up Error] {e}")
+            return banked
+        try:
+            return fut.result()
+        except Exception as e:
+            print(f"[Follow-up Error] {e}")
+            return ""  # as generate_followup_question returns on failure
+
+    def _plan_followups(self, answer: str):
+        """Generate follow-ups only for slots that will be asked: now if the next one is empty, else one turn ahead."""
+        self.planner.answers += 1
+        # Seeds still on their way fill the next slots, and _ask_next waits for them anyway;
+        # deciding without them would ask for a follow-up that ends up queued behind them.
+        self._await_seeds()
+        with self._lock:
+            nxt = self.i + 1
+            need_now = self.planner.need_now(len(self.q), nxt)
+            asked = list(self.q)
+        # Snapshot on the scheduler thread; a prefetch must not read coverage while it is updated.
+        focus = self.coverage.missing()[:5]
+        if need_now and not self._take_followup():
+            self.planner.requested += 1
+            with self.tracer.span("llm.followup"):
+                new_q = self._next_question(answer, focus, asked)
+            self._add_question(new_q)
+        with self._lock:
+            ahead = self._followup_future is None and self.planner.worth_prefetch(len(self.q), nxt)
+            asked = list(self.q)
+        if ahead:
+            self.planner.prefetched += 1
+            self._followup_future = self._pool.submit(
+                self.tracer.wrap("llm.followup_prefetch", self._next_question), answer, focus, asked
+            )
+
+    def _take_followup(self) -> bool:
+        """Use the prefetched follow-up for the next slot if it is empty. True if one was added."""
+        fut = self._followup_future
+        with self._lock:
+            if fut is None or not self.planner.need_now(len(self.q), self.i + 1):
+                return False
+        self._followup_future = None
+        try:
+            with self.tracer.span("llm.followup_wait"):
+                new_q = fut.result()
+        except Exception as e:
+            print(f"[Follow-up Error] {e}")
+            return False
+        self.planner.prefetch_used += 1
+        return self._add_question(new_q)
+
+    def _add_question(self, new_q: str) -> bool:
+        with self._lock:
+            if new_q and new_q not in self.q and len(self.q) < self.max_questions:
+                self.q.append(new_q)
+                return True
+        return False
+
     # ----------------- helpers -----------------
-    def _ack(self, low_text: str) -> str:
-        TECH = {"xgboost", "rag", "langchain", "aws", "terraform", "timeseries", "arima", "llm"}
-        PEOPLE = {"team", "stakeholder", "client", "collaborat"}
-        if any(k in low_text for k in TECH): return "Got it. Thanks. "
-        if any(k in low_text for k in PEOPLE): return "Understood. "
+    def _ack(self, hits: set) -> str:
+        kinds = {self.coverage.index.categories.get(t) for t in hits}
+        if kinds & {"tech", "jd"}: return "Got it. Thanks. "
+        if "people" in kinds: return "Understood. "
         return "Thanks. "
 
+    def _record_answer(self, q: str, answer: str):
+        with self._lock:
+            idx = len(self.transcript)
+            self.transcript.append((q, answer))
+        try:
+            self.store.append_answer(self.session_id, q, answer)
+        except Exception as e:
+            print(f"[TRANSCRIPT ERROR] {e}")
+        audio = None
+        if self.archive is not None:
+            audio = self.archive.take_turn()
+            self.archive.mark("answer", index=idx, turn=self.i)
+        if self.refiner is not None and audio is not None:
+            fut = self._pool.submit(self.tracer.wrap("asr.refine", self._refine_and_score),
+                                    self.session_id, idx, q, answer, audio)
+        else:
+            fut = self._pool.submit(self.tracer.wrap("llm.score", self.llm.score_answer),
+                                    q, answer, self.resume_text, self.jd_text)
+        self._score_futures.append(fut)
+
+    def _refine_and_score(self, session_id: str, idx: int, q: str, answer: str, audio) -> dict:
+        """Second-pass transcript of one answer; it replaces the live text before the answer is scored."""
+        try:
+            refined = (self.refiner.transcribe(audio) or "").strip()
+        except Exception as e:
+            print(f"[Refine Error] {e}")
+            refined = ""
+        if refined and refined != answer:
+            with self._lock:
+                # After the session is closed its outputs are written; a late refine would contradict them.
+                if session_id == self.session_id and self._journal_open:
+                    if idx < len(self.transcript):
+                        self.transcript[idx] = (q, refined)
+                    try:
+                        self.store.append_refined(session_id, idx, refined, getattr(self.refiner, "model_size", ""))
+                    except Exception as e:
+                        print(f"[TRANSCRIPT ERROR] {e}")
+            answer = refined
+        return self.llm.score_answer(q, answer, self.resume_text, self.jd_text)
+
     def _save_transcript(self):
-        if not self.transcript:
+        """Close the session in the catalog and derive .txt/.json from its journal, answers or not."""
+        if not self.session_id:
             return
-        os.makedirs("transcripts", exist_ok=True)
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        txt = os.path.join("transcripts", f"interview_{ts}.txt")
+        with self._lock:
+            self._journal_open = False
         try:
-            with open(txt, "w", encoding="utf-8") as f:
-                for qi, (q, a) in enumerate(self.transcript, 1):
-                    f.write(f"Q{qi}: {q}\n")
-                    f.write(f"A{qi}: {a}\n\n")
-            print(f"[TRANSCRIPT] Saved to {os.path.abspath(txt)}")
+            self.last_paths = self.store.close_session(self.session_id)
+            if self.transcript:  # no .txt is derived from an empty journal
+                print(f"[TRANSCRIPT] Saved to {os.path.abspath(self.last_paths['txt'])}")
         except Exception as e:
             print(f"[TRANSCRIPT ERROR] {e}")
 
+    def _aggregate_scores(self) -> dict:
+        per_question = []
+        for (q, a), fut in zip(self.transcript, self._score_futures):
+            try:
+                with self.tracer.span("llm.score_wait"):
+                    scored = fut.result()
+            except Exception as e:
+                print(f"[Scoring Error] {e}")
+                scored = {"score": None, "strength": "", "gap": ""}
+            per_question.append({"q": q, **scored})
+        if any(p["score"] is not None for p in per_question):
+            return aggregate_scorecard(per_question, pass_threshold=60)
+        # Every per-answer call failed: fall back to one whole-transcript call.
+        result = self.llm.generate_score_and_feedback(self.resume_text, self.jd_text, self.transcript, pass_threshold=60)
+        result["per_question"] = per_question
+        return result
+
     def _cancel_timer(self):
+        self._timer_gen += 1
         if self._silence_timer is not None:
-            try:
-                self._silence_timer.cancel()
-            except Exception:
-                pass
+            self._silence_timer.cancel()
             self._silence_timer = None
 
+    def _answer_words(self) -> int:
+        return self._answer_word_count
+
+    def _clear_answer(self):
+        self._answer_buf.clear()
+        self._answer_word_count = 0
+
     def _schedule_finalize(self):
         if not self.active:
             return
-        self._cancel_timer()
-        t = threading.Timer(self.SILENCE_SECONDS, self._finalize_answer_if_any)
-        t.daemon = True
-        t.start()
-        self._silence_timer = t
+        with self._lock:
+            self._cancel_timer()
+            delay = self.SILENCE_SECONDS
+            if self.end_of_turn == "adaptive":
+                delay = self.turn_detector.timeout(self._answer_words())
+            self._silence_timer = self._sched.call_later(delay, self._on_silence, self._timer_gen)
+
+    def note_silence(self, seconds: float):
+        """Trailing silence the audio path has heard so far (0 when speech resumes). Safe from any thread."""
+        if not self.active or self.end_of_turn != "adaptive":
+            return
+        with self._lock:
+            if not self._answer_buf:
+                return
+            if seconds <= 0:
+                # The candidate kept talking: that silence was a pause, not the end.
+                self.turn_detector.observe_pause(self._silence_heard)
+                self._silence_heard = 0.0
+                return
+            self._silence_heard = seconds
+            done = seconds >= self.turn_detector.silence_threshold(self._answer_words())
+            if done:
+                self._cut_silence = seconds
+        if done:
+            self._request_finalize()
+
+    def _on_silence(self, gen: int):
+        if gen == self._timer_gen:
+            self._finalize_answer_if_any()
+
+    def _request_finalize(self):
+        """Coalesce finalize requests (silence timer, end keyword) into one run on the scheduler."""
+        with self._lock:
+            self._cancel_timer()
+            if self._finalize_pending:
+                return
+            self._finalize_pending = True
+        self._sched.call_soon(self._finalize_answer_if_any)
+
+    def close(self, timeout: float = None):
+        """Record any half-given answer and persist once. Safe from any thread, repeatedly."""
+        if self._sched.in_thread():
+            self._close()
+        else:
+            self._sched.call_soon(self._close)
+            self.done.wait(timeout)
+
+    def shutdown(self, timeout: float = None):
+        self.close(timeout)
+        if self._owns_pool:
+            self._pool.shutdown(wait=False)
+        if self._owns_scheduler:
+            self._sched.stop(timeout)
+
+    def _close(self):
+        if self._completed:
+            return
+        self._completed = True
+        self.active = False
+        with self._lock:
+            self._cancel_timer()
+            answer = " ".join(self._answer_buf).strip()
+            self._clear_answer()
+        if answer and self.last_question:
+            self._record_answer(self.last_question, answer)
+        # Nothing is scored after an abort; work that has not started is not worth starting.
+        for fut in self._score_futures:
+            fut.cancel()
+        self._save_transcript()
+        if self.archive is not None:
+            self.archive.end()
+        self._finish_trace()
+        self.done.set()
+
+    def _finish_trace(self):
+        try:
+            self.tracer.finish()
+        except Exception as e:
+            print(f"[TRACE ERROR] {e}")
 
     def _complete(self):
+        if self._completed:
+            return
+        self._completed = True
         # mark finished, stop timers
         self.active = False
-        self._cancel_timer()
+        with self._lock:
+            self._cancel_timer()
 
-        # Save base transcript first
+        # Refines of the last answers append to the journal: let them land before it is closed.
+        t0 = time.perf_counter()
+        with self.tracer.span("llm.score_wait"):
+            for fut in self._score_futures:
+                try:
+                    fut.result()
+                except Exception:
+                    pass  # reported by _aggregate_scores
         self._save_transcript()
-
-        # Score & feedback
+        if self.archive is not None:
+            self.archive.end()
+
+        if self._followup_future is not None:
+            self._followup_future.cancel()
+            self._followup_future = None
+            self.planner.prefetch_wasted += 1
+        planned = self.planner.summary()
+        print(f"[PLANNER] follow-ups: {planned['requested']} on demand, {planned['prefetched']} prefetched, "
+              f"{planned['avoided']} avoided")
+
+        # Score & feedback: answers were scored in the background, so this is mostly aggregation
         try:
-            result = generate_score_and_feedback(
-                self.resume_text, self.jd_text, self.transcript, pass_threshold=60
-            )
+            result = self._aggregate_scores()
+            result["latency_ms"] = {"end_of_interview": round((time.perf_counter() - t0) * 1000, 1)}
+            result["followups"] = planned
+            print(f"[LATENCY] verdict ready {result['latency_ms']['end_of_interview']:.0f} ms after the last answer")
             self.last_result = result
             score = result.get("score", 0)
             verdict = result.get("verdict", "Reject")
-            reasons = result.get("reasons", [])
-            suggestions = result.get("suggestions", [])
 
             # Speak short summary
             self.tts.speak(f"Overall score {score} out of 100. Verdict: {verdict}.", block=True)
 
-            # Append summary and write JSON sidecar
+            # Journal the result; .txt summary and JSON sidecar are derived from it
+            coverage = self.coverage.summary()
             try:
-                os.makedirs("transcripts", exist_ok=True)
-                txts = [os.path.join("transcripts", f) for f in os.listdir("transcripts") if f.endswith(".txt")]
-                latest_txt = max(txts, key=os.path.getmtime) if txts else None
-
-                if latest_txt:
-                    with open(latest_txt, "a", encoding="utf-8") as f:
-                        f.write(f"---\nSCORE: {score}/100\nVERDICT: {verdict}\n")
-                        if reasons:
-                            f.write("REASONS:\n")
-                            for r in reasons[:3]:
-                                f.write(f"- {r}\n")
-                        if suggestions:
-                            f.write("SUGGESTIONS:\n")
-                            for s in suggestions[:3]:
-                                f.write(f"- {s}\n")
-
-                    import json, pathlib
-                    json_path = pathlib.Path(latest_txt).with_suffix(".json")
-                    payload = {
-                        "questions": [{"q": q, "a": a} for (q, a) in self.transcript],
-                        "scorecard": result,
-                    }
-                    with open(json_path, "w", encoding="utf-8") as jf:
-                        json.dump(payload, jf, ensure_ascii=False, indent=2)
-                    print(f"[SCORECARD] {score}/100 ({verdict}) -> {json_path}")
+                self.store.append_result(self.session_id, result, {"coverage": coverage, "jd": jd_key(self.jd_text)})
+                self.last_paths = self.store.write_outputs(self.session_id)
+                print(f"[SCORECARD] {score}/100 ({verdict}) -> {self.last_paths['json']}")
             except Exception as e:
                 print(f"[Score Persist Error] {e}")
+            # No answers, or an LLM outage (nothing scored and no SCORE line), is not a real 0/Reject
+            if self.analytics is not None and self.transcript and result.get("scored", True):
+                try:
+                    self.analytics.record(self.jd_text, result, self.session_id, self.jd_label, coverage["missing"])
+                except Exception as e:
+                    print(f"[ANALYTICS ERROR] {e}")
 
         except Exception as e:
             print(f"[Scoring Error] {e}")
 
+        self._finish_trace()
+
         # Notify GUI/CLI
-        if self.on_complete:
-            try:
+        try:
+            if self.on_complete:
                 self.on_complete()
-            except Exception:
-                pass
+        except Exception:
+            pass
+        finally:
+            self.done.set()
 
     # ----------------- finalize -----------------
     def _finalize_answer_if_any(self):
+        with self._lock:
+            self._finalize_pending = False
         if not self.active:
             return
 
         with self._lock:
             answer = " ".join(self._answer_buf).strip()
-            self._answer_buf.clear()
+            self._clear_answer()
+            if answer:
+                # Ended on silence: a fragment right after this means the candidate was only pausing
+                self._cut_at = self._sched.now() if self._cut_silence else None
+                self._cut_pause, self._cut_silence = self._cut_silence, 0.0
 
         if not answer:
             if not self.active:
@@ -189,6 +656,10 @@ class InterviewProcessor:
             self.tts.speak("If you’re ready, please answer now or say skip.")
             return
 
+        t_fin = self.tracer.now()
+        if self._last_input_t is not None:
+            self.tracer.add("finalize_wait", self._last_input_t, t_fin)
+            self._last_input_t = None
         with self._lock:
             q = self.q[self.i] if 0 <= self.i < len(self.q) else ""
 
@@ -199,54 +670,88 @@ class InterviewProcessor:
         if "challenging problem" in q.lower() and ("impact" not in low and "result" not in low):
             followup += " Also cover the impact or result in one line."
 
-        new_q = generate_followup_question(answer)
+        hits = self.coverage.update(answer)
+        print(f"[COVERAGE] {len(self.coverage.covered)}/{len(self.coverage.required)} JD skills "
+              f"({self.coverage.score():.0%})")
 
+        self._record_answer(q, answer)
+        self._plan_followups(answer)
         with self._lock:
-            self.transcript.append((q, answer))
-            if new_q and new_q not in self.q and len(self.q) < self.max_questions:
-                self.q.append(new_q)
             done = (self.i + 1) >= self.max_questions
+        self.tracer.add("finalize", t_fin, self.tracer.now())
 
         if done:
             self.tts.speak(
-                self._ack(low) + "That’s all I had. We’ll review your answers and our HR will contact you soon.",
+                self._ack(hits) + "That’s all I had. We’ll review your answers and our HR will contact you soon.",
                 block=True
             )
             self._complete()
             return
 
-        self.tts.speak(self._ack(low) + "Next question." + followup)
+        self.tts.speak(self._ack(hits) + "Next question." + followup)
         self._ask_next()
 
     # ----------------- input -----------------
+    def _end_session(self):
+        if not self.active:
+            return
+        self.tts.speak("Ending the interview session. Thank you for your time!", block=True)
+        self._complete()
+
+    def _repeat(self):
+        if self.last_question:
+            self.tts.speak(self.last_question)
+
+    def _skip(self):
+        if not self.active:
+            return
+        with self._lock:
+            self._clear_answer()
+        self._ask_next()
+
     def process_input(self, text: str):
+        """Classify a transcribed fragment and post the resulting action to the scheduler."""
+        with self.tracer.span("process_input"):
+            return self._process_input(text)
+
+    def _process_input(self, text: str):
         if not self.active:
             return
 
-        low = text.lower().strip()
+        command = turn_detector.classify(text)
 
-        if any(k in low for k in ["stop interview", "end interview", "exit", "quit"]):
-            self.tts.speak("Ending the interview session. Thank you for your time!", block=True)
-            self._complete()
+        if command == "exit":
+            self._sched.call_soon(self._end_session)
             return "exit"
 
-        if low.startswith("repeat"):
-            if self.last_question:
-                self.tts.speak(self.last_question)
+        if command == "repeat":
+            self._sched.call_soon(self._repeat)
             return "repeat"
 
-        if "skip" in low:
+        if command == "skip":
             with self._lock:
-                self._answer_buf.clear()
-            return self._ask_next()
+                self._cancel_timer()
+            self._sched.call_soon(self._skip)
+            return "skip"
 
+        now = self._sched.now()
         with self._lock:
+            if self._cut_at is not None:
+                if now - self._cut_at <= self.RESUME_SECONDS:
+                    self.turn_detector.observe_cut(self._cut_pause + (now - self._cut_at))
+                self._cut_at = None
+            if self._answer_buf and self._last_fragment_at is not None:
+                self.turn_detector.observe_gap(now - self._last_fragment_at)
             self._answer_buf.append(text)
-
-        end_keywords = ["that's it", "i'm done", "that is all", "i'm finished", "that's all"]
-        if any(k in low for k in end_keywords):
-            self._cancel_timer()
-            self._finalize_answer_if_any()
+            self._answer_word_count += len(text.split())
+            self._last_fragment_at = now
+            too_long = self._answer_words() >= self.MAX_ANSWER_WORDS
+        self._last_input_t = self.tracer.now()
+
+        if too_long:
+            print(f"[ANSWER] {self.MAX_ANSWER_WORDS} words reached; taking the answer as it stands")
+        if command == "end" or too_long:
+            self._request_finalize()
             return "finalized"
 
         self._schedule_finalize()
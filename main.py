@@ -1,51 +1,121 @@
 # main.py
-import argparse
 import time
+_T0 = time.perf_counter()  # before any other import, for time-to-first-prompt
+
+import argparse
+import os
+import startup
 from whisper_transcriber import WhisperTranscriber
 from text_to_speech import TextToSpeech
 from interview_processor import InterviewProcessor
+from question_bank import QuestionBank
+from tracing import Tracer
 
 class AIInterviewAssistant:
-    def __init__(self, resume_path: str = "", jd_path: str = ""):
-        self.tts = TextToSpeech()
-        self.processor = InterviewProcessor(self.tts)
+    def __init__(self, resume_path: str = "", jd_path: str = "", candidate_id: str = "", corpus_path: str = "corpus.sqlite",
+                 question_bank_path: str = "", question_source: str = "llm", trace_dir: str = "",
+                 end_of_turn: str = "adaptive", record_dir: str = "", refine_model: str = "",
+                 analytics: bool = True, native_capture: bool = False, bundle: str = "",
+                 skip_bad_audio: bool = False, loop: bool = False, upcoming=None, memwatch=None):
+        # One tracer across ASR, processor and TTS so their spans share session/turn IDs
+        self.tracer = Tracer(trace_dir) if trace_dir else None
+        self.tts = TextToSpeech(tracer=self.tracer)
+        bank = QuestionBank.load(question_bank_path) if question_bank_path else None
+        # Optional archive of the candidate's audio, and a larger model that re-transcribes each answer
+        archive = refiner = None
+        if record_dir:
+            from audio_archive import AudioArchive
+            archive = AudioArchive(record_dir)
+            if refine_model:
+                from whisper_transcriber import WhisperDecoder
+                refiner = WhisperDecoder(refine_model, beam_size=5, cpu_threads=2)
+        cohorts = None
+        if analytics:
+            from cohort_analytics import CohortAnalytics
+            cohorts = CohortAnalytics()
+        self.processor = InterviewProcessor(self.tts, question_bank=bank, question_source=question_source,
+                                            tracer=self.tracer, end_of_turn=end_of_turn,
+                                            audio_archive=archive, refiner=refiner, analytics=cohorts)
 
-        # Load resume & job description if provided
-        if resume_path:
-            self.processor.load_resume(resume_path)
-        if jd_path:
-            self.processor.load_job_description(jd_path)
+        # Load resume & job description if provided; a prep.py bundle already holds them
+        self.bundle = bundle
+        self._documents = (resume_path, jd_path, candidate_id, corpus_path)
+        self._load_documents()
+        # --loop: back-to-back interviews in this process, recycling per-session state in between.
+        # upcoming: the sessions after this one, prep bundle paths or prep.py schedule entries.
+        self.loop = loop
+        self.upcoming = list(upcoming or [])
+        self.memwatch = memwatch  # memwatch.MemoryWatch, snapshots after every interview
+        self.sessions = 0
 
         # Speech-to-text
-        self.stt = WhisperTranscriber(on_text=self.process_user_input)
+        self.stt = WhisperTranscriber(on_text=self.process_user_input, tracer=self.tracer,
+                                      on_silence=self.processor.note_silence, archive=archive,
+                                      native_capture=native_capture, skip_hopeless=skip_bad_audio,
+                                      on_error=self._asr_failed)
 
         # Pause mic when AI is speaking
         self.tts.on_start = getattr(self.stt, "pause", None)
         self.tts.on_end = getattr(self.stt, "resume", None)
+        startup.track_first_prompt(self.tts, _T0)
 
         self.running = True
 
+    def _load_documents(self):
+        if self.bundle:
+            return
+        resume_path, jd_path, candidate_id, corpus_path = self._documents
+        if candidate_id:
+            self.processor.load_resume(candidate_id=candidate_id, corpus_path=corpus_path)
+        elif resume_path:
+            self.processor.load_resume(resume_path)
+        if jd_path:
+            self.processor.load_job_description(jd_path)
+
+    def _asr_failed(self, exc):
+        print(f"[ASR] speech recognition is unavailable ({exc}); ending the session")
+        self.stop()
+
     def process_user_input(self, text):
         print(f"User: {text}")
         result = self.processor.process_input(text)
-        if result == "exit":
+        if result == "exit" and not self.loop:
             self.stop()
 
     def start(self):
         # Start the interview immediately
-        self.processor.start_interview()
+        self.processor.start_interview(self.bundle or None)
         self.stt.start()
 
         try:
+            # Auto-stop when the interview finishes. The timeout only keeps Ctrl+C responsive.
             while self.running:
-                # 👇 Auto-stop when interview is finished (processor is inactive)
-                if not self.processor.active:
-                    self.stop()
+                if not self.processor.done.wait(1.0):
+                    continue
+                if not (self.loop and self.upcoming):
                     break
-                time.sleep(0.1)
+                self._next_interview()
+            self.stop()
         except KeyboardInterrupt:
             self.stop()
 
+    def _next_interview(self):
+        from memwatch import rss_bytes
+        self.sessions += 1
+        print(f"[LOOP] interview {self.sessions} done, rss {rss_bytes() / 2**20:.0f} MB; starting the next one")
+        if self.memwatch is not None:
+            self.memwatch.snapshot(f"after{self.sessions}")
+        self.processor.recycle()
+        session = self.upcoming.pop(0)
+        if isinstance(session, dict):
+            self.bundle = ""
+            self._documents = (session.get("resume", ""), session.get("jd", ""), session.get("candidate_id", ""),
+                               self._documents[3])
+        else:
+            self.bundle = session
+        self._load_documents()
+        self.processor.start_interview(self.bundle or None)
+
     def stop(self):
         if not self.running:
             return
@@ -57,20 +127,99 @@ class AIInterviewAssistant:
             pass
 
         try:
-            # Ensure everything is finalized
-            self.processor._cancel_timer()
-            self.processor._finalize_answer_if_any()
-            self.processor._save_transcript()
+            # Records any half-given answer and saves the transcript exactly once
+            self.processor.close()
         except Exception:
             pass
 
         print("\nSession ended. Goodbye!")
 
+def _sessions(bundles: list, schedule: str) -> list:
+    """Bundle paths (a folder of bundles expands to the bundles in it) then schedule entries, in order."""
+    out = []
+    for path in bundles:
+        if os.path.isdir(path) and not os.path.exists(os.path.join(path, "bundle.json")):
+            out += [os.path.join(path, name) for name in sorted(os.listdir(path))
+                    if os.path.exists(os.path.join(path, name, "bundle.json"))]
+        else:
+            out.append(path)
+    if schedule:
+        import prep
+        out += prep.read_schedule(schedule)
+    return out
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--resume", default="", help="Path to candidate resume (.txt/.pdf/.docx)")
     parser.add_argument("--jd", default="", help="Path to job description (.txt/.pdf/.docx)")
+    parser.add_argument("--candidate", default="", help="Load the resume by candidate ID from the corpus")
+    parser.add_argument("--corpus", default="corpus.sqlite", help="Corpus built with `python corpus.py ingest`")
+    parser.add_argument("--question-bank", default="", help="JSONL question bank (e.g. question_bank.jsonl)")
+    parser.add_argument("--question-source", default="llm", choices=InterviewProcessor.QUESTION_SOURCES,
+                        help="llm: Gemini only; bank: local bank first; race: Gemini hedged by the bank")
+    parser.add_argument("--end-of-turn", default="adaptive", choices=InterviewProcessor.END_OF_TURN_MODES,
+                        help="adaptive: end phrases, pauses and a learned timeout; fixed: 10 s silence timer")
+    parser.add_argument("--record", default="", help="Archive the candidate's audio per session in this folder")
+    parser.add_argument("--refine-model", default="",
+                        help="With --record: re-transcribe each answer with this Whisper model before scoring")
+    parser.add_argument("--bundle", nargs="+", default=[],
+                        help="Start from a session bundle made by `python prep.py prepare`; with --loop, "
+                             "several bundles, or a bundles folder, run one after another")
+    parser.add_argument("--schedule", default="",
+                        help="With --loop: a prep.py schedule whose sessions run one after another, "
+                             "documents loaded live")
+    parser.add_argument("--skip-bad-audio", action="store_true",
+                        help="Do not transcribe chunks that are far too quiet, clipped or noisy")
+    parser.add_argument("--native-capture", action="store_true",
+                        help="Capture at the microphone's own rate and channel count and resample in software")
+    parser.add_argument("--no-analytics", action="store_true",
+                        help="Do not add the scorecard to the JD's cohort (see cohort_analytics.py)")
+    parser.add_argument("--trace", default="", help="Write per-turn latency traces (JSONL + Prometheus) here")
+    parser.add_argument("--profile", nargs="?", const="profiles", default="", metavar="DIR",
+                        help="Sample every thread's stack during the session; write collapsed stacks "
+                             "and a CPU summary to DIR (default profiles/)")
+    parser.add_argument("--loop", action="store_true",
+                        help="Run the --bundle / --schedule sessions back to back in this process")
+    parser.add_argument("--memwatch", default="", metavar="DIR",
+                        help="Trace allocations; write snapshots to DIR after each interview and on SIGUSR1")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="Print per-module import cost and exit")
     args = parser.parse_args()
 
-    assistant = AIInterviewAssistant(resume_path=args.resume, jd_path=args.jd)
-    assistant.start()
+    if args.import_profile:
+        startup.print_import_profile(startup.import_profile_fresh())
+        raise SystemExit(0)
+
+    sessions = _sessions(args.bundle, args.schedule)
+    if len(sessions) > 1 and not args.loop:
+        parser.error("several sessions given; add --loop to run them back to back")
+    if args.loop and not sessions:
+        parser.error("--loop needs the sessions to run: --bundle folders or --schedule")
+    first = sessions[0] if sessions else {"resume": args.resume, "jd": args.jd, "candidate_id": args.candidate}
+    bundle, docs = (first, {}) if isinstance(first, str) else ("", first)
+
+    profiler = None
+    if args.profile:
+        from profiler import SamplingProfiler
+        profiler = SamplingProfiler(args.profile).start()
+    watch = None
+    if args.memwatch:
+        from memwatch import MemoryWatch
+        watch = MemoryWatch(args.memwatch).start()
+        watch.install_signal()
+
+    assistant = AIInterviewAssistant(
+        resume_path=docs.get("resume", ""), jd_path=docs.get("jd", ""), candidate_id=docs.get("candidate_id", ""),
+        corpus_path=args.corpus,
+        question_bank_path=args.question_bank, question_source=args.question_source, trace_dir=args.trace,
+        end_of_turn=args.end_of_turn, record_dir=args.record, refine_model=args.refine_model,
+        analytics=not args.no_analytics, native_capture=args.native_capture,
+        bundle=bundle, skip_bad_audio=args.skip_bad_audio, loop=args.loop, upcoming=sessions[1:],
+        memwatch=watch,
+    )
+    try:
+        assistant.start()
+    finally:
+        if profiler is not None:
+            profiler.stop()
@@ -0,0 +1,86 @@
+# memwatch.py
+"""
+Memory checks for long-running processes: the current RSS, and tracemalloc
+snapshots taken on demand, each written with its top allocation sites and
+the growth since the previous snapshot.
+
+    python main.py --loop --bundle bundles/ --memwatch mem/        then: kill -USR1 <pid>
+    python -m benchmarks.soak --sessions 500
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+def rss_bytes() -> int:
+    """Resident set size now (peak RSS where the current value is not available)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return 0
+
+
+class MemoryWatch:
+    def __init__(self, out_dir: str = "memwatch", frames: int = 10, top: int = 25):
+        self.out_dir = out_dir
+        self.frames = frames
+        self.top = top
+        self._prev = None
+        self._lock = threading.Lock()
+        self.taken = 0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        return self
+
+    def install_signal(self):
+        """Take a snapshot on SIGUSR1 (where the platform has it). Call from the main thread."""
+        import signal
+        if not hasattr(signal, "SIGUSR1"):
+            print("[MEM] no SIGUSR1 on this platform; snapshots only between sessions")
+            return
+        # Snapshots walk every traced block; do that off the interrupted thread.
+        signal.signal(signal.SIGUSR1, lambda signum, frame: threading.Thread(
+            target=self.snapshot, args=("signal",), name="memwatch", daemon=True).start())
+        print(f"[MEM] kill -USR1 {os.getpid()} writes a tracemalloc snapshot to {self.out_dir}/")
+
+    def snapshot(self, label: str = "") -> str:
+        """Write the top allocation sites (and growth since the last snapshot); returns the file path."""
+        with self._lock:
+            snap = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            ))
+            current, peak = tracemalloc.get_traced_memory()
+            rss = rss_bytes()
+            self.taken += 1
+            lines = [f"rss {rss / 2**20:.1f} MB, traced {current / 2**20:.1f} MB (peak {peak / 2**20:.1f} MB)", "",
+                     f"top {self.top} allocation sites"]
+            lines += [str(s) for s in snap.statistics("lineno")[:self.top]]
+            if self._prev is not None:
+                lines += ["", f"top {self.top} changes since the previous snapshot"]
+                lines += [str(s) for s in snap.compare_to(self._prev, "lineno")[:self.top]]
+            self._prev = snap
+            os.makedirs(self.out_dir, exist_ok=True)
+            name = time.strftime("%Y%m%d-%H%M%S") + f"_{self.taken:03d}" + (f"_{label}" if label else "")
+            path = os.path.join(self.out_dir, name + ".txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        print(f"[MEM] {lines[0]} -> {path}")
+        return path
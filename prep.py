@@ -0,0 +1,239 @@
+# prep.py
+"""
+Ahead-of-time interview prep.
+
+For scheduled interviews the resume and JD are known hours in advance. `prepare`
+reads a schedule and, for each session, extracts the documents, generates the
+seed questions and pre-renders the fixed lines and seeds to WAV, then writes a
+ready-to-run bundle: bundles/<id>/bundle.json plus its audio. Sessions are
+prepared in parallel; audio goes through one shared SpeechRenderer, and lines
+every session says (greeting, opener, closing) are rendered once per batch.
+
+    python prep.py prepare schedule.jsonl --workers 8
+    python prep.py prepare schedule.jsonl --question-source bank   # offline: seeds from the question bank
+    python prep.py list
+    python main.py --bundle bundles/jane-doe_0900
+
+Schedule lines: {"id": "jane-doe_0900", "resume": "cv/jane.pdf", "jd": "jd/ds.txt", "max_questions": 4}
+("candidate_id" instead of "resume" reads the corpus; a JSON list also works).
+"""
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+from file_loaders import load_text
+from interview_processor import InterviewProcessor
+
+DEFAULT_ROOT = "bundles"
+BUNDLE_VERSION = 1
+
+
+@dataclass
+class Bundle:
+    bundle_id: str
+    candidate: str = ""
+    jd_label: str = ""
+    resume_text: str = ""
+    jd_text: str = ""
+    seeds: list = field(default_factory=list)
+    max_questions: int = 0
+    audio: dict = field(default_factory=dict)  # spoken text -> WAV path
+    prep_ms: dict = field(default_factory=dict)
+    created: str = ""
+    degraded: str = ""  # what is missing, e.g. "no seed questions"; the session makes it up live
+    version: int = BUNDLE_VERSION
+
+
+def load_bundle(path: str) -> Bundle:
+    """A bundle folder (or its bundle.json); audio paths come back absolute."""
+    folder = os.path.dirname(path) if path.endswith(".json") else path
+    with open(os.path.join(folder, "bundle.json"), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"{folder}: bundle version {data.get('version')}, expected {BUNDLE_VERSION}")
+    b = Bundle(**data)
+    b.audio = {text: os.path.abspath(os.path.join(folder, name)) for text, name in b.audio.items()}
+    return b
+
+
+def read_schedule(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read().strip()
+    if raw.startswith("["):
+        entries = json.loads(raw)
+    else:
+        entries = [json.loads(line) for line in raw.splitlines() if line.strip()]
+    for i, e in enumerate(entries):
+        if not e.get("id"):
+            who = e.get("candidate_id") or os.path.splitext(os.path.basename(e.get("resume", "")))[0]
+            e["id"] = f"{who or 'session'}_{i}"
+    return entries
+
+
+# ----------------- preparing -----------------
+class Preparer:
+    def __init__(self, root: str = DEFAULT_ROOT, corpus_path: str = "", render: bool = True, llm=None,
+                 question_bank=None, question_source: str = "llm"):
+        if question_source not in InterviewProcessor.QUESTION_SOURCES:
+            raise ValueError(f"question_source must be one of {InterviewProcessor.QUESTION_SOURCES}")
+        self.root = root
+        self.corpus_path = corpus_path
+        self.llm = llm
+        self.question_bank = question_bank  # optional question_bank.QuestionBank
+        self.question_source = question_source if question_bank is not None else "llm"
+        self.renderer = None
+        if render:
+            try:
+                import pyttsx3  # noqa: F401
+                from text_to_speech import SpeechRenderer
+                self.renderer = SpeechRenderer()
+            except Exception as e:
+                print(f"[PREP] no speech engine ({e}); bundles will be text-only")
+        self._renders = {}  # text -> Future[bytes], shared across the batch
+        self._renders_lock = threading.Lock()
+
+    def _render(self, text: str):
+        with self._renders_lock:
+            fut = self._renders.get(text)
+            if fut is None:
+                fut = self._renders[text] = self.renderer.render(text)
+            return fut
+
+    def _seeds(self, resume_text: str, jd_text: str, n: int) -> list:
+        """Seed questions from the same source a live session would use (InterviewProcessor._seed_questions)."""
+        query = jd_text + "\n" + resume_text
+        exclude = [InterviewProcessor.OPENER]
+        if self.question_source == "bank":
+            hits = self.question_bank.search(query, k=n, exclude=exclude)
+            if hits:
+                return [e["question"] for _, e in hits]
+        llm = self.llm
+        if llm is None:
+            import gemini_question_generator as llm
+        seeds = [s for s in llm.generate_seed_questions(resume_text, jd_text, n=n) if s]
+        if not seeds and self.question_source == "race":
+            seeds = [e["question"] for _, e in self.question_bank.search(query, k=n, exclude=exclude)]
+        return seeds
+
+    def prepare_one(self, entry: dict) -> dict:
+        P = InterviewProcessor
+        t0 = time.perf_counter()
+        b = Bundle(entry["id"], max_questions=int(entry.get("max_questions") or 0),
+                   created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        if entry.get("candidate_id"):
+            from corpus import DEFAULT_DB, load_candidate_text
+            b.candidate = entry["candidate_id"]
+            b.resume_text = load_candidate_text(entry["candidate_id"], self.corpus_path or DEFAULT_DB) or ""
+        elif entry.get("resume"):
+            b.candidate = os.path.splitext(os.path.basename(entry["resume"]))[0]
+            b.resume_text = load_text(entry["resume"], max_chars=P.DOC_CHAR_BUDGET) or ""
+        if entry.get("jd"):
+            b.jd_text = load_text(entry["jd"], max_chars=P.DOC_CHAR_BUDGET) or ""
+            b.jd_label = os.path.basename(entry["jd"])
+        b.resume_text = b.resume_text.strip()[:P.DOC_CHAR_BUDGET]
+        b.jd_text = b.jd_text.strip()[:P.DOC_CHAR_BUDGET]
+        for key, text in (("resume", b.resume_text), ("candidate_id", b.resume_text), ("jd", b.jd_text)):
+            if entry.get(key) and not text:
+                raise ValueError(f"no text from {key} {entry[key]!r}")
+        t1 = time.perf_counter()
+
+        if b.resume_text or b.jd_text:
+            n = min(2, b.max_questions or 3)  # what InterviewProcessor would prefetch
+            b.seeds = self._seeds(b.resume_text, b.jd_text, n)
+            if not b.seeds:
+                b.degraded = "no seed questions"
+                print(f"[PREP] {b.bundle_id}: no seed questions (LLM unavailable?); they will be generated live")
+        t2 = time.perf_counter()
+
+        folder = os.path.join(self.root, b.bundle_id)
+        tmp = folder + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        if self.renderer is not None:
+            lines = [P.GREETING, P.OPENER, *b.seeds, P.CLOSING]
+            futures = [(text, self._render(text)) for text in dict.fromkeys(lines)]
+            for i, (text, fut) in enumerate(futures):
+                wav = fut.result()
+                if wav:
+                    name = f"{i:02d}.wav"
+                    with open(os.path.join(tmp, name), "wb") as f:
+                        f.write(wav)
+                    b.audio[text] = name
+        t3 = time.perf_counter()
+
+        b.prep_ms = {"documents": round((t1 - t0) * 1000, 1), "seeds": round((t2 - t1) * 1000, 1),
+                     "audio": round((t3 - t2) * 1000, 1), "total": round((t3 - t0) * 1000, 1)}
+        with open(os.path.join(tmp, "bundle.json"), "w", encoding="utf-8") as f:
+            json.dump(asdict(b), f, ensure_ascii=False, indent=2)
+        shutil.rmtree(folder, ignore_errors=True)
+        os.replace(tmp, folder)
+        # prep_ms already has "seeds" and "audio" (milliseconds), so the counts get their own keys
+        return {"id": b.bundle_id, "seed_count": len(b.seeds), "clips": len(b.audio), "degraded": b.degraded,
+                **b.prep_ms}
+
+    def prepare(self, entries: list[dict], workers: int = 4) -> list[dict]:
+        def one(entry):
+            try:
+                return self.prepare_one(entry)
+            except Exception as e:
+                print(f"[PREP] {entry.get('id')}: failed ({e})")
+                return {"id": entry.get("id"), "error": str(e)}
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prep") as pool:
+            return list(pool.map(one, entries))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_prep = sub.add_parser("prepare", help="Build a bundle for every session in a schedule")
+    p_prep.add_argument("schedule")
+    p_prep.add_argument("--workers", type=int, default=4, help="Sessions prepared in parallel")
+    p_prep.add_argument("--corpus", default="")
+    p_prep.add_argument("--no-audio", action="store_true", help="Skip pre-rendering speech")
+    p_prep.add_argument("--question-bank", default="", help="Bank file (default question_bank.jsonl)")
+    p_prep.add_argument("--question-source", default="llm", choices=InterviewProcessor.QUESTION_SOURCES,
+                        help="Where seed questions come from; 'bank' preps without the LLM")
+    p_prep.add_argument("--json", default="", help="Also write the per-session report here")
+    sub.add_parser("list", help="Bundles ready to run")
+    args = parser.parse_args()
+
+    if args.cmd == "list":
+        names = sorted(os.listdir(args.root)) if os.path.isdir(args.root) else []
+        for name in names:
+            if os.path.exists(os.path.join(args.root, name, "bundle.json")):
+                b = load_bundle(os.path.join(args.root, name))
+                print(f"{name:<32}{b.candidate:<24}{b.jd_label:<24}{len(b.seeds)} seeds  "
+                      f"{len(b.audio)} clips  {b.created}" + (f"  DEGRADED: {b.degraded}" if b.degraded else ""))
+    else:
+        entries = read_schedule(args.schedule)
+        bank = None
+        if args.question_bank or args.question_source != "llm":
+            from question_bank import DEFAULT_BANK, QuestionBank
+            bank = QuestionBank.load(args.question_bank or DEFAULT_BANK)
+            if not len(bank):
+                print(f"[PREP] question bank {args.question_bank or DEFAULT_BANK} is empty; seeding from the LLM")
+                bank = None
+        t0 = time.perf_counter()
+        rows = Preparer(args.root, args.corpus, render=not args.no_audio, question_bank=bank,
+                        question_source=args.question_source).prepare(entries, args.workers)
+        wall = time.perf_counter() - t0
+        print(f"{'session':<32}{'docs ms':>9}{'seeds ms':>10}{'audio ms':>10}{'total ms':>10}")
+        for r in rows:
+            if "error" in r:
+                print(f"{r['id']:<32}  failed: {r['error']}")
+            else:
+                print(f"{r['id']:<32}{r['documents']:>9.0f}{r['seeds']:>10.0f}{r['audio']:>10.0f}"
+                      f"{r['total']:>10.0f}" + (f"  degraded: {r['degraded']}" if r["degraded"] else ""))
+        ok = sum("error" not in r for r in rows)
+        degraded = sum(bool(r.get("degraded")) for r in rows)
+        print(f"[PREP] {ok}/{len(rows)} bundles in {wall:.1f} s -> {args.root}/"
+              + (f" ({degraded} degraded; re-run prepare for them)" if degraded else ""))
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"wall_s": round(wall, 2), "sessions": rows}, f, indent=2)
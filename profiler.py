@@ -0,0 +1,184 @@
+# profiler.py
+"""
+Low-overhead sampling profiler over every thread of the process.
+
+A daemon thread wakes every `interval` seconds, reads all threads' stacks with
+sys._current_frames() and charges each stack the CPU time its thread used since
+the previous sample (per-thread CPU clocks on Linux/macOS; elsewhere each sample
+counts one interval unless the thread sits in a known blocking call). Stacks are
+grouped by thread role: the thread name with worker numbers stripped, so
+"interview-llm_0".."_3" are one role and the Tk main loop is "MainThread".
+Silence timers and every other processor state change are Scheduler callbacks,
+so they show up under "interview-scheduler".
+
+When stopped it writes, under out_dir:
+    <stamp>.collapsed   "role;file:func;file:func <microseconds>" per line, for
+                        flamegraph.pl / speedscope / inferno
+    <stamp>.txt         CPU per role and the top functions by self and total CPU
+
+    python main.py --profile profiles/
+    python gui.py --profile profiles/
+"""
+import collections
+import os
+import re
+import sys
+import threading
+import time
+
+# Leaf functions that mean "waiting", for platforms without per-thread CPU clocks
+_IDLE_LEAVES = {"wait", "get", "sleep", "select", "poll", "accept", "recv", "recv_into", "readinto",
+                "readline", "_wait_for_tstate_lock", "acquire", "mainloop", "result", "join"}
+_WORKER_SUFFIX = re.compile(r"[_-]\d+$")
+_ANON_THREAD = re.compile(r"^Thread-\d+(?: \((.+)\))?$")
+
+
+def thread_role(name: str) -> str:
+    m = _ANON_THREAD.match(name)
+    if m:
+        return m.group(1) or "thread"
+    return _WORKER_SUFFIX.sub("", name)
+
+
+def _cpu_clock(ident: int):
+    """A clock_gettime() id for the thread's CPU time, or None where unsupported."""
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError, OverflowError):
+        return None
+
+
+class SamplingProfiler:
+    def __init__(self, out_dir: str = "profiles", interval: float = 0.01, max_depth: int = 48):
+        self.out_dir = out_dir
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = collections.Counter()  # (role, (code, ...) root first) -> CPU seconds
+        self.role_cpu = collections.Counter()  # role -> CPU seconds
+        self.role_samples = collections.Counter()  # role -> samples taken, idle or not
+        self.samples = 0
+        self.overhead = 0.0  # CPU seconds spent sampling
+        self._threads = {}  # ident -> [role, cpu clock id or None, last CPU reading]
+        self._labels = {}  # code object -> "file:func"
+        self._stop = threading.Event()
+        self._thread = None
+        self._t0 = 0.0
+
+    # ----------------- sampling -----------------
+    def start(self):
+        self._t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        me = threading.get_ident()
+        clock = _cpu_clock(me)
+        while not self._stop.wait(self.interval):
+            c0 = time.clock_gettime(clock) if clock is not None else time.perf_counter()
+            self._sample(me)
+            self.overhead += (time.clock_gettime(clock) if clock is not None else time.perf_counter()) - c0
+
+    def _refresh_threads(self):
+        known = {}
+        for t in threading.enumerate():
+            prev = self._threads.get(t.ident)
+            if prev is not None and prev[0] == thread_role(t.name):  # idents are reused
+                known[t.ident] = prev
+                continue
+            clock = _cpu_clock(t.ident)
+            known[t.ident] = [thread_role(t.name), clock, time.clock_gettime(clock) if clock is not None else 0.0]
+        self._threads = known
+
+    def _sample(self, me: int):
+        frames = sys._current_frames()
+        self.samples += 1
+        if self.samples % 100 == 0 or any(ident not in self._threads for ident in frames):
+            self._refresh_threads()
+        for ident, frame in frames.items():
+            if ident == me:
+                continue
+            info = self._threads.get(ident)
+            if info is None:  # a thread that is not a threading.Thread
+                continue
+            role, clock = info[0], info[1]
+            self.role_samples[role] += 1
+            if clock is not None:
+                try:
+                    now = time.clock_gettime(clock)
+                except OSError:  # thread exited between the two calls
+                    continue
+                cpu, info[2] = now - info[2], now
+                if cpu <= 0.0:
+                    continue
+            elif frame.f_code.co_name in _IDLE_LEAVES:
+                continue
+            else:
+                cpu = self.interval
+            codes = []
+            while frame is not None and len(codes) < self.max_depth:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.reverse()
+            self.stacks[(role, tuple(codes))] += cpu
+            self.role_cpu[role] += cpu
+
+    def stop(self, write: bool = True) -> str:
+        """Stop sampling; write the reports (returns the collapsed-stack path) unless write=False."""
+        if self._thread is None:
+            return ""
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        return self.write() if write else ""
+
+    # ----------------- reports -----------------
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+        return label
+
+    def collapsed(self) -> list[str]:
+        lines = collections.Counter()
+        for (role, codes), cpu in self.stacks.items():
+            lines[";".join([role, *map(self._label, codes)])] += cpu
+        return [f"{stack} {max(1, round(cpu * 1e6))}" for stack, cpu in sorted(lines.items())]
+
+    def top(self, n: int = 20) -> tuple[list, list]:
+        """(self CPU, total CPU) as [(seconds, "role file:func"), ...], biggest first."""
+        own, total = collections.Counter(), collections.Counter()
+        for (role, codes), cpu in self.stacks.items():
+            if codes:
+                own[f"{role} {self._label(codes[-1])}"] += cpu
+            for key in {f"{role} {self._label(c)}" for c in codes}:  # once per stack, even if recursive
+                total[key] += cpu
+        return ([(s, k) for k, s in own.most_common(n)], [(s, k) for k, s in total.most_common(n)])
+
+    def summary(self, n: int = 20) -> str:
+        wall = time.perf_counter() - self._t0
+        cpu = sum(self.role_cpu.values())
+        out = [f"{wall:.1f} s wall, {self.samples} samples every {self.interval * 1000:.0f} ms, "
+               f"{cpu:.2f} s CPU sampled, profiler overhead {self.overhead:.2f} s "
+               f"({self.overhead / max(wall, 1e-9) * 100:.2f}% of one core)", "",
+               f"{'thread role':<28}{'CPU s':>9}{'share':>8}{'busy':>8}"]
+        for role, secs in self.role_cpu.most_common():
+            busy = secs / max(self.role_samples[role] * self.interval, 1e-9)
+            out.append(f"{role:<28}{secs:>9.2f}{secs / max(cpu, 1e-9) * 100:>7.1f}%{min(busy, 1.0) * 100:>7.0f}%")
+        own, total = self.top(n)
+        for title, rows in (("self", own), ("total", total)):
+            out += ["", f"top {n} by {title} CPU", f"{'CPU s':>9}{'share':>8}  function"]
+            out += [f"{secs:>9.2f}{secs / max(cpu, 1e-9) * 100:>7.1f}%  {key}" for secs, key in rows]
+        return "\n".join(out)
+
+    def write(self) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, time.strftime("%Y%m%d-%H%M%S"))
+        with open(base + ".collapsed", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        text = self.summary()
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print("\n\n".join(text.split("\n\n")[:2]))
+        print(f"[PROFILE] {base}.collapsed, {base}.txt")
+        return base + ".collapsed"
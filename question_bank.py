@@ -0,0 +1,116 @@
+# question_bank.py
+"""
+Local bank of vetted interview questions with a BM25 index.
+
+The bank is a JSONL file, one question per line:
+    {"id": "ds-001", "question": "...", "skills": ["arima", "forecasting"], "seniority": "junior"}
+"""
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+
+from skill_index import normalize
+
+DEFAULT_BANK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.jsonl")
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+_STOP = {
+    "a", "an", "and", "or", "the", "of", "in", "on", "to", "for", "with", "as", "at", "by", "from",
+    "is", "are", "was", "were", "be", "been", "it", "its", "this", "that", "you", "your", "i", "me",
+    "my", "we", "our", "how", "what", "when", "why", "which", "would", "do", "did", "does", "have",
+    "has", "had", "can", "could", "about", "tell", "describe", "explain", "time",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN.findall(normalize(text)) if t not in _STOP and len(t) > 1]
+
+
+def question_key(text: str) -> str:
+    return normalize(text).rstrip(" ?!.")
+
+
+class QuestionBank:
+    K1 = 1.5
+    B = 0.75
+    MAX_QUERY_TERMS = 48  # long resume/JD queries keep only their highest tf-idf terms
+
+    def __init__(self, entries: list[dict]):
+        self.entries = entries
+        self._postings = {}  # term -> list of (doc index, BM25 weight)
+        self._doc_len = []
+        for i, e in enumerate(entries):
+            # Skill tags are part of the document so tagged questions surface for those skills.
+            toks = tokenize(e.get("question", "")) + tokenize(" ".join(e.get("skills", [])))
+            self._doc_len.append(len(toks))
+            for term, tf in Counter(toks).items():
+                self._postings.setdefault(term, []).append((i, tf))
+        n = len(entries)
+        avg = (sum(self._doc_len) / n) if n else 1.0
+        # Fold idf and length normalization into the postings so a query is a sum of lookups.
+        k1, b = self.K1, self.B
+        self._idf = {}
+        for term, plist in self._postings.items():
+            idf = math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            self._idf[term] = idf
+            self._postings[term] = [
+                (i, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * self._doc_len[i] / avg)))
+                for i, tf in plist
+            ]
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BANK) -> "QuestionBank":
+        entries = []
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        e = json.loads(line)
+                    except ValueError:
+                        continue
+                    if e.get("question"):
+                        entries.append(e)
+        return cls(entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query: str, k: int = 5, exclude=(), seniority: str = "") -> list[tuple[float, dict]]:
+        """Top-k (score, entry) by BM25. exclude holds question texts already asked."""
+        counts = Counter(t for t in tokenize(query) if t in self._idf)
+        if not counts:
+            return []
+        terms = heapq.nlargest(self.MAX_QUERY_TERMS, counts, key=lambda t: counts[t] * self._idf[t])
+        skip = {question_key(q) for q in exclude}
+
+        scores = {}
+        get = scores.get
+        for t in terms:
+            qtf = counts[t]
+            for i, w in self._postings[t]:
+                scores[i] = get(i, 0.0) + w * qtf
+
+        def keep(i):
+            e = self.entries[i]
+            if seniority and e.get("seniority") and e["seniority"] != seniority:
+                return False
+            return question_key(e["question"]) not in skip
+
+        # Partial selection first; only fall back to a full sort when filters reject too much.
+        want = k * 4 + len(skip)
+        top = heapq.nlargest(want, scores.items(), key=lambda kv: kv[1])
+        out = [(sc, self.entries[i]) for i, sc in top if keep(i)][:k]
+        if len(out) < k and len(scores) > want:
+            ordered = sorted(scores.items(), key=lambda kv: -kv[1])
+            out = [(sc, self.entries[i]) for i, sc in ordered if keep(i)][:k]
+        return out
+
+    def best_question(self, query: str, exclude=(), seniority: str = "") -> str:
+        hits = self.search(query, k=1, exclude=exclude, seniority=seniority)
+        return hits[0][1]["question"] if hits else ""
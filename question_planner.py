@@ -0,0 +1,46 @@
+# question_planner.py
+"""
+Demand-driven follow-up planning.
+
+The interview asks at most `max_questions` questions. Slots are filled by the
+opener, by seed questions and by follow-ups generated from answers. A follow-up
+is only worth an LLM call when a slot it could fill is still empty and will
+actually be reached; everything else is an avoided call.
+
+The slot right after the current one is needed *now* (the candidate is waiting).
+The slot after that is only needed next turn, so it is prefetched in the
+background from the answer just given.
+"""
+
+
+class QuestionPlanner:
+    def __init__(self, max_questions: int):
+        self.max_questions = max_questions
+        self.answers = 0
+        self.requested = 0  # follow-ups generated while the candidate waited
+        self.prefetched = 0  # follow-ups generated one turn ahead in the background
+        self.prefetch_used = 0
+        self.prefetch_wasted = 0
+
+    def need_now(self, filled: int, next_index: int) -> bool:
+        """The next question to ask has no text yet."""
+        return next_index < self.max_questions and next_index >= filled
+
+    def worth_prefetch(self, filled: int, next_index: int) -> bool:
+        """The slot after the next question is empty and the interview will reach it."""
+        return filled == next_index + 1 and filled < self.max_questions
+
+    @property
+    def avoided(self) -> int:
+        # Without planning every answer cost one follow-up call.
+        return max(0, self.answers - self.requested - self.prefetched)
+
+    def summary(self) -> dict:
+        return {
+            "answers": self.answers,
+            "requested": self.requested,
+            "prefetched": self.prefetched,
+            "prefetch_used": self.prefetch_used,
+            "prefetch_wasted": self.prefetch_wasted,
+            "avoided": self.avoided,
+        }
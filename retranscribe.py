@@ -0,0 +1,121 @@
+# retranscribe.py
+"""
+Second-pass transcription of archived interviews.
+
+Live ASR favours latency (small model, greedy decoding). Sessions recorded with
+main.py --record can be re-decoded later with a larger model and beam search;
+the refined answers are journaled next to the live ones and replace them in
+the .txt/.json outputs. With --rescore, answers are scored again on the
+refined text. Answers from all selected sessions are decoded as one batch on
+a shared model, at lowered CPU priority so it can soak up idle cores.
+
+    python retranscribe.py --model medium --beam 5 --workers 2              # every unrefined session
+    python retranscribe.py --model small 20250131_101500_ab12cd --rescore
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_archive import DEFAULT_ROOT, answer_segments, read_recording
+from transcript_store import DEFAULT_ROOT as TRANSCRIPTS_ROOT, TranscriptStore
+
+
+def archived_sessions(root: str) -> list[str]:
+    if not os.path.isdir(root):
+        return []
+    return sorted(name[:-4] for name in os.listdir(root) if name.endswith(".wav"))
+
+
+def is_refined(store: TranscriptStore, session_id: str) -> bool:
+    path = store.paths(session_id)["journal"]
+    if not os.path.exists(path):
+        return False
+    with open(path, "r", encoding="utf-8") as f:
+        return any('"type": "refined"' in line for line in f)
+
+
+def plan(root: str, session_ids: list[str]) -> list[tuple[str, int, object]]:
+    """(session_id, answer index, audio) for every archived answer of the given sessions."""
+    jobs = []
+    for sid in session_ids:
+        try:
+            audio, rate, marks = read_recording(root, sid)
+        except Exception as e:
+            print(f"[RETRANSCRIBE] {sid}: unreadable recording ({e})")
+            continue
+        if rate != 16000:
+            print(f"[RETRANSCRIBE] {sid}: expected 16 kHz audio, got {rate}; skipped")
+            continue
+        for idx, start, end in answer_segments(marks):
+            if end > start:
+                jobs.append((sid, idx, audio[start:end]))
+    return jobs
+
+
+def rescore(store: TranscriptStore, session_id: str):
+    from gemini_question_generator import aggregate_scorecard, score_answer
+    state = store.read_journal(session_id)
+    per_question = [{"q": qa["q"], **score_answer(qa["q"], qa["a"])} for qa in state["questions"]]
+    if any(p["score"] is not None for p in per_question):
+        store.append_result(session_id, aggregate_scorecard(per_question), {"refined": True})
+
+
+def run(root: str, store: TranscriptStore, session_ids: list[str], decoder, model_name: str,
+        workers: int = 1, rescore_after: bool = False) -> dict:
+    t0 = time.perf_counter()
+    jobs = plan(root, session_ids)
+    audio_s = sum(len(a) for _, _, a in jobs) / 16000
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        texts = list(pool.map(lambda job: decoder.transcribe(job[2]), jobs))
+
+    changed = {}
+    for (sid, idx, _), text in zip(jobs, texts):
+        text = (text or "").strip()
+        if text:
+            store.append_refined(sid, idx, text, model_name)
+            changed[sid] = changed.get(sid, 0) + 1
+    for sid in changed:
+        if rescore_after:
+            rescore(store, sid)
+        store.write_outputs(sid)
+    wall = time.perf_counter() - t0
+    return {
+        "sessions": len(session_ids),
+        "answers": len(jobs),
+        "refined": sum(changed.values()),
+        "audio_s": round(audio_s, 1),
+        "wall_s": round(wall, 2),
+        "rtf": round(wall / audio_s, 3) if audio_s else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("session_ids", nargs="*", help="Default: every archived session not yet refined")
+    parser.add_argument("--recordings", default=DEFAULT_ROOT)
+    parser.add_argument("--transcripts", default=TRANSCRIPTS_ROOT)
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--beam", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Parallel decodes on the shared model")
+    parser.add_argument("--nice", type=int, default=10, help="Lower CPU priority by this much (0 to keep)")
+    parser.add_argument("--rescore", action="store_true", help="Score the refined answers again")
+    parser.add_argument("--force", action="store_true", help="Also redo sessions that were already refined")
+    args = parser.parse_args()
+
+    if args.nice and hasattr(os, "nice"):
+        os.nice(args.nice)
+    store = TranscriptStore(args.transcripts)
+    ids = args.session_ids or [
+        sid for sid in archived_sessions(args.recordings) if args.force or not is_refined(store, sid)
+    ]
+    if not ids:
+        raise SystemExit("Nothing to re-transcribe.")
+
+    from whisper_transcriber import WhisperDecoder
+    decoder = WhisperDecoder(args.model, compute_type=args.compute_type, num_workers=args.workers,
+                             beam_size=args.beam)
+    print(json.dumps(run(args.recordings, store, ids, decoder, args.model, args.workers, args.rescore)))
@@ -0,0 +1,90 @@
+# scheduler.py
+"""
+Single-thread scheduler with a timer heap.
+
+Every callback runs on one worker thread, in due-time order, so the state it
+touches needs no further coordination and the thread count stays constant no
+matter how often timers are rescheduled.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+
+class TimerHandle:
+    __slots__ = ("due", "fn", "args", "cancelled")
+
+    def __init__(self, due: float, fn, args):
+        self.due = due
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self, name: str = "interview-scheduler", clock=time.monotonic):
+        self.clock = clock
+        self._heap = []  # (due, seq, handle)
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def now(self) -> float:
+        return self.clock()
+
+    def call_later(self, delay: float, fn, *args) -> TimerHandle:
+        handle = TimerHandle(self.clock() + max(0.0, delay), fn, args)
+        with self._cv:
+            heapq.heappush(self._heap, (handle.due, next(self._seq), handle))
+            self._cv.notify()
+        return handle
+
+    def call_soon(self, fn, *args) -> TimerHandle:
+        return self.call_later(0.0, fn, *args)
+
+    def in_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def pending(self) -> int:
+        with self._cv:
+            return sum(1 for _, _, h in self._heap if not h.cancelled)
+
+    def stop(self, timeout: float = None):
+        with self._cv:
+            self._running = False
+            self._cv.notify()
+        if not self.in_thread():
+            self._thread.join(timeout)
+
+    def _next_due(self):
+        """Pop the next runnable handle, waiting until it is due. None means stopped."""
+        with self._cv:
+            while self._running:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cv.wait()
+                    continue
+                wait = self._heap[0][0] - self.clock()
+                if wait <= 0:
+                    return heapq.heappop(self._heap)[2]
+                self._cv.wait(wait)
+            return None
+
+    def _run(self):
+        while True:
+            handle = self._next_due()
+            if handle is None:
+                return
+            if handle.cancelled:
+                continue
+            try:
+                handle.fn(*handle.args)
+            except Exception as e:
+                print(f"[Scheduler] Error in {getattr(handle.fn, '__name__', handle.fn)}: {e}")
@@ -0,0 +1,418 @@
+# server.py
+"""
+Headless interview server: many concurrent interviews in one process.
+
+Each TCP connection is one interview with its own InterviewProcessor. The
+Whisper model, the speech renderer, the Gemini client, the thread pool for
+background LLM calls and a fixed pool of schedulers (the threads that run
+every session's turns) are shared, so the thread count does not grow with
+the number of open sessions.
+
+Frames (both directions): 1-byte type, 4-byte big-endian length, payload.
+  client -> server
+    H  JSON hello {"resume_text", "jd_text", "jd_label", "candidate_id", "max_questions"}, or {"bundle"}
+       naming a prep.py bundle; starts the interview. It must come first: an A or X frame
+       before it, or a second H, ends the connection
+    A  PCM audio: 16 kHz mono, signed 16-bit little-endian
+    X  UTF-8 text fed to the interview as if transcribed (text clients, load tests)
+    E  end the session
+  server -> client
+    T  JSON {"text", "kind": "question"|"say"}: what the interviewer says
+    W  WAV bytes for the preceding utterance (only with --audio)
+    U  JSON {"text"}: what the server heard
+    R  JSON scorecard; the connection closes after it
+
+    python server.py serve --port 8765 --asr-workers 2 --llm-workers 32 --schedulers 16 --audio
+    python server.py probe --sessions 20     # text-only load check against a running server
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from interview_processor import InterviewProcessor
+from scheduler import Scheduler
+from tracing import Tracer
+
+_HEADER = struct.Struct(">cI")
+MAX_FRAME = 16 * 1024 * 1024
+
+
+async def read_frame(reader):
+    kind, length = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"frame too large ({length} bytes)")
+    return kind, await reader.readexactly(length)
+
+
+def pack_frame(kind: bytes, payload: bytes) -> bytes:
+    return _HEADER.pack(kind, len(payload)) + payload
+
+
+def _percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(pct / 100 * len(sorted_vals)))]
+
+
+def _latency_summary(sid: int, turns, active: bool) -> dict:
+    turns = sorted(turns)
+    return {"session": sid, "active": active, "turns": len(turns),
+            "p50_ms": round(_percentile(turns, 50) * 1000, 1),
+            "p95_ms": round(_percentile(turns, 95) * 1000, 1)}
+
+
+class RemoteSpeech:
+    """TextToSpeech stand-in that sends utterances to the client instead of the local speaker."""
+    def __init__(self, session):
+        self.session = session
+        self.on_start = None
+        self.on_end = None
+
+    def speak(self, text: str, block: bool = False, on_start=None):
+        if not text or not text.strip():
+            return
+        if on_start:
+            on_start()
+        self.session.processor.tracer.mark("tts.start")
+        self.session.send_utterance(text, block)
+
+    def is_speaking(self) -> bool:
+        return False
+
+    def preload(self, audio: dict):
+        self.session.prerendered.update(audio)
+
+
+class Session:
+    def __init__(self, server, sid: int, writer):
+        self.server = server
+        self.sid = sid
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.scheduler = server.acquire_scheduler()  # shared; released in close()
+        self.processor = InterviewProcessor(
+            RemoteSpeech(self), question_bank=server.question_bank, question_source=server.question_source,
+            tracer=Tracer(server.trace_dir) if server.trace_dir else None, analytics=server.analytics,
+            executor=server.executor, scheduler=self.scheduler,
+        )
+        self.processor.on_complete = self._on_complete
+        self.stt = None
+        self.prerendered = {}  # text -> WAV path from a prep.py bundle, sent instead of rendering
+        self.started = False  # hello received; audio and text before it are a protocol error
+        self._last_input = None
+        self._lock = threading.Lock()
+
+    # ----------------- outbound (any thread) -----------------
+    def send(self, kind: bytes, payload: bytes):
+        self.loop.call_soon_threadsafe(self._write, pack_frame(kind, payload))
+
+    def _write(self, frame: bytes):
+        if not self.writer.is_closing():
+            self.writer.write(frame)
+
+    def send_utterance(self, text: str, block: bool):
+        with self._lock:
+            started, self._last_input = self._last_input, None
+        if started is not None:
+            self.server.record_turn(self.sid, time.perf_counter() - started)
+        kind = "question" if text == self.processor.last_question else "say"
+        self.send(b"T", json.dumps({"text": text, "kind": kind}).encode("utf-8"))
+        if self.server.renderer is None:
+            return
+        path = self.prerendered.get(text)
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                self.send(b"W", f.read())
+            return
+        fut = self.server.renderer.render(text)
+        if block:
+            self.send(b"W", fut.result())
+        else:
+            fut.add_done_callback(lambda f: self.send(b"W", f.result()))
+
+    def _on_complete(self):
+        result = self.processor.last_result or {}
+        self.send(b"R", json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        self.loop.call_soon_threadsafe(self.writer.close)
+
+    # ----------------- inbound -----------------
+    def hello(self, info: dict):
+        p = self.processor
+        if info.get("bundle"):
+            p.start_interview(os.path.join(self.server.bundle_dir, os.path.basename(info["bundle"])))
+            return
+        if info.get("candidate_id"):
+            p.load_resume(candidate_id=info["candidate_id"], corpus_path=self.server.corpus_path)
+        else:
+            p.resume_text = (info.get("resume_text") or "").strip()[:p.DOC_CHAR_BUDGET]
+        p.jd_text = (info.get("jd_text") or "").strip()[:p.DOC_CHAR_BUDGET]
+        p.jd_label = info.get("jd_label", "")
+        if info.get("max_questions"):
+            p.max_questions = int(info["max_questions"])
+        p.start_interview()
+
+    def on_text(self, text: str):
+        self.send(b"U", json.dumps({"text": text}).encode("utf-8"))
+        with self._lock:
+            self._last_input = time.perf_counter()
+        self.processor.process_input(text)
+
+    def feed_pcm(self, payload: bytes):
+        if self.server.decoder is None:
+            return
+        import numpy as np
+        if self.stt is None:
+            from whisper_transcriber import WhisperTranscriber
+            self.stt = WhisperTranscriber(on_text=self.on_text, decoder=self.server.decoder,
+                                          tracer=self.processor.tracer, on_silence=self.processor.note_silence)
+            self.stt.start(capture=False)
+        pcm = np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32768.0
+        self.stt.feed(pcm.reshape(-1, 1))
+
+    def close(self):
+        if self.stt is not None:
+            self.stt.stop()
+        self.processor.shutdown()  # leaves the shared scheduler running
+        self.server.release_scheduler(self.scheduler)
+
+
+class InterviewServer:
+    RECENT_SESSIONS = 100  # closed sessions whose turn latencies stay in stats()
+
+    def __init__(self, decoder=None, renderer=None, question_bank=None, question_source="llm",
+                 corpus_path="corpus.sqlite", trace_dir="", analytics=None, bundle_dir="bundles",
+                 llm_workers=32, schedulers=16):
+        self.decoder = decoder
+        # Scoring, seeds and follow-ups of every session; bounded however many sessions are open.
+        self.executor = ThreadPoolExecutor(max_workers=llm_workers, thread_name_prefix="interview-llm")
+        # Turns of every session run on these; a new session joins the least loaded one. A turn still
+        # waits on its follow-up or score inline, so sessions sharing a scheduler queue behind each
+        # other's waits: more schedulers, less of that, at one thread each.
+        self.schedulers = [Scheduler(name=f"interview-scheduler-{i}") for i in range(max(1, schedulers))]
+        self._sched_load = [0] * len(self.schedulers)
+        self.analytics = analytics  # one CohortAnalytics shared by all sessions
+        self.bundle_dir = bundle_dir  # hello {"bundle": id} starts from bundle_dir/<id>
+        self.trace_dir = trace_dir
+        self.renderer = renderer
+        self.question_bank = question_bank
+        self.question_source = question_source
+        self.corpus_path = corpus_path
+        self.sessions = {}
+        self.peak_sessions = 0
+        self.completed_sessions = 0
+        self._turns = []
+        self._session_turns = {}  # sid -> turn latencies of an open session
+        self._recent = collections.deque(maxlen=self.RECENT_SESSIONS)  # per-session stats of closed ones
+        self._ids = itertools.count(1)
+        self._stats_lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def acquire_scheduler(self) -> Scheduler:
+        with self._stats_lock:
+            i = min(range(len(self.schedulers)), key=self._sched_load.__getitem__)
+            self._sched_load[i] += 1
+            return self.schedulers[i]
+
+    def release_scheduler(self, sched: Scheduler):
+        with self._stats_lock:
+            self._sched_load[self.schedulers.index(sched)] -= 1
+
+    def record_turn(self, sid: int, seconds: float):
+        with self._stats_lock:
+            self._turns.append(seconds)
+            self._session_turns.setdefault(sid, []).append(seconds)
+
+    def end_session(self, sid: int):
+        with self._stats_lock:
+            turns = self._session_turns.pop(sid, [])
+            self._recent.append(_latency_summary(sid, turns, active=False))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            turns = sorted(self._turns)
+            per_session = list(self._recent) + [_latency_summary(sid, t, active=True)
+                                                for sid, t in self._session_turns.items()]
+            load = list(self._sched_load)
+        cores = os.cpu_count() or 1
+        cpu = time.process_time() - self._cpu0
+        wall = time.perf_counter() - self._t0
+        return {
+            "active_sessions": len(self.sessions),
+            "peak_sessions": self.peak_sessions,
+            "completed_sessions": self.completed_sessions,
+            "cores": cores,
+            "peak_sessions_per_core": round(self.peak_sessions / cores, 2),
+            "cpu_utilisation": round(cpu / wall / cores, 3) if wall else 0.0,
+            "turns": len(turns),
+            "turn_latency_p50_ms": round(_percentile(turns, 50) * 1000, 1),
+            "turn_latency_p95_ms": round(_percentile(turns, 95) * 1000, 1),
+            "scheduler_sessions": load,
+            "per_session": per_session,
+        }
+
+    async def handle(self, reader, writer):
+        sid = next(self._ids)
+        session = Session(self, sid, writer)
+        self.sessions[sid] = session
+        self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        try:
+            while True:
+                kind, payload = await read_frame(reader)
+                if kind == b"H":
+                    if session.started:
+                        raise ValueError("second H frame")
+                    await asyncio.to_thread(session.hello, json.loads(payload or b"{}"))
+                    session.started = True
+                elif kind in (b"A", b"X") and not session.started:
+                    raise ValueError(f"{kind.decode()} frame before H")
+                elif kind == b"A":
+                    session.feed_pcm(payload)
+                elif kind == b"X":
+                    session.on_text(payload.decode("utf-8", errors="ignore"))
+                elif kind == b"E":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            print(f"[SERVER] session {sid}: {e}")
+        finally:
+            await asyncio.to_thread(session.close)
+            del self.sessions[sid]
+            self.end_session(sid)
+            self.completed_sessions += 1
+            if not writer.is_closing():
+                writer.close()
+
+    async def _report(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            print(f"[SERVER] {json.dumps(self.stats())}")
+
+    async def serve(self, host: str, port: int, stats_interval: float = 30.0):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"[SERVER] listening on {host}:{port}")
+        reporter = asyncio.create_task(self._report(stats_interval)) if stats_interval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if reporter:
+                reporter.cancel()
+            self.executor.shutdown(wait=False)
+            for sched in self.schedulers:
+                sched.stop(1.0)
+            print(f"[SERVER] {json.dumps(self.stats())}")
+
+
+# ----------------- probe client -----------------
+async def _probe_one(host, port, answers, hello):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(pack_frame(b"H", json.dumps(hello).encode("utf-8")))
+    latencies, sent_at, n = [], None, 0
+    try:
+        while True:
+            kind, payload = await read_frame(reader)
+            if kind == b"T":
+                msg = json.loads(payload)
+                if sent_at is not None:
+                    latencies.append(time.perf_counter() - sent_at)
+                    sent_at = None
+                if msg["kind"] == "question":
+                    writer.write(pack_frame(b"X", answers[n % len(answers)].encode("utf-8")))
+                    sent_at = time.perf_counter()
+                    n += 1
+            elif kind == b"R":
+                break
+    except asyncio.IncompleteReadError:
+        pass
+    writer.close()
+    return latencies
+
+
+async def probe(host, port, sessions: int, hello: dict):
+    answers = [
+        "I build forecasting models in Python with pandas and XGBoost for my team. That's it.",
+        "I validated the model with a rolling backtest and explained results to stakeholders. That's it.",
+    ]
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(_probe_one(host, port, answers, hello) for _ in range(sessions)))
+    lat = sorted(x for r in results for x in r)
+    print(json.dumps({
+        "sessions": sessions,
+        "wall_s": round(time.perf_counter() - t0, 2),
+        "turns": len(lat),
+        "client_turn_p50_ms": round(_percentile(lat, 50) * 1000, 1),
+        "client_turn_p95_ms": round(_percentile(lat, 95) * 1000, 1),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_srv = sub.add_parser("serve", help="Run the interview server")
+    p_srv.add_argument("--host", default="127.0.0.1")
+    p_srv.add_argument("--port", type=int, default=8765)
+    p_srv.add_argument("--model", default="base", help="Whisper model size shared by all sessions")
+    p_srv.add_argument("--compute-type", default="int8")
+    p_srv.add_argument("--asr-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                       help="Parallel Whisper decodes")
+    p_srv.add_argument("--llm-workers", type=int, default=32,
+                       help="Threads for background LLM calls, shared by all sessions")
+    p_srv.add_argument("--schedulers", type=int, default=16,
+                       help="Threads that run session turns; each session is pinned to one")
+    p_srv.add_argument("--no-asr", action="store_true", help="Text-only sessions (X frames)")
+    p_srv.add_argument("--audio", action="store_true", help="Send synthesized WAV (W frames)")
+    p_srv.add_argument("--question-bank", default="")
+    p_srv.add_argument("--question-source", default="llm", choices=InterviewProcessor.QUESTION_SOURCES)
+    p_srv.add_argument("--corpus", default="corpus.sqlite")
+    p_srv.add_argument("--stats-interval", type=float, default=30.0)
+    p_srv.add_argument("--trace", default="", help="Write per-session latency traces to this folder")
+    p_srv.add_argument("--bundles", default="bundles", help="Folder of prep.py session bundles")
+    p_srv.add_argument("--no-analytics", action="store_true", help="Do not update JD cohort analytics")
+    p_srv.add_argument("--memwatch", default="", metavar="DIR",
+                       help="Trace allocations; write a snapshot to DIR on SIGUSR1")
+    p_probe = sub.add_parser("probe", help="Drive N concurrent text sessions against a server")
+    p_probe.add_argument("--host", default="127.0.0.1")
+    p_probe.add_argument("--port", type=int, default=8765)
+    p_probe.add_argument("--sessions", type=int, default=10)
+    p_probe.add_argument("--resume", default="")
+    p_probe.add_argument("--jd", default="")
+    args = parser.parse_args()
+
+    if args.cmd == "probe":
+        from file_loaders import load_text
+        hello = {"resume_text": load_text(args.resume, max_chars=8000),
+                 "jd_text": load_text(args.jd, max_chars=8000)}
+        asyncio.run(probe(args.host, args.port, args.sessions, hello))
+    else:
+        decoder = renderer = bank = None
+        if not args.no_asr:
+            from whisper_transcriber import WhisperDecoder
+            decoder = WhisperDecoder(args.model, compute_type=args.compute_type, num_workers=args.asr_workers)
+        if args.audio:
+            from text_to_speech import SpeechRenderer
+            renderer = SpeechRenderer()
+        if args.question_bank:
+            from question_bank import QuestionBank
+            bank = QuestionBank.load(args.question_bank)
+        analytics = None
+        if not args.no_analytics:
+            from cohort_analytics import CohortAnalytics
+            analytics = CohortAnalytics()
+        if args.memwatch:
+            from memwatch import MemoryWatch
+            MemoryWatch(args.memwatch).start().install_signal()
+        srv = InterviewServer(decoder, renderer, bank, args.question_source, args.corpus, args.trace, analytics,
+                              args.bundles, args.llm_workers, args.schedulers)
+        try:
+            asyncio.run(srv.serve(args.host, args.port, args.stats_interval))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,568 @@
+# simulate.py
+"""
+Simulated interviews on a virtual clock, for load and latency regression checks.
+
+Each session runs InterviewProcessor unchanged against scripted candidates:
+fake TTS and ASR driven by a JSONL answer script and a fake LLM with sampled
+latencies. Time is virtual: timers (including the 10 s silence timeout) fire
+by jumping the clock, and background LLM work completes at a virtual
+deadline, so a full interview takes milliseconds of CPU. Sessions run in
+parallel on a thread pool, sharing one TranscriptStore and question bank;
+their locks are swapped for instrumented ones to measure contention.
+
+    python simulate.py --sessions 2000 --workers 8
+    python simulate.py --scripts answers.jsonl --llm-latency lognormal:1.2,0.5 --json sim.json
+
+Script lines: {"answers": ["...", "..."], "max_questions": 4, "candidate": "jane"}
+(a bare JSON list of answers also works). Latency specs are in seconds:
+const:S, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA.
+"""
+import argparse
+import contextlib
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from scheduler import Scheduler
+from tracing import Tracer
+
+WORDS_PER_SECOND = 2.5  # speaking rate for both sides
+ASR_CHUNK_SECONDS = 3.0  # WhisperTranscriber.chunk_duration
+ASR_BLOCK_SECONDS = 0.5  # WhisperTranscriber.block_duration: silence is reported per block
+ASR_FLUSH_SECONDS = 0.5  # WhisperTranscriber.FLUSH_SILENCE
+TRAILING_SILENCE_SECONDS = 12.0  # how long the audio path keeps reporting silence after an answer
+MAX_VIRTUAL_SECONDS = 4 * 3600.0
+
+DEFAULT_LATENCIES = {
+    "llm": "lognormal:0.9,0.4",  # follow-up questions
+    "seed": "lognormal:1.5,0.3",
+    "score": "lognormal:1.2,0.4",
+    "tts": "lognormal:0.25,0.3",  # time to first audio
+    "asr": "lognormal:0.35,0.3",  # decode time per chunk
+    "think": "uniform:0.5,2.0",  # candidate pause before answering
+    "pause": "lognormal:0.4,0.6",  # candidate pause between phrases of one answer
+}
+
+DEFAULT_SCRIPTS = [
+    {"answers": [
+        "I am a data scientist who builds forecasting models in Python with pandas and XGBoost "
+        "and I present the results to business stakeholders every week. That's it.",
+        "ARIMA models a series from its own lags and past errors after differencing it to be stationary. That's it.",
+        "I tune learning rate, depth and the number of trees with a rolling backtest. That's it.",
+        "I once cut forecast error by twenty percent by adding holiday features. That's it.",
+    ]},
+    {"answers": [
+        "I have three years of experience in analytics and machine learning with SQL and Python.",
+        "skip",
+        "I would start with a simple baseline and then try gradient boosting with cross validation. That's it.",
+        "I explain the model with feature importance and a short written summary. That's it.",
+    ]},
+    {"answers": [
+        "I work on a small team building dashboards and some predictive models. That's all.",
+        "repeat",
+        "I used time series decomposition and a seasonal naive baseline to check the model. That's all.",
+        "Communication and mentoring junior analysts are my strengths. I'm done.",
+    ]},
+]
+
+
+# ----------------- latency distributions -----------------
+def parse_latency(spec: str):
+    """Turn 'lognormal:0.9,0.4' into a sampler(rng) -> seconds (never negative)."""
+    kind, _, params = spec.partition(":")
+    vals = [float(v) for v in params.split(",") if v.strip()]
+    if kind == "const" and len(vals) == 1:
+        return lambda rng: vals[0]
+    if kind == "uniform" and len(vals) == 2:
+        return lambda rng: rng.uniform(vals[0], vals[1])
+    if kind == "normal" and len(vals) == 2:
+        return lambda rng: max(0.0, rng.gauss(vals[0], vals[1]))
+    if kind == "lognormal" and len(vals) == 2:
+        mu = math.log(vals[0])
+        return lambda rng: rng.lognormvariate(mu, vals[1])
+    raise ValueError(f"bad latency spec {spec!r}")
+
+
+def _percentiles(vals, pcts=(50, 95, 99)) -> dict:
+    vals = sorted(vals)
+    if not vals:
+        return {f"p{p}": 0.0 for p in pcts}
+    return {f"p{p}": round(vals[min(len(vals) - 1, int(p / 100 * len(vals)))] * 1000, 1) for p in pcts}
+
+
+# ----------------- virtual time -----------------
+class VirtualClock:
+    def __init__(self, start: float = 0.0):
+        self.t = start
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance_to(self, t: float):
+        if t > self.t:
+            self.t = t
+
+
+class VirtualScheduler(Scheduler):
+    """Scheduler that runs callbacks inline on the caller's thread, jumping the clock to each due time."""
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._running = True
+        self._thread = None
+
+    def in_thread(self) -> bool:
+        return True
+
+    def stop(self, timeout: float = None):
+        self._running = False
+
+    def run(self, until: float = None, stop=None) -> int:
+        """Run due callbacks in order until the heap is empty, `until` is reached or stop() is true."""
+        n = 0
+        while self._running and not (stop and stop()):
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap or (until is not None and self._heap[0][0] > until):
+                break
+            handle = heapq.heappop(self._heap)[2]
+            self.clock.advance_to(handle.due)
+            try:
+                handle.fn(*handle.args)
+            except Exception as e:
+                print(f"[Scheduler] Error in {getattr(handle.fn, '__name__', handle.fn)}: {e}")
+            n += 1
+        return n
+
+
+class VirtualRuntime:
+    """Clock, scheduler and executor for one simulated session.
+
+    Work submitted to the executor runs immediately, but its simulated cost is
+    charged to the task instead of the clock: the future only becomes done at
+    now + cost, and waiting on it moves the clock forward.
+    """
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock()
+        self.scheduler = VirtualScheduler(self.clock)
+        self._task_delay = None  # seconds charged to the running background task, None outside one
+
+    def now(self) -> float:
+        return self.clock() + (self._task_delay or 0.0)
+
+    def spend(self, seconds: float):
+        if self._task_delay is not None:
+            self._task_delay += seconds
+        else:
+            self.clock.advance_to(self.clock() + seconds)
+
+    def wait_until(self, t: float):
+        self.spend(max(0.0, t - self.now()))
+
+    # executor interface used by InterviewProcessor
+    def submit(self, fn, *args, **kwargs):
+        outer, self._task_delay = self._task_delay, 0.0
+        value = exc = None
+        try:
+            value = fn(*args, **kwargs)
+        except Exception as e:
+            exc = e
+        finally:
+            delay, self._task_delay = self._task_delay, outer
+        return VirtualFuture(self, self.now() + delay, value, exc)
+
+    def shutdown(self, wait: bool = True, **kwargs):
+        pass
+
+
+class VirtualFuture:
+    def __init__(self, rt: VirtualRuntime, ready_at: float, value, exc):
+        self._rt = rt
+        self.ready_at = ready_at
+        self._value = value
+        self._exc = exc
+
+    def done(self) -> bool:
+        return self._rt.now() >= self.ready_at
+
+    def cancel(self) -> bool:
+        return False
+
+    def result(self, timeout: float = None):
+        wait = self.ready_at - self._rt.now()
+        if timeout is not None and wait > timeout:
+            self._rt.spend(timeout)
+            raise FutureTimeout()
+        self._rt.wait_until(self.ready_at)
+        if self._exc is not None:
+            raise self._exc
+        return self._value
+
+    def add_done_callback(self, fn):
+        if self.done():
+            fn(self)
+        else:
+            self._rt.scheduler.call_later(self.ready_at - self._rt.clock(), fn, self)
+
+
+# ----------------- fakes -----------------
+class FakeLLM:
+    """Stands in for gemini_question_generator with sampled latencies and an optional failure rate."""
+    def __init__(self, rt: VirtualRuntime, latencies: dict, error_rate: float = 0.0):
+        self.rt = rt
+        self.latencies = latencies
+        self.error_rate = error_rate
+        self.calls = {"followup": 0, "seed": 0, "score": 0, "score_all": 0, "errors": 0}
+
+    def _call(self, kind: str, latency: str) -> bool:
+        self.calls[kind] += 1
+        self.rt.spend(self.latencies[latency](self.rt.rng))
+        if self.rt.rng.random() < self.error_rate:
+            self.calls["errors"] += 1
+            return False
+        return True
+
+    def generate_followup_question(self, answer: str, focus_skills: list = None) -> str:
+        if not self._call("followup", "llm"):
+            return ""
+        topic = (focus_skills or answer.split()[:1] or ["that"])[0]
+        return f"Can you tell me more about {topic}? ({self.calls['followup']})"
+
+    def generate_seed_questions(self, resume_text: str, jd_text: str, n: int = 3) -> list:
+        if not self._call("seed", "seed"):
+            return []
+        return [f"Walk me through a project that matches this role ({k + 1})." for k in range(n)]
+
+    def score_answer(self, question: str, answer: str, resume_text: str = "", jd_text: str = "") -> dict:
+        if not self._call("score", "score"):
+            return {"score": None, "strength": "", "gap": ""}
+        words = len(answer.split())
+        return {"score": min(95, 35 + words), "strength": "relevant detail" if words > 20 else "",
+                "gap": "" if words > 20 else "too brief"}
+
+    def generate_score_and_feedback(self, resume_text, jd_text, transcript, pass_threshold: int = 60) -> dict:
+        self._call("score_all", "score")
+        score = min(95, 35 + sum(len(a.split()) for _, a in transcript) // max(1, len(transcript)))
+        return {"score": score, "verdict": "Pass" if score >= pass_threshold else "Reject",
+                "reasons": [], "suggestions": []}
+
+
+class ScriptedCandidate:
+    """Fake TTS plus fake ASR: hears what the interviewer says and answers from a script."""
+    def __init__(self, rt: VirtualRuntime, answers: list, latencies: dict):
+        self.rt = rt
+        self.answers = list(answers)
+        self.latencies = latencies
+        self.processor = None
+        self.on_start = None
+        self._n = 0
+        self._epoch = 0  # silence reports left over from an earlier answer are dropped
+        self._speaking_until = 0.0
+        self._speech_end = None  # when the candidate last stopped talking, until the AI next speaks
+        self._answered_at = None  # same, until the next question
+        self.turn_latency = []  # candidate stops -> any AI audio
+        self.question_latency = []  # candidate stops -> next question audio
+
+    # TextToSpeech interface
+    def speak(self, text: str, block: bool = False, on_start=None):
+        if not text or not text.strip():
+            return
+        rt = self.rt
+        now = rt.clock()
+        picked_up = max(now, self._speaking_until)
+        start = picked_up + self.latencies["tts"](rt.rng)
+        self._speaking_until = start + len(text.split()) / WORDS_PER_SECOND
+        for cb in (on_start, self.on_start):
+            if cb:
+                rt.scheduler.call_later(start - now, cb)
+        if self.processor is not None:
+            self.processor.tracer.add("tts.queue_wait", now, picked_up)
+            self.processor.tracer.add("tts.start", picked_up, start)
+        if self._speech_end is not None:
+            self.turn_latency.append(start - self._speech_end)
+            self._speech_end = None
+        if self.processor is not None and text == self.processor.last_question and self.processor.active:
+            if self._answered_at is not None:
+                self.question_latency.append(start - self._answered_at)
+                self._answered_at = None
+            think = self.latencies["think"](rt.rng)
+            rt.scheduler.call_later(self._speaking_until - now + think, self._answer)
+        if block:
+            rt.wait_until(self._speaking_until)
+
+    def is_speaking(self) -> bool:
+        return self.rt.clock() < self._speaking_until
+
+    # ASR side: the answer arrives in ASR-chunk-sized fragments, each after its decode time
+    def _answer(self):
+        text = self.answers[self._n] if self._n < len(self.answers) else "stop interview"
+        self._n += 1
+        self._epoch += 1
+        epoch = self._epoch
+        words = text.split()
+        per_chunk = max(1, int(ASR_CHUNK_SECONDS * WORDS_PER_SECOND))
+        sched = self.rt.scheduler
+        now = self.rt.clock()
+        spoken = now
+        for k in range(0, len(words), per_chunk):
+            frag = words[k:k + per_chunk]
+            spoken += len(frag) / WORDS_PER_SECOND
+            last = k + per_chunk >= len(words)
+            pause = TRAILING_SILENCE_SECONDS if last else self.latencies["pause"](self.rt.rng)
+            # The transcriber decodes early once a pause follows speech, else at the chunk boundary.
+            cut = spoken + (ASR_FLUSH_SECONDS if pause >= ASR_FLUSH_SECONDS else 0.0)
+            heard = cut + self.latencies["asr"](self.rt.rng)
+            sched.call_later(heard - now, self._hear, " ".join(frag), spoken, last)
+            # Silence reports for each quiet block, never ahead of the text they follow.
+            t = ASR_BLOCK_SECONDS
+            while t <= pause:
+                sched.call_later(max(spoken + t, heard) - now, self._silence, t, epoch)
+                t += ASR_BLOCK_SECONDS
+            if not last:
+                if pause >= ASR_BLOCK_SECONDS:
+                    sched.call_later(max(spoken + pause, heard) - now, self._silence, 0.0, epoch)
+                spoken += pause
+
+    def _silence(self, seconds: float, epoch: int):
+        if epoch == self._epoch and self.processor.active:
+            self.processor.note_silence(seconds)
+
+    def _hear(self, text: str, spoken: float, last: bool):
+        self.processor.tracer.add("asr.decode", spoken, self.rt.clock())
+        if last:
+            self._speech_end = self._answered_at = spoken
+            self.processor.tracer.mark("speech_end", spoken)
+        if self.processor.active:
+            self.processor.process_input(text)
+
+
+class TimedLock:
+    """threading.Lock stand-in that records acquisitions and time spent waiting."""
+    def __init__(self, name: str, stats: "LockStats"):
+        self.name = name
+        self.stats = stats
+        self._lock = threading.Lock()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.stats.record(self.name, None)
+            return True
+        if not blocking:
+            return False
+        t0 = time.perf_counter()
+        ok = self._lock.acquire(True, timeout)
+        self.stats.record(self.name, time.perf_counter() - t0)
+        return ok
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class LockStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.data = {}
+
+    def record(self, name: str, waited):
+        with self._lock:
+            d = self.data.setdefault(name, {"acquired": 0, "contended": 0, "wait_ms": 0.0, "max_wait_ms": 0.0})
+            d["acquired"] += 1
+            if waited is not None:
+                d["contended"] += 1
+                d["wait_ms"] += waited * 1000
+                d["max_wait_ms"] = max(d["max_wait_ms"], waited * 1000)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                name: {**d, "wait_ms": round(d["wait_ms"], 2), "max_wait_ms": round(d["max_wait_ms"], 2),
+                       "contention": round(d["contended"] / d["acquired"], 4) if d["acquired"] else 0.0}
+                for name, d in self.data.items()
+            }
+
+
+# ----------------- driver -----------------
+def load_scripts(path: str = "") -> list[dict]:
+    if not path:
+        return DEFAULT_SCRIPTS
+    scripts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                rec = json.loads(line)
+                scripts.append({"answers": rec} if isinstance(rec, list) else rec)
+    if not scripts:
+        raise SystemExit(f"No scripts in {path}")
+    return scripts
+
+
+class Simulation:
+    def __init__(self, scripts, latencies: dict = None, store=None, question_bank=None,
+                 question_source: str = "llm", max_questions: int = 4, error_rate: float = 0.0,
+                 resume_text: str = "", jd_text: str = "", seed: int = 0,
+                 trace_dir: str = "", trace_sessions: int = 0, end_of_turn: str = "adaptive"):
+        self.scripts = scripts
+        self.latencies = {k: parse_latency(v) for k, v in {**DEFAULT_LATENCIES, **(latencies or {})}.items()}
+        self.store = store
+        self.question_bank = question_bank
+        self.question_source = question_source
+        self.max_questions = max_questions
+        self.error_rate = error_rate
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        self.seed = seed
+        self.trace_dir = trace_dir
+        self.end_of_turn = end_of_turn
+        self.trace_sessions = trace_sessions  # the first N sessions are traced (in virtual time)
+        self.locks = LockStats()
+        if store is not None:
+            store._init_lock = TimedLock("store", self.locks)
+
+    def run_session(self, idx: int) -> dict:
+        from interview_processor import InterviewProcessor
+        script = self.scripts[idx % len(self.scripts)]
+        rt = VirtualRuntime(self.seed * 1_000_003 + idx)
+        cand = ScriptedCandidate(rt, script["answers"], self.latencies)
+        llm = FakeLLM(rt, self.latencies, self.error_rate)
+        cpu0 = time.thread_time()
+        tracer = Tracer(self.trace_dir, clock=rt.clock) if idx < self.trace_sessions else None
+        p = InterviewProcessor(cand, self.question_bank, self.question_source, scheduler=rt.scheduler,
+                               transcript_store=self.store, llm=llm, executor=rt, tracer=tracer,
+                               end_of_turn=self.end_of_turn)
+        p._lock = TimedLock("processor", self.locks)
+        cand.processor = p
+        p.resume_text, p.jd_text = self.resume_text, self.jd_text
+        p.candidate = script.get("candidate") or f"sim-{idx % len(self.scripts)}"
+        p.max_questions = int(script.get("max_questions", self.max_questions))
+        p.start_interview()
+        rt.scheduler.run(until=MAX_VIRTUAL_SECONDS, stop=p.done.is_set)
+        stalled = not p.done.is_set()
+        if stalled:
+            p.close()
+        p.shutdown()
+        return {
+            "stalled": stalled,
+            "answers": len(p.transcript),
+            "virtual_s": rt.clock(),
+            "cpu_s": time.thread_time() - cpu0,
+            "turn_latency": cand.turn_latency,
+            "question_latency": cand.question_latency,
+            "llm_calls": llm.calls,
+            "followups": (p.last_result or {}).get("followups", {}),
+            "trace": tracer.summary() if tracer else None,
+        }
+
+    def run(self, sessions: int, workers: int = 4) -> dict:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sim") as pool:
+            results = list(pool.map(self.run_session, range(sessions)))
+        wall = time.perf_counter() - t0
+
+        turns = [x for r in results for x in r["turn_latency"]]
+        calls = {}
+        for r in results:
+            for k, v in r["llm_calls"].items():
+                calls[k] = calls.get(k, 0) + v
+        answers = sum(r["answers"] for r in results)
+        dominant = {}
+        for r in results:
+            for t in (r["trace"] or {}).get("per_turn", []):
+                if t["dominant"]:
+                    dominant[t["dominant"]] = dominant.get(t["dominant"], 0) + 1
+        cpu = sum(r["cpu_s"] for r in results)
+        return {
+            "sessions": sessions,
+            "workers": workers,
+            "stalled": sum(r["stalled"] for r in results),
+            "answers": answers,
+            "wall_s": round(wall, 3),
+            "sessions_per_s": round(sessions / wall, 1) if wall else 0.0,
+            "answers_per_s": round(answers / wall, 1) if wall else 0.0,
+            "cpu_ms_per_session": round(cpu / sessions * 1000, 2) if sessions else 0.0,
+            "turn_latency_ms": _percentiles(turns),
+            "question_latency_ms": _percentiles([x for r in results for x in r["question_latency"]]),
+            "virtual_session_s": {k: round(v / 1000, 1) for k, v in
+                                  _percentiles([r["virtual_s"] for r in results]).items()},
+            "llm_calls": calls,
+            "followups_avoided": sum(r["followups"].get("avoided", 0) for r in results),
+            "locks": self.locks.summary(),
+            "dominant_stage_turns": dominant,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--scripts", default="", help="JSONL answer scripts (defaults to a built-in set)")
+    parser.add_argument("--max-questions", type=int, default=4)
+    parser.add_argument("--resume", default="resume.txt")
+    parser.add_argument("--jd", default="job_description.txt")
+    parser.add_argument("--question-bank", default="")
+    parser.add_argument("--question-source", default="llm", choices=("llm", "bank", "race"))
+    parser.add_argument("--end-of-turn", default="adaptive", choices=("adaptive", "fixed"))
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake LLM calls that fail")
+    for name, spec in DEFAULT_LATENCIES.items():
+        parser.add_argument(f"--{name}-latency", default=spec)
+    parser.add_argument("--store", default="", help="Transcript root (default: a temp dir removed afterwards)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", default="", help="Write virtual-time traces for the first --trace-sessions here")
+    parser.add_argument("--trace-sessions", type=int, default=10)
+    parser.add_argument("--json", default="", help="Also write the report here")
+    parser.add_argument("--verbose", action="store_true", help="Keep the processors' console output")
+    args = parser.parse_args()
+
+    from file_loaders import load_text
+    from transcript_store import TranscriptStore
+
+    bank = None
+    if args.question_bank:
+        from question_bank import QuestionBank
+        bank = QuestionBank.load(args.question_bank)
+    root = args.store or tempfile.mkdtemp(prefix="sim_transcripts_")
+    sim = Simulation(
+        load_scripts(args.scripts),
+        latencies={name: getattr(args, f"{name}_latency") for name in DEFAULT_LATENCIES},
+        store=TranscriptStore(root),
+        question_bank=bank,
+        question_source=args.question_source,
+        max_questions=args.max_questions,
+        error_rate=args.error_rate,
+        resume_text=load_text(args.resume, max_chars=8000) if os.path.exists(args.resume) else "",
+        jd_text=load_text(args.jd, max_chars=8000) if os.path.exists(args.jd) else "",
+        seed=args.seed,
+        trace_dir=args.trace,
+        trace_sessions=args.trace_sessions if args.trace else 0,
+        end_of_turn=args.end_of_turn,
+    )
+    try:
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            report = sim.run(args.sessions, args.workers)
+    finally:
+        if not args.store:
+            shutil.rmtree(root, ignore_errors=True)
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,228 @@
+# skill_index.py
+"""
+Per-session skill index built from the JD and resume.
+
+Terms are normalized once, stored in an inverted index (term -> source lines),
+and compiled into an Aho-Corasick automaton so each answer is scanned in a
+single pass regardless of how many skills the JD lists.
+"""
+import re
+from collections import deque
+
+# canonical term -> aliases. A trailing "*" matches any word ending (collaborat* -> collaboration).
+TECH_TERMS = {
+    "python": [], "java": [], "c++": [], "sql": ["mysql", "postgresql", "postgres"],
+    "javascript": ["js"], "typescript": [], "golang": [], "scala": [], "rust": [],
+    "pandas": [], "numpy": [], "scikit-learn": ["sklearn", "scikit learn"], "statsmodels": [],
+    "tensorflow": [], "pytorch": ["torch"], "keras": [], "xgboost": [], "lightgbm": [],
+    "random forest*": [], "regression": [], "classification": [], "clustering": [],
+    "machine learning": ["ml"], "deep learning": [], "neural network*": [], "lstm*": [],
+    "arima": [], "sarima": [], "prophet": [], "time series": ["timeseries"], "forecast*": [],
+    "feature engineering": [], "anomaly detection": [], "seasonality": [], "statistic*": [],
+    "nlp": ["natural language processing"], "llm*": ["large language model*"], "rag": [],
+    "langchain": [], "bert": [], "gpt": [], "transformer*": [], "computer vision": [],
+    "aws": ["amazon web services"], "azure": [], "gcp": ["google cloud"], "terraform": [],
+    "docker": [], "kubernetes": ["k8s"], "spark": ["pyspark"], "hadoop": [], "airflow": [],
+    "etl": [], "data pipeline*": ["pipeline*"], "api": ["apis", "rest api*"], "flask": [], "django": [],
+    "fastapi": [], "react": ["reactjs"], "node": ["nodejs"], "mongodb": [], "tableau": [],
+    "power bi": [], "git": ["github"], "linux": [], "ci/cd": [], "a/b test*": [],
+}
+PEOPLE_TERMS = {
+    "team*": [], "stakeholder*": [], "client*": [], "collaborat*": [], "communicat*": [],
+    "mentor*": [], "lead*": ["led"], "cross-functional": [], "vendor*": [], "customer*": [],
+}
+# Everyday words that only count as the skill with a cue nearby ("react.js", "node backend",
+# "led a team"); for tech terms another tech term nearby also does ("React, Node and Docker").
+# Followed by "to" ("react to", "lead to") they never count. Surface word -> canonical term.
+AMBIGUOUS_WORDS = {"react": "react", "node": "node", "lead": "lead*", "leads": "lead*", "leading": "lead*",
+                   "led": "lead*"}
+CONTEXT_CUES = {
+    "react": re.compile(r"\b(?:js|jsx|redux|hooks?|components?|front ?end|native|uis?|spa)\b"),
+    "node": re.compile(r"\b(?:js|npm|express|back ?end|server side|runtime)\b"),
+    "lead*": re.compile(r"\b(?:teams?|projects?|engineers?|developers?|analysts?|squad|initiatives?|migration|"
+                        r"tech|technical|workstreams?)\b"),
+}
+CONTEXT_CHARS = 40  # how far from the word a cue may be
+
+_STOPWORDS = {
+    "a", "an", "and", "or", "the", "of", "in", "on", "to", "for", "with", "as", "at", "by",
+    "from", "is", "are", "be", "your", "our", "we", "you", "will", "ability", "experience",
+    "strong", "knowledge", "familiarity", "proficiency", "skills", "etc",
+}
+_LIST_LEAD = re.compile(r"\b(?:such as|like|including|e\.g\.?|using)\b", re.I)
+
+
+def normalize(text: str) -> str:
+    """Lowercase and fold separators so 'Scikit-Learn', 'scikit learn' and 'scikit_learn' agree."""
+    text = (text or "").lower()
+    text = re.sub(r"[\-_/]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch in "+#"
+
+
+class AhoCorasick:
+    """Whole-word multi-pattern matcher. Patterns map to a canonical key."""
+
+    def __init__(self, patterns: dict[str, str]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # list of (pattern length, key, prefix_ok)
+        for pat, key in patterns.items():
+            prefix = pat.endswith("*")
+            pat = pat.rstrip("*")
+            if not pat:
+                continue
+            node = 0
+            for ch in pat:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pat), key, prefix))
+        self._build()
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, key) for every whole-word match in an already-normalized text."""
+        node, n = 0, len(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for length, key, prefix in out[node]:
+                start = i - length + 1
+                if start > 0 and _is_word(text[start - 1]):
+                    continue
+                if not prefix and i + 1 < n and _is_word(text[i + 1]):
+                    continue
+                yield start, i + 1, key
+
+
+def extract_listed_terms(text: str) -> set[str]:
+    """Pull short items out of comma-separated skill lists ('pandas, NumPy, and scikit-learn')."""
+    terms = set()
+    for line in (text or "").splitlines():
+        if line.count(",") < 2:
+            continue
+        for item in line.split(","):
+            item = _LIST_LEAD.split(item)[-1]
+            item = re.sub(r"^\s*(?:and|or)\s+", "", item, flags=re.I).strip(" .;:()")
+            for part in item.split("/"):
+                words = normalize(part).split()
+                if not (1 <= len(words) <= 3) or any(w in _STOPWORDS for w in words):
+                    continue
+                term = " ".join(words)
+                if len(term) >= 2 and not term.isdigit():
+                    terms.add(term)
+    return terms
+
+
+class SkillIndex:
+    def __init__(self, categories: dict[str, str], postings: dict[str, dict[str, list[int]]]):
+        self.categories = categories  # term -> "tech" | "people" | "jd"
+        self.postings = postings      # term -> {"jd": [line, ...], "resume": [...]}
+        patterns = {}
+        for term in categories:
+            patterns[normalize(term) + ("*" if term.endswith("*") else "")] = term
+        for aliases in (TECH_TERMS, PEOPLE_TERMS):
+            for term, alts in aliases.items():
+                if term in categories:
+                    for alt in alts:
+                        patterns[normalize(alt) + ("*" if alt.endswith("*") else "")] = term
+        self._matcher = AhoCorasick(patterns)
+
+    @classmethod
+    def build(cls, jd_text: str = "", resume_text: str = "") -> "SkillIndex":
+        categories = {t: "tech" for t in TECH_TERMS}
+        categories.update({t: "people" for t in PEOPLE_TERMS})
+        lexicon = cls(dict(categories), {})
+        for term in extract_listed_terms(jd_text):
+            # 'random forests' or 'time series forecasting' are already covered by lexicon terms.
+            if not lexicon.match(term, context=False):
+                categories[term] = "jd"
+
+        # Inverted index over the source documents using the same automaton.
+        probe = cls(categories, {})
+        postings = {}
+        for source, text in (("jd", jd_text), ("resume", resume_text)):
+            for lineno, line in enumerate((text or "").splitlines(), 1):
+                for term in probe.match(line):
+                    postings.setdefault(term, {}).setdefault(source, []).append(lineno)
+        probe.postings = postings
+        return probe
+
+    def match(self, text: str, context: bool = True) -> set[str]:
+        """Terms mentioned in text; context=False skips the cue check on AMBIGUOUS_WORDS."""
+        text = normalize(text)
+        hits = list(self._matcher.iter_matches(text))
+        if not context:
+            return {key for _, _, key in hits}
+        return {key for start, end, key in hits if self._in_context(text, start, end, key, hits)}
+
+    def _in_context(self, text: str, start: int, end: int, key: str, hits: list) -> bool:
+        while end < len(text) and _is_word(text[end]):
+            end += 1  # the whole word of a prefix match: "leading", not "lead"
+        if AMBIGUOUS_WORDS.get(text[start:end]) != key:
+            return True
+        if text[end:end + 3] == " to" and not _is_word(text[end + 3:end + 4] or " "):
+            return False
+        lo, hi = max(0, start - CONTEXT_CHARS), end + CONTEXT_CHARS
+        if CONTEXT_CUES[key].search(text, lo, hi):
+            return True
+        return self.categories.get(key) == "tech" and any(
+            k != key and self.categories.get(k) == "tech" and s < hi and e > lo for s, e, k in hits)
+
+    def jd_skills(self) -> set[str]:
+        return {t for t, p in self.postings.items() if "jd" in p}
+
+    def display(self, term: str) -> str:
+        return term.rstrip("*")
+
+
+class SkillCoverage:
+    """Tracks which JD skills the candidate has mentioned so far in a session."""
+
+    def __init__(self, index: SkillIndex):
+        self.index = index
+        self.required = index.jd_skills()
+        self.covered = set()
+
+    def update(self, answer: str) -> set[str]:
+        hits = self.index.match(answer)
+        self.covered |= hits & self.required
+        return hits
+
+    def score(self) -> float:
+        return len(self.covered) / len(self.required) if self.required else 0.0
+
+    def missing(self) -> list[str]:
+        return sorted(self.index.display(t) for t in self.required - self.covered)
+
+    def summary(self) -> dict:
+        return {
+            "score": round(self.score(), 3),
+            "covered": sorted(self.index.display(t) for t in self.covered),
+            "missing": self.missing(),
+        }
@@ -0,0 +1,76 @@
+# startup.py
+"""Startup cost helpers: per-module import profile and time-to-first-prompt."""
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+APP_MODULES = (
+    "file_loaders", "corpus", "skill_index", "question_bank",
+    "gemini_question_generator", "interview_processor", "text_to_speech", "whisper_transcriber",
+)
+HEAVY_MODULES = (
+    "numpy", "sounddevice", "pyttsx3", "faster_whisper", "google.generativeai",
+    "pdfminer.high_level", "docx",
+)
+
+
+def import_profile(modules=APP_MODULES + HEAVY_MODULES) -> list[tuple[str, float, str]]:
+    """
+    Import each module in order and return (name, seconds, status). Costs are
+    incremental: a module's time excludes anything an earlier entry already pulled in.
+    For a full tree use `python -X importtime main.py --help`.
+    """
+    rows = []
+    for name in modules:
+        if name in sys.modules:
+            rows.append((name, 0.0, "already loaded"))
+            continue
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            status = "ok"
+        except Exception as e:
+            status = f"unavailable ({type(e).__name__})"
+        rows.append((name, time.perf_counter() - t0, status))
+    return rows
+
+
+def import_profile_fresh(modules=APP_MODULES + HEAVY_MODULES) -> list[tuple[str, float, str]]:
+    """Same as import_profile, but in a clean interpreter so already-imported modules still count."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run(
+        [sys.executable, os.path.join(here, "startup.py"), *modules],
+        capture_output=True, text=True, cwd=here, check=True,
+    ).stdout
+    return [tuple(r) for r in json.loads(out)]
+
+
+def print_import_profile(rows):
+    total = sum(r[1] for r in rows)
+    print(f"{'module':<28}{'ms':>10}  status")
+    for name, secs, status in rows:
+        print(f"{name:<28}{secs * 1000:>10.1f}  {status}")
+    print(f"{'total':<28}{total * 1000:>10.1f}")
+
+
+def track_first_prompt(tts, t0: float):
+    """Chain onto tts.on_start and print time-to-first-prompt the first time audio starts."""
+    prev = tts.on_start
+    fired = []
+
+    def _on_start():
+        if not fired:
+            fired.append(time.perf_counter() - t0)
+            print(f"[STARTUP] time-to-first-prompt: {fired[0] * 1000:.0f} ms")
+        if prev:
+            prev()
+
+    tts.on_start = _on_start
+    return fired
+
+
+if __name__ == "__main__":
+    print(json.dumps(import_profile(sys.argv[1:] or APP_MODULES + HEAVY_MODULES)))
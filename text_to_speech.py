@@ -1,40 +1,101 @@
-import pyttsx3
 import threading
 import queue
 
+from tracing import NULL_TRACER
+
+
+def _new_engine(rate: int, voice_index: int):
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty('rate', rate)
+    voices = engine.getProperty('voices')
+    if 0 <= voice_index < len(voices):
+        engine.setProperty('voice', voices[voice_index].id)
+    return engine
+
+
 class TextToSpeech:
     """Threaded pyttsx3 with start/stop hooks so we can pause STT while speaking."""
-    def __init__(self, rate=150, voice_index=0, on_start=None, on_end=None):
+    def __init__(self, rate=150, voice_index=0, on_start=None, on_end=None, tracer=None):
         self.rate = rate
         self.voice_index = voice_index
         self.on_start = on_start
         self.on_end = on_end
+        self.tracer = tracer or NULL_TRACER
+        self.prerendered = {}  # text -> WAV path, played instead of synthesising (see preload)
+        self._engine = None  # one pyttsx3 engine for the life of the TTS thread
 
         self.queue = queue.Queue()
         self._processing = False
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread = threading.Thread(target=self._run_loop, name="tts", daemon=True)
         self.thread.start()
 
-    def _speak_once(self, text: str):
-        engine = pyttsx3.init()
-        engine.setProperty('rate', self.rate)
-        voices = engine.getProperty('voices')
-        if 0 <= self.voice_index < len(voices):
-            engine.setProperty('voice', voices[self.voice_index].id)
-        engine.say(text)
-        engine.runAndWait()
-        engine.stop()
+    def preload(self, audio: dict):
+        """Pre-rendered speech ({text: WAV path}, e.g. from a prep.py bundle) to play as-is."""
+        self.prerendered.update(audio)
+
+    def _play_file(self, path: str, stamp=None) -> bool:
+        try:
+            import wave
+            import numpy as np
+            import sounddevice as sd
+            with wave.open(path, "rb") as w:
+                rate, channels = w.getframerate(), w.getnchannels()
+                pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2").reshape(-1, channels)
+        except Exception as e:
+            print(f"[TTS] pre-rendered audio unusable ({e}); synthesising instead")
+            return False
+        if stamp:
+            turn, picked_up = stamp
+            self.tracer.add("tts.start", picked_up, self.tracer.now(), turn)
+        sd.play(pcm, rate)
+        sd.wait()
+        return True
+
+    def _speak_once(self, text: str, stamp=None):
+        path = self.prerendered.get(text)
+        if path and self._play_file(path, stamp):
+            return
+        if self._engine is None:
+            self._engine = _new_engine(self.rate, self.voice_index)
+        engine = self._engine
+        token = None
+        if stamp:
+            turn, picked_up = stamp
+            token = engine.connect('started-utterance',
+                                   lambda name: self.tracer.add("tts.start", picked_up, self.tracer.now(), turn))
+        try:
+            engine.say(text)
+            engine.runAndWait()
+            engine.stop()
+        except Exception:
+            self._engine = None  # start the next utterance from a fresh engine
+            raise
+        finally:
+            if token is not None:
+                engine.disconnect(token)
 
     def _run_loop(self):
+        # Import the speech engine here so it loads in the background, off the startup path.
+        try:
+            import pyttsx3  # noqa: F401
+        except Exception as e:
+            print(f"[TTS Error] {e}")
         while True:
-            text, block_event = self.queue.get()
+            text, block_event, started, stamp = self.queue.get()
             self._processing = True
+            if stamp:
+                self.tracer.add("tts.queue_wait", stamp[1], self.tracer.now(), stamp[0])
+                stamp = (stamp[0], self.tracer.now())
             try:
                 if self.on_start:
                     try: self.on_start()
                     except Exception: pass
+                if started:
+                    try: started()
+                    except Exception: pass
                 print(f"AI (speaking): {text}")
-                self._speak_once(text)
+                self._speak_once(text, stamp)
             except Exception as e:
                 print(f"[TTS Error] {e}")
             finally:
@@ -45,13 +106,67 @@ class TextToSpeech:
                 if block_event:
                     block_event.set()
 
-    def speak(self, text: str, block: bool = False):
+    def speak(self, text: str, block: bool = False, on_start=None):
+        """on_start: optional per-utterance callback fired when this text starts playing."""
         if not text or not text.strip():
             return
         block_event = threading.Event() if block else None
-        self.queue.put((text, block_event))
+        self.queue.put((text, block_event, on_start, self.tracer.stamp()))
         if block and block_event:
             block_event.wait()
 
     def is_speaking(self) -> bool:
-        return self._processing
\ No newline at end of file
+        return self._processing
+
+class SpeechRenderer:
+    """
+    Renders text to WAV bytes on one dedicated thread. pyttsx3 engines are not
+    thread-safe, so many sessions share this one engine through a queue.
+    """
+    def __init__(self, rate=150, voice_index=0):
+        self.rate = rate
+        self.voice_index = voice_index
+        self._engine = None
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run_loop, name="tts-render", daemon=True)
+        self.thread.start()
+
+    def render(self, text: str):
+        """Returns a Future resolving to WAV bytes (b"" if rendering failed)."""
+        from concurrent.futures import Future
+        fut = Future()
+        self.queue.put((text, fut))
+        return fut
+
+    def render_to_file(self, text: str, path: str):
+        if self._engine is None:
+            self._engine = _new_engine(self.rate, self.voice_index)
+        try:
+            self._engine.save_to_file(text, path)
+            self._engine.runAndWait()
+            self._engine.stop()
+        except Exception:
+            self._engine = None
+            raise
+
+    def _run_loop(self):
+        import os
+        import tempfile
+        while True:
+            text, fut = self.queue.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self.render_to_file(text, path)
+                with open(path, "rb") as f:
+                    fut.set_result(f.read())
+            except Exception as e:
+                print(f"[TTS Error] {e}")
+                fut.set_result(b"")
+            finally:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,216 @@
+# tracing.py
+"""
+Per-turn latency tracing across ASR, the interview processor, the LLM and TTS.
+
+One Tracer is shared by the components of an interview. The processor starts a
+session and sets the current turn (the index of the question being answered);
+everything else stamps spans with that turn. At the end of a session the
+spans are written as JSONL plus a Prometheus text file, and a summary answers
+"how long from the candidate stopping to the AI speaking, and which stage
+took that time".
+
+Spans (name: what it covers):
+    speech_end          mark: end of the ASR chunk that held the candidate's last words
+    asr.decode          chunk ready -> text out
+    process_input       one transcribed fragment through InterviewProcessor.process_input
+    finalize_wait       last fragment -> finalize starts (silence timeout or end keyword)
+    finalize            answer bookkeeping and follow-up planning
+    llm.*               LLM calls; llm.*_wait is time the turn spent blocked on background work
+    asr.refine          second-pass transcription and scoring of an archived answer (background)
+    tts.queue_wait      speak() -> the TTS thread picks the utterance up
+    tts.start           picked up -> audio starts
+
+    python main.py --trace traces/
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+# Work that runs alongside the conversation; it only costs a turn through the matching *_wait span.
+BACKGROUND_SPANS = {"llm.seed", "llm.score", "llm.followup_prefetch", "asr.refine"}
+_NOT_STAGES = BACKGROUND_SPANS | {"speech_end", "finalize"}
+
+
+def _percentile(sorted_vals, pct):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(pct / 100 * len(sorted_vals)))]
+
+
+class Tracer:
+    def __init__(self, out_dir: str = "", clock=time.perf_counter, enabled: bool = True):
+        self.out_dir = out_dir
+        self.clock = clock
+        self.enabled = enabled
+        self.session_id = ""
+        self.turn = -1
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self.clock()
+
+    # ----------------- recording -----------------
+    def begin_session(self, session_id: str):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.session_id = session_id
+            self.turn = -1
+            self.spans = []
+
+    def set_turn(self, turn: int):
+        self.turn = turn
+
+    def add(self, name: str, start: float, end: float = None, turn: int = None, **attrs):
+        if not self.enabled:
+            return
+        end = start if end is None else end
+        rec = {"session": self.session_id, "turn": self.turn if turn is None else turn, "name": name,
+               "start": start, "end": end, "ms": round((end - start) * 1000, 2),
+               "thread": threading.current_thread().name}
+        if attrs:
+            rec["attrs"] = attrs
+        with self._lock:
+            self.spans.append(rec)
+
+    def mark(self, name: str, t: float = None, turn: int = None, **attrs):
+        if self.enabled:
+            self.add(name, self.clock() if t is None else t, None, turn, **attrs)
+
+    def stamp(self):
+        """(turn, now) to carry across a queue; None when tracing is off."""
+        return (self.turn, self.clock()) if self.enabled else None
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            yield
+            return
+        turn, t0 = self.turn, self.clock()
+        try:
+            yield
+        finally:
+            self.add(name, t0, self.clock(), turn, **attrs)
+
+    def wrap(self, name: str, fn):
+        """fn wrapped in a span for the current turn, for running on another thread."""
+        if not self.enabled:
+            return fn
+        turn = self.turn
+
+        def traced(*args, **kwargs):
+            t0 = self.clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(name, t0, self.clock(), turn)
+        return traced
+
+    # ----------------- analysis -----------------
+    def turns(self) -> list[dict]:
+        """Per answered turn: speech end -> first AI audio, and the time each stage took inside that window."""
+        with self._lock:
+            spans = list(self.spans)
+        by_turn = {}
+        for s in spans:
+            by_turn.setdefault(s["turn"], []).append(s)
+        out = []
+        for turn in sorted(t for t in by_turn if t >= 0):
+            ss = by_turn[turn]
+            ends = [s["start"] for s in ss if s["name"] == "speech_end"]
+            if not ends:
+                ends = [s["start"] for s in ss if s["name"] == "process_input"]
+            if not ends:
+                continue
+            speech_end = max(ends)
+            starts = [s["end"] for s in ss if s["name"] == "tts.start" and s["end"] >= speech_end]
+            if not starts:
+                continue
+            spoken = min(starts)
+            stages = {}
+            for s in ss:
+                overlap = min(s["end"], spoken) - max(s["start"], speech_end)
+                if overlap > 0 and s["name"] not in _NOT_STAGES:
+                    stages[s["name"]] = stages.get(s["name"], 0.0) + overlap * 1000
+            out.append({
+                "turn": turn,
+                "response_ms": round((spoken - speech_end) * 1000, 1),
+                "stages_ms": {k: round(v, 1) for k, v in sorted(stages.items(), key=lambda kv: -kv[1])},
+                "dominant": max(stages, key=stages.get) if stages else "",
+            })
+        return out
+
+    def summary(self) -> dict:
+        turns = self.turns()
+        resp = sorted(t["response_ms"] for t in turns)
+        dominant = {}
+        for t in turns:
+            if t["dominant"]:
+                dominant[t["dominant"]] = dominant.get(t["dominant"], 0) + 1
+        return {
+            "session": self.session_id,
+            "turns": len(turns),
+            "response_ms_p50": _percentile(resp, 50),
+            "response_ms_max": resp[-1] if resp else 0.0,
+            "dominant_stage": max(dominant, key=dominant.get) if dominant else "",
+            "per_turn": turns,
+        }
+
+    # ----------------- export -----------------
+    def export_jsonl(self, path: str):
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, "w", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps(s, ensure_ascii=False) + "\n")
+
+    def export_prometheus(self, path: str):
+        with self._lock:
+            spans = list(self.spans)
+        by_stage = {}
+        for s in spans:
+            if s["end"] > s["start"]:
+                by_stage.setdefault(s["name"], []).append(s["end"] - s["start"])
+        sid = self.session_id
+        lines = ["# HELP interview_stage_seconds Time spent per traced stage.",
+                 "# TYPE interview_stage_seconds summary"]
+        for name, vals in sorted(by_stage.items()):
+            vals.sort()
+            for q in (0.5, 0.95):
+                lines.append(f'interview_stage_seconds{{session="{sid}",stage="{name}",quantile="{q}"}} '
+                             f"{_percentile(vals, q * 100):.6f}")
+            lines.append(f'interview_stage_seconds_sum{{session="{sid}",stage="{name}"}} {sum(vals):.6f}')
+            lines.append(f'interview_stage_seconds_count{{session="{sid}",stage="{name}"}} {len(vals)}')
+        resp = sorted(t["response_ms"] / 1000 for t in self.turns())
+        lines += ["# HELP interview_response_seconds Candidate stops speaking -> AI audio starts.",
+                  "# TYPE interview_response_seconds summary"]
+        for q in (0.5, 0.95):
+            lines.append(f'interview_response_seconds{{session="{sid}",quantile="{q}"}} '
+                         f"{_percentile(resp, q * 100):.6f}")
+        lines.append(f'interview_response_seconds_sum{{session="{sid}"}} {sum(resp):.6f}')
+        lines.append(f'interview_response_seconds_count{{session="{sid}"}} {len(resp)}')
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def finish(self) -> dict:
+        """Write trace_<session>.jsonl/.prom (when out_dir is set) and print the session summary."""
+        if not self.enabled:
+            return {}
+        summary = self.summary()
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+            base = os.path.join(self.out_dir, f"trace_{self.session_id}")
+            self.export_jsonl(base + ".jsonl")
+            self.export_prometheus(base + ".prom")
+            with open(base + ".summary.json", "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+        print(f"[TRACE] {summary['turns']} turns, response p50 {summary['response_ms_p50']:.0f} ms, "
+              f"max {summary['response_ms_max']:.0f} ms, mostly {summary['dominant_stage'] or '-'}")
+        return summary
+
+
+NULL_TRACER = Tracer(enabled=False)
@@ -0,0 +1,223 @@
+# transcript_store.py
+"""
+Append-only per-session journals plus a SQLite catalog.
+
+Every finalized answer is appended (and fsync'd) to
+transcripts/interview_<session_id>.jsonl as it happens, so a crash loses at
+most the answer in progress. The .txt and .json files are derived from the
+journal, and the catalog indexes sessions by candidate, date and score, so
+nothing ever scans the transcripts folder.
+
+    python transcript_store.py list --candidate jane-doe
+    python transcript_store.py rebuild <session_id>
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+DEFAULT_ROOT = "transcripts"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    candidate  TEXT NOT NULL DEFAULT '',
+    started_at TEXT NOT NULL,
+    ended_at   TEXT,
+    answers    INTEGER NOT NULL DEFAULT 0,
+    score      INTEGER,
+    verdict    TEXT,
+    status     TEXT NOT NULL DEFAULT 'open'
+);
+CREATE INDEX IF NOT EXISTS sessions_candidate ON sessions(candidate);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions(started_at);
+CREATE INDEX IF NOT EXISTS sessions_score ON sessions(score);
+"""
+
+
+def new_session_id() -> str:
+    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+
+
+def jd_key(jd_text: str) -> str:
+    """Cohort key journalled with each result (see cohort_analytics): the JD text, whitespace- and case-insensitive."""
+    norm = " ".join((jd_text or "").lower().split())
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()[:12]
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class TranscriptStore:
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self._init_lock = threading.Lock()
+        self._ready = False
+
+    # sqlite connections are per-thread; sessions call in from their own scheduler threads.
+    def _db(self) -> sqlite3.Connection:
+        with self._init_lock:
+            if not self._ready:
+                os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "catalog.sqlite"), timeout=10)
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                self._ready = True
+        return conn
+
+    def paths(self, session_id: str) -> dict:
+        base = os.path.join(self.root, f"interview_{session_id}")
+        return {"journal": base + ".jsonl", "txt": base + ".txt", "json": base + ".json"}
+
+    # ----------------- writing -----------------
+    def _append(self, session_id: str, record: dict):
+        with open(self.paths(session_id)["journal"], "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def open_session(self, session_id: str, candidate: str = ""):
+        conn = self._db()
+        with conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, candidate, started_at) VALUES (?, ?, ?)",
+                (session_id, candidate, _now()),
+            )
+        conn.close()
+        self._append(session_id, {"type": "start", "session_id": session_id, "candidate": candidate, "ts": _now()})
+
+    def append_answer(self, session_id: str, question: str, answer: str):
+        self._append(session_id, {"type": "answer", "q": question, "a": answer, "ts": _now()})
+        conn = self._db()
+        with conn:
+            conn.execute("UPDATE sessions SET answers = answers + 1 WHERE session_id = ?", (session_id,))
+        conn.close()
+
+    def append_refined(self, session_id: str, index: int, answer: str, model: str = ""):
+        """A second-pass transcript of answer #index; it replaces the live text in derived outputs."""
+        self._append(session_id, {"type": "refined", "index": index, "a": answer, "model": model, "ts": _now()})
+
+    def append_result(self, session_id: str, scorecard: dict, extra: dict = None):
+        self._append(session_id, {"type": "result", "scorecard": scorecard, **(extra or {}), "ts": _now()})
+        conn = self._db()
+        with conn:
+            conn.execute(
+                "UPDATE sessions SET score = ?, verdict = ? WHERE session_id = ?",
+                (scorecard.get("score"), scorecard.get("verdict"), session_id),
+            )
+        conn.close()
+
+    def close_session(self, session_id: str) -> dict:
+        """Mark the session closed and (re)derive its .txt/.json files from the journal."""
+        conn = self._db()
+        with conn:
+            conn.execute(
+                "UPDATE sessions SET ended_at = ?, status = 'closed' WHERE session_id = ?", (_now(), session_id)
+            )
+        conn.close()
+        return self.write_outputs(session_id)
+
+    # ----------------- reading / deriving -----------------
+    def read_journal(self, session_id: str) -> dict:
+        state = {"session_id": session_id, "candidate": "", "questions": [], "result": None}
+        path = self.paths(session_id)["journal"]
+        if not os.path.exists(path):
+            return state
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if rec.get("type") == "start":
+                    state["candidate"] = rec.get("candidate", "")
+                elif rec.get("type") == "answer":
+                    state["questions"].append({"q": rec["q"], "a": rec["a"]})
+                elif rec.get("type") == "refined" and rec["index"] < len(state["questions"]):
+                    qa = state["questions"][rec["index"]]
+                    qa.setdefault("a_live", qa["a"])
+                    qa["a"] = rec["a"]
+                elif rec.get("type") == "result":
+                    state["result"] = rec
+        return state
+
+    def write_outputs(self, session_id: str) -> dict:
+        state = self.read_journal(session_id)
+        paths = self.paths(session_id)
+        if not state["questions"]:
+            return paths
+        with open(paths["txt"], "w", encoding="utf-8") as f:
+            for qi, qa in enumerate(state["questions"], 1):
+                f.write(f"Q{qi}: {qa['q']}\n")
+                f.write(f"A{qi}: {qa['a']}\n\n")
+            res = state["result"]
+            if res:
+                card = res["scorecard"]
+                f.write(f"---\nSCORE: {card.get('score', 0)}/100\nVERDICT: {card.get('verdict', 'Reject')}\n")
+                if card.get("reasons"):
+                    f.write("REASONS:\n")
+                    for r in card["reasons"][:3]:
+                        f.write(f"- {r}\n")
+                if card.get("suggestions"):
+                    f.write("SUGGESTIONS:\n")
+                    for s in card["suggestions"][:3]:
+                        f.write(f"- {s}\n")
+        if state["result"]:
+            payload = {"session_id": session_id, "candidate": state["candidate"], "questions": state["questions"]}
+            payload.update({k: v for k, v in state["result"].items() if k not in ("type", "ts")})
+            with open(paths["json"], "w", encoding="utf-8") as jf:
+                json.dump(payload, jf, ensure_ascii=False, indent=2)
+        return paths
+
+    def find(self, candidate: str = None, since: str = None, until: str = None,
+             min_score: int = None, limit: int = 100) -> list[dict]:
+        where, args = [], []
+        if candidate:
+            where.append("candidate = ?")
+            args.append(candidate)
+        if since:
+            where.append("started_at >= ?")
+            args.append(since)
+        if until:
+            where.append("started_at < ?")
+            args.append(until)
+        if min_score is not None:
+            where.append("score >= ?")
+            args.append(min_score)
+        sql = "SELECT session_id, candidate, started_at, ended_at, answers, score, verdict, status FROM sessions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY started_at DESC LIMIT ?"
+        conn = self._db()
+        cols = ("session_id", "candidate", "started_at", "ended_at", "answers", "score", "verdict", "status")
+        rows = [dict(zip(cols, r)) for r in conn.execute(sql, args + [limit])]
+        conn.close()
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_list = sub.add_parser("list", help="Query the session catalog")
+    p_list.add_argument("--candidate")
+    p_list.add_argument("--since", help="ISO date, e.g. 2025-01-31")
+    p_list.add_argument("--until")
+    p_list.add_argument("--min-score", type=int)
+    p_list.add_argument("--limit", type=int, default=50)
+    p_re = sub.add_parser("rebuild", help="Re-derive .txt/.json for a session from its journal")
+    p_re.add_argument("session_id")
+    args = parser.parse_args()
+
+    store = TranscriptStore(args.root)
+    if args.cmd == "list":
+        for row in store.find(args.candidate, args.since, args.until, args.min_score, args.limit):
+            print(json.dumps(row))
+    else:
+        print(json.dumps(store.write_outputs(args.session_id)))
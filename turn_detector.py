@@ -0,0 +1,116 @@
+# turn_detector.py
+"""
+End-of-answer detection.
+
+Three signals decide when a candidate has finished answering:
+  - an end phrase ("that's it", "thats all", "i am done", ...) at the end of a fragment ends it at once;
+  - trailing silence reported by the audio path ends it once it is longer than the speaker's usual pauses;
+  - with no audio signal (text clients), a timer sized from the speaker's usual gap between fragments.
+
+Pauses and gaps are learned per speaker, within bounds, and kept across that
+speaker's sessions. Short answers get more room, since candidates often pause
+to think before they get going. Pauses only show up when they are shorter than
+the threshold, so an answer that was ended on silence and then went on (a
+fragment right after the cut) also teaches the detector: the speaker is never
+cut off on a pause that short again.
+"""
+import re
+import threading
+from collections import OrderedDict, deque
+
+
+# ----------------- phrase matching -----------------
+def normalize(text: str) -> str:
+    """Lowercase, drop apostrophes (ASR writes both "that's" and "thats") and collapse punctuation."""
+    text = (text or "").lower().replace("'", "").replace("’", "")
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+_COMMANDS = (
+    ("exit", re.compile(r"\b(?:stop|end|quit|exit|finish|terminate) (?:the |this |my )?interview\b|^(?:exit|quit)$")),
+    ("repeat", re.compile(r"^(?:(?:can|could|would) you |please )?(?:repeat|say (?:that|it) again|come again|pardon)\b")),
+    ("skip", re.compile(r"\bskip\b|^(?:next question|pass|move on)$")),
+    ("end", re.compile(
+        r"\b(?:that(?:s| is| was) (?:it|all)|i(?:m| am) (?:done|finished)|that covers it|nothing (?:else|more)(?: to add)?)"
+        r"(?: for now)?(?: thanks?(?: you)?)?$"
+    )),
+)
+
+
+def classify(text: str) -> str:
+    """"exit", "repeat", "skip", "end" (answer finished) or "" for ordinary answer text."""
+    low = normalize(text)
+    for name, pattern in _COMMANDS:
+        if pattern.search(low):
+            return name
+    return ""
+
+
+# ----------------- adaptive timing -----------------
+def _p90(vals) -> float:
+    s = sorted(vals)
+    return s[min(len(s) - 1, int(0.9 * len(s)))]
+
+
+class TurnDetector:
+    SHORT_ANSWER_WORDS = 8
+    SHORT_ANSWER_FACTOR = 1.5
+    MIN_SAMPLES = 3
+    CUT_MARGIN = 1.25  # how far past a pause that got cut off the threshold moves
+
+    def __init__(self, min_silence=1.2, max_silence=6.0, initial_silence=1.5,
+                 min_timeout=3.0, max_timeout=10.0, margin=2.0, window=50):
+        self.min_silence, self.max_silence, self.initial_silence = min_silence, max_silence, initial_silence
+        self.min_timeout, self.max_timeout = min_timeout, max_timeout
+        self.margin = margin
+        self.pauses = deque(maxlen=window)  # audio silences after which the speaker kept talking
+        self.gaps = deque(maxlen=window)  # time between fragments of one answer
+        self.cut_pauses = deque(maxlen=10)  # pauses that ended an answer the speaker then continued
+
+    def observe_pause(self, seconds: float):
+        if seconds > 0:
+            self.pauses.append(seconds)
+
+    def observe_cut(self, seconds: float):
+        """The answer was ended after this long a pause, but the speaker went on talking."""
+        if seconds > 0:
+            self.pauses.append(seconds)
+            self.cut_pauses.append(seconds)
+
+    def observe_gap(self, seconds: float):
+        if seconds > 0:
+            self.gaps.append(seconds)
+
+    def _bounded(self, samples, initial, lo, hi, words: int) -> float:
+        base = initial if len(samples) < self.MIN_SAMPLES else self.margin * _p90(samples)
+        if words < self.SHORT_ANSWER_WORDS:
+            base *= self.SHORT_ANSWER_FACTOR
+        return min(hi, max(lo, base))
+
+    def silence_threshold(self, words: int) -> float:
+        """Trailing silence (s) that ends an answer of this many words."""
+        lo = self.min_silence
+        if self.cut_pauses:
+            lo = max(lo, self.CUT_MARGIN * max(self.cut_pauses))
+        return self._bounded(self.pauses, self.initial_silence, lo, self.max_silence, words)
+
+    def timeout(self, words: int) -> float:
+        """Fallback timer (s) after the last fragment when no silence is reported."""
+        return self._bounded(self.gaps, self.max_timeout, self.min_timeout, self.max_timeout, words)
+
+
+_speakers = OrderedDict()
+_speakers_lock = threading.Lock()
+MAX_SPEAKERS = 1000
+
+
+def for_speaker(speaker: str, **kwargs) -> TurnDetector:
+    """The learned detector for this speaker (a fresh one for anonymous sessions)."""
+    if not speaker:
+        return TurnDetector(**kwargs)
+    with _speakers_lock:
+        det = _speakers.pop(speaker, None) or TurnDetector(**kwargs)
+        _speakers[speaker] = det
+        while len(_speakers) > MAX_SPEAKERS:
+            _speakers.popitem(last=False)
+        return det
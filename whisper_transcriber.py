@@ -1,11 +1,39 @@
-import sounddevice as sd
-import numpy as np
 import queue as _queue
 import threading as _threading
-from faster_whisper import WhisperModel
 import time
 
+from tracing import NULL_TRACER
+
+
+class WhisperDecoder:
+    """
+    A loaded Whisper model plus decode settings. One decoder can be shared by
+    many transcribers; num_workers > 1 lets that many decodes run in parallel.
+    """
+    def __init__(self, model_size="base", device="cpu", compute_type="int8",
+                 num_workers=1, language="en", beam_size=1, cpu_threads=0):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type,
+                                  num_workers=num_workers, cpu_threads=cpu_threads)
+        self.model_size = model_size
+        self.language = language
+        self.beam_size = beam_size
+
+    def transcribe(self, audio_data) -> str:
+        segments, _ = self.model.transcribe(
+            audio_data,
+            language=self.language,
+            beam_size=self.beam_size,
+            vad_filter=True,
+            condition_on_previous_text=False
+        )
+        return "".join([seg.text for seg in segments]).strip()
+
+
 class WhisperTranscriber:
+    SILENCE_RMS = 0.01  # blocks quieter than this count as silence
+    FLUSH_SILENCE = 0.5  # decode a part-filled chunk once this much silence follows speech
+
     def __init__(
         self,
         on_text,
@@ -16,9 +44,31 @@ class WhisperTranscriber:
         block_duration=0.5,   # seconds
         chunk_duration=3.0,   # seconds (slightly longer to reduce fragments)
         channels=1,
-        language="en"
+        language="en",
+        decoder=None,         # share a WhisperDecoder across sessions instead of loading one
+        tracer=None,
+        on_silence=None,      # on_silence(seconds): trailing silence so far, 0.0 when speech resumes
+        archive=None,         # audio_archive.AudioArchive: keep what was heard for a second pass
+        native_capture=False,  # open the mic at its own rate/channels and convert with audio_dsp
+        on_metrics=None,      # on_metrics(dict): audio_dsp.AudioHealth metrics for every block heard
+        skip_hopeless=False,  # do not decode chunks that are silent-quiet, clipped or drowned in noise
+        max_queue_seconds=30.0,  # audio the ASR thread may fall behind by; older blocks are dropped
+        on_error=None,        # on_error(exc), on the ASR thread: the model failed to load, nothing gets transcribed
     ):
         self.on_text = on_text
+        self.on_silence = on_silence
+        self.archive = archive
+        self.native_capture = native_capture
+        self._pipeline = None  # audio_dsp.CapturePipeline while capturing natively
+        self._pauses = 0  # pause() count; the pipeline restarts when the ASR thread sees it change
+        self._pipeline_pauses = 0
+        self.on_metrics = on_metrics
+        self.skip_hopeless = skip_hopeless
+        self.health = None  # audio_dsp.AudioHealth, created with the ASR thread; .last is the latest block
+        self._chunk_metrics = []  # per-block metrics of the buffered chunk
+        self.skipped_chunks = 0
+        self._last_skip_note = 0.0
+        self.tracer = tracer or NULL_TRACER
         self.samplerate = samplerate
         self.channels = channels
         self.block_duration = block_duration
@@ -27,27 +77,77 @@ class WhisperTranscriber:
         self.frames_per_chunk = int(samplerate * chunk_duration)
         self.language = language
 
-        self.audio_queue = _queue.Queue()
+        self.audio_queue = _queue.Queue(maxsize=max(1, int(max_queue_seconds / block_duration)))
+        self.dropped_blocks = 0
         self.audio_buffer = []
         self.running = False
         self.paused = False  # new: half-duplex pause flag
         self._last_emit = ""
         self._last_emit_ts = 0.0
+        self._silence_run = 0.0  # seconds of silence at the end of the audio heard so far
+        self._speech_pending = False  # buffered audio has speech that has not been decoded yet
+
+        self.decoder = decoder
+        self.on_error = on_error
+        self.load_error = None  # the exception if the model could not be loaded
+        self._model_ready = _threading.Event()
+        if decoder is not None:
+            self._model_ready.set()
+        else:
+            # Load the model in the background so the greeting is not held up by it.
+            _threading.Thread(
+                target=self._load_model, args=(model_size, device, compute_type), name="asr-load", daemon=True
+            ).start()
+
+    @property
+    def model(self):
+        return self.decoder.model if self.decoder is not None else None
 
-        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+    def _load_model(self, model_size, device, compute_type):
+        try:
+            self.decoder = WhisperDecoder(model_size, device, compute_type, language=self.language)
+        except Exception as e:
+            self.load_error = e
+            print(f"[WhisperTranscriber] Model load failed: {e}")
+        finally:
+            self._model_ready.set()
 
     def _audio_callback(self, indata, frames, time_info, status):
         if status:
             print(status)
-        # Always enqueue, we will drop in the worker if paused
-        self.audio_queue.put(indata.copy())
+        if self.paused:
+            # Our own speech. Dropped here, not in the worker: while the model loads nothing
+            # drains the queue, and the greeting would be transcribed once it is ready.
+            return
+        self._enqueue(indata.copy())
+
+    def _enqueue(self, block):
+        """Never blocks: when the ASR thread is max_queue_seconds behind, the oldest block goes."""
+        while True:
+            try:
+                self.audio_queue.put_nowait(block)
+                return
+            except _queue.Full:
+                try:
+                    self.audio_queue.get_nowait()
+                    self.dropped_blocks += 1
+                except _queue.Empty:
+                    pass
 
     def _recorder(self):
+        import sounddevice as sd
+        rate, channels = self.samplerate, self.channels
+        if self.native_capture:
+            from audio_dsp import CapturePipeline, native_input_format
+            rate, channels = native_input_format()
+            self._pipeline = CapturePipeline(rate, self.samplerate)
+            print(f"[WhisperTranscriber] capturing at {rate} Hz x {channels} ch, "
+                  f"converting to {self.samplerate} Hz mono")
         with sd.InputStream(
-            samplerate=self.samplerate,
-            channels=self.channels,
+            samplerate=rate,
+            channels=channels,
             callback=self._audio_callback,
-            blocksize=self.frames_per_block
+            blocksize=int(rate * self.block_duration)
         ):
             while self.running:
                 sd.sleep(100)
@@ -67,59 +167,126 @@ class WhisperTranscriber:
         self._last_emit_ts = now
         return True
 
+    def _skip_chunk(self) -> bool:
+        from audio_dsp import hopeless
+        why = hopeless(self._chunk_metrics)
+        if not why:
+            return False
+        self.skipped_chunks += 1
+        now = time.time()
+        if now - self._last_skip_note > 10.0:  # at most one note per 10 s
+            self._last_skip_note = now
+            print(f"[AUDIO] not transcribing: {why} (check the microphone)")
+        return True
+
     def _transcriber(self):
+        import numpy as np
+        from audio_dsp import AudioHealth, normalize_gain
+        self.health = AudioHealth()
+        self._model_ready.wait()
+        if self.decoder is None:
+            # Reported from here, once started, so the caller has a session to end.
+            if self.on_error:
+                self.on_error(self.load_error or RuntimeError("no Whisper model"))
+            return
         try:
             while self.running:
-                block = self.audio_queue.get()
+                try:
+                    block = self.audio_queue.get(timeout=1.0)
+                except _queue.Empty:
+                    continue
                 if block is None:
                     break
                 if self.paused:
                     # Drop incoming audio while paused to avoid feedback
                     self.audio_buffer = []
+                    self._chunk_metrics = []
+                    self._silence_run = 0.0
+                    self._speech_pending = False
                     continue
+                if self._pipeline is not None:
+                    if self._pipeline_pauses != self._pauses:
+                        # Audio was dropped while paused: this block does not follow on from the last one.
+                        self._pipeline_pauses = self._pauses
+                        self._pipeline.reset()
+                    block = self._pipeline.process(block)
+                if self.archive is not None:
+                    self.archive.write(block)
+
+                metrics = self.health.update(block)
+                self._chunk_metrics.append(metrics)
+                if self.on_metrics:
+                    self.on_metrics(metrics)
+                silent = metrics["rms"] < self.SILENCE_RMS
+                if silent:
+                    self._silence_run += len(block) / self.samplerate
+                else:
+                    if self._silence_run > 0 and self.on_silence:
+                        self.on_silence(0.0)
+                    self._silence_run = 0.0
+                    self._speech_pending = True
 
                 self.audio_buffer.append(block)
                 total_frames = sum(len(b) for b in self.audio_buffer)
-                if total_frames >= self.frames_per_chunk:
+                # Full chunk, or the speaker has paused: decode now rather than at the chunk boundary.
+                flush = self._speech_pending and self._silence_run >= self.FLUSH_SILENCE
+                if total_frames >= self.frames_per_chunk or flush:
                     audio_data = np.concatenate(self.audio_buffer)[:self.frames_per_chunk]
                     self.audio_buffer = []
+                    self._speech_pending = False
+                    skip = self.skip_hopeless and self._skip_chunk()
+                    self._chunk_metrics = []
                     audio_data = audio_data.flatten().astype(np.float32)
+                    if self._pipeline is not None:
+                        audio_data = normalize_gain(audio_data)
 
-                    segments, _ = self.model.transcribe(
-                        audio_data,
-                        language=self.language,
-                        beam_size=1,
-                        vad_filter=True,
-                        condition_on_previous_text=False
-                    )
-                    text_out = "".join([seg.text for seg in segments]).strip()
+                    t_chunk = self.tracer.now()  # the chunk's last block just arrived
+                    text_out = ""
+                    if not skip:
+                        text_out = self.decoder.transcribe(audio_data)
+                        self.tracer.add("asr.decode", t_chunk, self.tracer.now(), words=len(text_out.split()))
                     if text_out and self._emit_ok(text_out):
+                        self.tracer.mark("speech_end", t_chunk - self._silence_run)
                         # Do NOT print here; let main print for consistent UX
                         self.on_text(text_out)
+
+                # Reported after any text from the same audio, so the answer it may end is complete.
+                if silent and self.on_silence:
+                    self.on_silence(self._silence_run)
         except Exception as e:
             print(f"[WhisperTranscriber] Error: {e}")
 
-    def start(self):
+    def feed(self, block):
+        """Push externally captured float32 frames (shape (n, channels)) instead of the local mic."""
+        self._enqueue(block)
+
+    def start(self, capture=True):
         if self.running:
             return
         self.running = True
-        self.rec_thread = _threading.Thread(target=self._recorder, daemon=True)
-        self.asr_thread = _threading.Thread(target=self._transcriber, daemon=True)
-        self.rec_thread.start()
+        self.asr_thread = _threading.Thread(target=self._transcriber, name="asr", daemon=True)
         self.asr_thread.start()
-        print("Listening... Say 'stop interview' to exit (Ctrl+C to quit).")
+        if capture:
+            self.rec_thread = _threading.Thread(target=self._recorder, name="recorder", daemon=True)
+            self.rec_thread.start()
+            print("Listening... Say 'stop interview' to exit (Ctrl+C to quit).")
 
     def stop(self):
         if not self.running:
             return
         self.running = False
-        self.audio_queue.put(None)
+        self._enqueue(None)
+        if self.dropped_blocks:
+            print(f"[WhisperTranscriber] dropped {self.dropped_blocks * self.block_duration:.0f} s of audio "
+                  f"the ASR thread could not keep up with")
         print("Stopped listening.")
 
     # New: half-duplex controls
     def pause(self):
         self.paused = True
+        self._pauses += 1
         self.audio_buffer = []
+        self._chunk_metrics = []
 
     def resume(self):
         self.paused = False